@@ -0,0 +1 @@
+"""Benchmarks of Pycatzao (see `asv.conf.json`)."""
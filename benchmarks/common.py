@@ -0,0 +1,58 @@
+"""Synthetic recordings and throughput measurements shared by all benchmarks."""
+
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests", "helpers"))
+import test_utils  # noqa: E402
+
+DTYPES = ["uint8", "uint16", "uint32"]
+N_CELLS = [100, 1_000, 4_000]
+BUFFER_SIZES = [2**10, 2**16, 2**20, -1]
+
+
+def recording(n_msg, *, n_cells, dtype="uint8", compress=True, seed=0):
+    """Encode `n_msg` random type `002` messages with up to `n_cells` cells."""
+    rng = np.random.default_rng(seed)
+    return b"".join(
+        test_utils.random_type2_message(
+            rng, n_max=n_cells, dtype=np.dtype(dtype).type, compress=compress, tod=True
+        )[0]
+        for _ in range(n_msg)
+    )
+
+
+def write_recording(data):
+    """Write data to a temporary file and return its name."""
+    fd, file_name = tempfile.mkstemp(suffix=".cat240")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+    return file_name
+
+
+class Throughput:
+    """Report the throughput of :meth:`run` in messages/s and MB/s.
+
+    Subclasses implement `setup` (setting `n_msg` and `n_bytes`) and `run`.
+    """
+
+    def time_run(self, *params):
+        self.run(*params)
+
+    def _rate(self, n, params):
+        return n / min(timeit.repeat(lambda: self.run(*params), number=1, repeat=3))
+
+    def track_messages(self, *params):
+        return self._rate(self.n_msg, params)
+
+    track_messages.unit = "messages/s"
+
+    def track_throughput(self, *params):
+        return self._rate(self.n_bytes, params) / 1e6
+
+    track_throughput.unit = "MB/s"
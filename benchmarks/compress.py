@@ -0,0 +1,77 @@
+"""Throughput of compressing and decompressing CAT240 files."""
+
+import os
+
+import pycatzao
+
+from .common import BUFFER_SIZES, DTYPES, Throughput, recording, write_recording
+
+
+class CompressFile(Throughput):
+    """Compressing an uncompressed file with :func:`pycatzao.compress_file`."""
+
+    params = [DTYPES, BUFFER_SIZES]
+    param_names = ["dtype", "buffer_size"]
+
+    def setup(self, dtype, buffer_size):
+        self.n_msg = 2_000
+        data = recording(self.n_msg, n_cells=1_000, dtype=dtype, compress=False)
+        self.n_bytes = len(data)
+        self.file_name = write_recording(data)
+
+    def teardown(self, dtype, buffer_size):
+        os.remove(self.file_name)
+
+    def run(self, dtype, buffer_size):
+        for _ in pycatzao.compress_file(self.file_name, buffer_size=buffer_size):
+            pass
+
+
+class CompressFileParallel(Throughput):
+    """Compressing a file with multiple threads (and writing it to a file)."""
+
+    params = [[0, 2, 4], [False, True]]
+    param_names = ["workers", "out_file"]
+
+    def setup(self, workers, out_file):
+        self.n_msg = 2_000
+        data = recording(self.n_msg, n_cells=4_000, compress=False)
+        self.n_bytes = len(data)
+        self.file_name = write_recording(data)
+
+    def teardown(self, workers, out_file):
+        os.remove(self.file_name)
+
+    def run(self, workers, out_file):
+        if out_file:
+            pycatzao.compress_file(
+                self.file_name,
+                buffer_size=2**20,
+                workers=workers,
+                out_file=os.devnull,
+            )
+        else:
+            for _ in pycatzao.compress_file(
+                self.file_name, buffer_size=2**20, workers=workers
+            ):
+                pass
+
+
+class DecompressFile(Throughput):
+    """Decompressing a compressed file with :func:`pycatzao.decompress_file`."""
+
+    params = [DTYPES, BUFFER_SIZES]
+    param_names = ["dtype", "buffer_size"]
+
+    def setup(self, dtype, buffer_size):
+        self.n_msg = 2_000
+        data = recording(self.n_msg, n_cells=1_000, dtype=dtype, compress=True)
+        self.n_bytes = len(data)
+        self.file_name = write_recording(data)
+
+    def teardown(self, dtype, buffer_size):
+        os.remove(self.file_name)
+
+    def run(self, dtype, buffer_size):
+        for _ in pycatzao.decompress_file(self.file_name, buffer_size=buffer_size):
+            pass
@@ -0,0 +1,67 @@
+"""Throughput of decoding and scanning CAT240 data."""
+
+import os
+
+import pycatzao
+
+from .common import (
+    BUFFER_SIZES,
+    DTYPES,
+    N_CELLS,
+    Throughput,
+    recording,
+    write_recording,
+)
+
+
+class Decode(Throughput):
+    """Decoding a binary blob with :func:`pycatzao.decode`."""
+
+    params = [DTYPES, N_CELLS, [False, True]]
+    param_names = ["dtype", "n_cells", "compress"]
+
+    def setup(self, dtype, n_cells, compress):
+        self.n_msg = 2_000
+        self.data = recording(
+            self.n_msg, n_cells=n_cells, dtype=dtype, compress=compress
+        )
+        self.n_bytes = len(self.data)
+
+    def run(self, dtype, n_cells, compress):
+        pycatzao.decode(self.data)
+
+
+class DecodeColumns(Decode):
+    """Decoding a binary blob with :func:`pycatzao.decode_columns`."""
+
+    def run(self, dtype, n_cells, compress):
+        pycatzao.decode_columns(self.data)
+
+
+class DecodeFile(Throughput):
+    """Decoding a file with :func:`pycatzao.decode_file`."""
+
+    params = [BUFFER_SIZES, [False, True]]
+    param_names = ["buffer_size", "mmap"]
+
+    def setup(self, buffer_size, mmap):
+        self.n_msg = 5_000
+        data = recording(self.n_msg, n_cells=1_000)
+        self.n_bytes = len(data)
+        self.file_name = write_recording(data)
+
+    def teardown(self, buffer_size, mmap):
+        os.remove(self.file_name)
+
+    def run(self, buffer_size, mmap):
+        for _ in pycatzao.decode_file(
+            self.file_name, buffer_size=buffer_size, mmap=mmap
+        ):
+            pass
+
+
+class ScanFile(DecodeFile):
+    """Scanning the headers of a file with :func:`pycatzao.scan_file`."""
+
+    def run(self, buffer_size, mmap):
+        pycatzao.scan_file(self.file_name, buffer_size=buffer_size, mmap=mmap)
@@ -0,0 +1,114 @@
+"""Throughput of encoding CAT240 messages."""
+
+import numpy as np
+
+import pycatzao
+
+from .common import DTYPES, N_CELLS, Throughput
+
+
+class Encode(Throughput):
+    """Encoding type `002` messages with :func:`pycatzao.encode`."""
+
+    params = [DTYPES, N_CELLS, [False, True]]
+    param_names = ["dtype", "n_cells", "compress"]
+
+    def setup(self, dtype, n_cells, compress):
+        self.n_msg = 2_000
+
+        rng = np.random.default_rng(0)
+        self.amp = rng.integers(
+            0, np.iinfo(dtype).max, size=(self.n_msg, n_cells), dtype=dtype
+        )
+        self.header = pycatzao.make_video_header(
+            start_az=0, end_az=1, cell_offset=0, cell_width=10
+        )
+        self.n_bytes = len(b"".join(self._encode(compress)))
+
+    def _encode(self, compress):
+        return [
+            pycatzao.encode(
+                pycatzao.make_video_message(
+                    amp, msg_index=i, header=self.header, compress=compress
+                ),
+                sac=7,
+                sic=42,
+                tod=100.0,
+            )
+            for i, amp in enumerate(self.amp)
+        ]
+
+    def run(self, dtype, n_cells, compress):
+        self._encode(compress)
+
+
+class EncodeSweep(Throughput):
+    """Encoding a sweep at once with :func:`pycatzao.encode_sweep`."""
+
+    params = [DTYPES, N_CELLS, [False, True]]
+    param_names = ["dtype", "n_cells", "compress"]
+
+    def setup(self, dtype, n_cells, compress):
+        self.n_msg = 2_000
+
+        rng = np.random.default_rng(0)
+        self.amp = rng.integers(
+            0, np.iinfo(dtype).max, size=(self.n_msg, n_cells), dtype=dtype
+        )
+        self.n_bytes = len(self._encode(compress))
+
+    def _encode(self, compress):
+        return pycatzao.encode_sweep(
+            self.amp,
+            start_az=np.linspace(0, 360, self.n_msg, endpoint=False),
+            end_az=np.linspace(0, 360, self.n_msg, endpoint=False) + 360 / self.n_msg,
+            cell_offset=0,
+            cell_width=10,
+            sac=7,
+            sic=42,
+            tod=100.0,
+            compress=compress,
+        )
+
+    def run(self, dtype, n_cells, compress):
+        self._encode(compress)
+
+
+class EncodeInto(Throughput):
+    """Encoding type `002` messages into a reused buffer."""
+
+    params = [DTYPES, N_CELLS, [False, True]]
+    param_names = ["dtype", "n_cells", "compress"]
+
+    def setup(self, dtype, n_cells, compress):
+        self.n_msg = 2_000
+
+        rng = np.random.default_rng(0)
+        self.amp = rng.integers(
+            0, np.iinfo(dtype).max, size=(self.n_msg, n_cells), dtype=dtype
+        )
+        self.header = pycatzao.make_video_header(
+            start_az=0, end_az=1, cell_offset=0, cell_width=10
+        )
+        self.buf = bytearray(2**16)
+        self.n_bytes = self._encode(compress)
+
+    def _encode(self, compress):
+        # one datagram per message, i.e., the buffer is reused for each message
+        return sum(
+            pycatzao.encode_video_into(
+                self.buf,
+                0,
+                amp,
+                msg_index=i,
+                header=self.header,
+                sac=7,
+                sic=42,
+                tod=100.0,
+                compress=compress,
+            )
+            for i, amp in enumerate(self.amp)
+        )
+
+    def run(self, dtype, n_cells, compress):
+        self._encode(compress)
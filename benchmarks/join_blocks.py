@@ -0,0 +1,21 @@
+"""Throughput of joining decoded blocks."""
+
+import pycatzao
+
+from .common import DTYPES, N_CELLS, Throughput, recording
+
+
+class JoinBlocks(Throughput):
+    """Joining decoded blocks with :func:`pycatzao.join_blocks`."""
+
+    params = [DTYPES, N_CELLS]
+    param_names = ["dtype", "n_cells"]
+
+    def setup(self, dtype, n_cells):
+        self.n_msg = 5_000
+        data = recording(self.n_msg, n_cells=n_cells, dtype=dtype)
+        self.n_bytes = len(data)
+        self.blocks, _ = pycatzao.decode(data)
+
+    def run(self, dtype, n_cells):
+        pycatzao.join_blocks(self.blocks)
@@ -0,0 +1,63 @@
+"""Throughput of reading files in chunks of different sizes."""
+
+import pathlib
+import time
+
+import numpy as np
+
+import pycatzao
+from pycatzao import _utils
+
+
+def _consume(file_name, buffer_size):
+    for _ in _utils._map_file(
+        file_name,
+        func=lambda data: _utils._map_blocks(data, func=len),
+        size=-1,
+        buffer_size=buffer_size,
+    ):
+        pass
+
+
+class MapFile:
+    """Reading a file in chunks of different sizes.
+
+    The file consists of large messages that span many chunks for small buffer sizes.
+    The throughput should not depend on the buffer size.
+    """
+
+    params = [2**10, 2**14, 2**20, 100 * 2**20]
+    param_names = ["buffer_size"]
+    timeout = 300
+
+    def setup_cache(self):
+        rng = np.random.default_rng(0)
+        header = pycatzao.make_video_header(
+            start_az=0, end_az=1, cell_offset=0, cell_width=10
+        )
+
+        file_name = pathlib.Path("map_file.cat240").absolute()
+        with open(file_name, "wb") as f:
+            for i in range(1_000):
+                amp = rng.integers(0, 256, size=60_000, dtype=np.uint8)
+                f.write(
+                    pycatzao.encode(
+                        pycatzao.make_video_message(
+                            amp, msg_index=i, header=header, compress=False
+                        ),
+                        sac=7,
+                        sic=42,
+                    )
+                )
+
+        return file_name
+
+    def time_map_file(self, file_name, buffer_size):
+        _consume(file_name, buffer_size)
+
+    def track_map_file(self, file_name, buffer_size):
+        t = time.perf_counter()
+        _consume(file_name, buffer_size)
+        return file_name.stat().st_size / 1e6 / (time.perf_counter() - t)
+
+    track_map_file.unit = "MB/s"
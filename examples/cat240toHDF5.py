@@ -20,71 +20,51 @@ def toHDF(*, cat240_file, hdf5_file, n_read_binning=100_000_000, verbose=True):
         hdf5_file (str | pathlib.Path):
             Filename of the HDF5 file.
         n_read_binning (int):
-            Max. number of bins to read for inferring binning scheme.
+            Max. number of bytes to read for inferring binning scheme. Reading stops
+            earlier as soon as the inferred scheme is stable.
         verbose (bool):
             Print status to console.
     """
     log = print if verbose else lambda *args, **kwargs: None
 
-    df = dict()
-    for blocks in tqdm(
-        itertools.batched(
-            pycatzao.decode_file(cat240_file, size=-1, buffer_size=100_000),
-            1_000_000,
-        ),
-        desc=f"Decoding CAT240 data from {cat240_file}",
-    ):
-        cols = pycatzao.join_blocks(blocks)
-        for k in cols:
-            df[k] = np.append(df[k], cols[k]) if k in df else cols[k]
-
-    log("\nFinding cycles ...")
-    daz = np.diff(df["az"])
-    df["cycle"] = np.zeros_like(df["az"], dtype=np.uint32)
-    df["cycle"][1:] = np.cumsum(daz < 0)
-    log(f" * found {df['cycle'].max() + 1} cycles in {df['cycle'].size:,} rows")
-
-    log("\nInferring binning scheme ...")
+    log("Inferring binning scheme ...")
+    estimator = pycatzao.BinEdgeEstimator()
     with open(cat240_file, "rb") as f:
-        bins, _ = pycatzao.infer_bin_edges(f.read(n_read_binning))
+        while not estimator.converged and f.tell() < n_read_binning:
+            if not (data := f.read(1_000_000)):
+                break
 
-    df["az_edges"] = np.linspace(**bins["az"])
-    df["r_edges"] = np.arange(**bins["r"], stop=df["r"].max() + bins["r"]["step"])
+            estimator.update(data)
 
-    df["az"] = np.searchsorted(df["az_edges"], df["az"]).astype(np.uint16) - 1
-    df["r"] = np.searchsorted(df["r_edges"], df["r"]).astype(np.uint16) - 1
+    bins = estimator.bins
 
-    if verbose:
-        bins = df["az_edges"]
-        log(
-            f" * az(imuth) bin edges ({bins.size - 1} bins): "
-            f"{bins[0]:.2f}° .. {bins[-1]:.2f}°"
-        )
+    az_edges = np.linspace(**bins["az"])
+    log(
+        f" * az(imuth) bin edges ({az_edges.size - 1} bins): "
+        f"{az_edges[0]:.2f}° .. {az_edges[-1]:.2f}°"
+    )
 
-        bins = df["r_edges"]
+    with pycatzao.io.HDF5Writer(hdf5_file, bins) as writer:
+        for blocks in tqdm(
+            itertools.batched(
+                pycatzao.decode_file(cat240_file, size=-1, buffer_size=100_000),
+                100_000,
+            ),
+            desc=f"Converting CAT240 data from {cat240_file} to {hdf5_file}",
+            disable=not verbose,
+        ):
+            writer.write(blocks)
+
+    log(f"\n * found {writer.cycles} cycles in {len(writer):,} rows")
+    with h5py.File(hdf5_file, "r") as f:
+        r_edges = f["r_edges"][:]
+
+    if r_edges.size > 0:
         log(
-            f" *   r(ange) bin edges ({bins.size - 1} bins): "
-            f"{bins[0]:.2f}m .. {bins[-1]:.2f}m\n"
+            f" *   r(ange) bin edges ({r_edges.size - 1} bins): "
+            f"{r_edges[0]:.2f}m .. {r_edges[-1]:.2f}m\n"
         )
 
-    with h5py.File(hdf5_file, "w") as f:
-        for k in tqdm(df, desc=f"Writing data to {hdf5_file}", disable=not verbose):
-            f.create_dataset(k, data=df[k], compression="gzip")
-
-        f["tod"].attrs["desc"] = "Time of Day (UTC)"
-        f["tod"].attrs["unit"] = "second"
-
-        f["az"].attrs["desc"] = "Index of azimuth bins"
-        f["r"].attrs["desc"] = "Index of range bins"
-        f["amp"].attrs["desc"] = "Amplitude"
-        f["cycle"].attrs["desc"] = "Number of full rotations of the radar antenna"
-
-        f["az_edges"].attrs["desc"] = "Bin edges of clockwise azimuth"
-        f["az_edges"].attrs["unit"] = "degree"
-
-        f["r_edges"].attrs["desc"] = "Bin edges of range"
-        f["r_edges"].attrs["unit"] = "meter"
-
 
 def main():  # noqa: D103
     parser = argparse.ArgumentParser(
@@ -5,11 +5,20 @@ under the topics "Decoder", exposed as:
 
  - `pycatzao.decode`
  - `pycatzao.decode_file`
+ - `pycatzao.decode_columns`
+ - `pycatzao.decode_file_columns`
+ - `pycatzao.decode_file_parallel`
+ - `pycatzao.build_index`
+ - `pycatzao.seek_message`
+ - `pycatzao.scan_file`
 
 for decoding already existing bytestreams of Asterix CAT240 messsages, "Encoder",
 exposed as
 
  - `pycatzao.encode`
+ - `pycatzao.encode_sweep`
+ - `pycatzao.encode_into`
+ - `pycatzao.encode_video_into`
  - `pycatzao.make_summary`
  - `pycatzao.make_video_header`
  - `pycatzao.make_video_message`
@@ -18,8 +27,10 @@ for compiling new messages, and "Compressor", exposed as:
 
  - `pycatzao.compress`
  - `pycatzao.compress_file`
+ - `pycatzao.decompress`
+ - `pycatzao.decompress_file`
 
-for compressing (encoded) messages.
+for compressing (encoded) messages or restoring uncompressed ones.
 
 Typically, no interactions between methods of different topics is necessary and one can
 safely study their documentation separately.
@@ -28,7 +39,16 @@ Convenient helper functions for inferring the implicit binning scheme or for sta
 decoded block are exposed as "Utilities":
 
  - `pycatzao.infer_bin_edges`
+ - `pycatzao.BinEdgeEstimator`
  - `pycatzao.join_blocks`
+ - `pycatzao.ColumnAccumulator`
+ - `pycatzao.SweepAssembler`
+ - `pycatzao.rasterize_ppi`
+
+Writers for storing decoded data in common file formats (HDF5, Apache Arrow and
+Parquet) live in the submodule `pycatzao.io`; they depend on optional packages (e.g.,
+`pip install pycatzao[hdf5]` or `pip install pycatzao[arrow]`). For large recordings,
+prefer `pycatzao.io.to_parquet` over the CSV export of the example below.
 
 Example:
     .. code-block:: python
@@ -60,21 +80,37 @@ from . import _version
 __version__ = _version.get_versions()["version"]
 
 # export public API of the package
+from . import io  # noqa: F401
 from .compress import (
     compress,  # noqa: F401
     compress_file,  # noqa: F401
+    decompress,  # noqa: F401
+    decompress_file,  # noqa: F401
 )
 from .decoder import (
+    build_index,  # noqa: F401
     decode,  # noqa: F401
+    decode_columns,  # noqa: F401
     decode_file,  # noqa: F401
+    decode_file_columns,  # noqa: F401
+    decode_file_parallel,  # noqa: F401
+    scan_file,  # noqa: F401
+    seek_message,  # noqa: F401
 )
 from .encoder import (
     encode,  # noqa: F401
+    encode_into,  # noqa: F401
+    encode_sweep,  # noqa: F401
+    encode_video_into,  # noqa: F401
     make_summary,  # noqa: F401
     make_video_header,  # noqa: F401
     make_video_message,  # noqa: F401
 )
 from .utils import (
+    BinEdgeEstimator,  # noqa: F401
+    ColumnAccumulator,  # noqa: F401
+    SweepAssembler,  # noqa: F401
     infer_bin_edges,  # noqa: F401
     join_blocks,  # noqa: F401
+    rasterize_ppi,  # noqa: F401
 )
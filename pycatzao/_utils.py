@@ -1,48 +1,200 @@
-import numpy as np
+import collections
+import contextlib
+import mmap
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
+# START_AZ and END_AZ are 16-bit codes, hence their circular distance and mean can be
+# computed exactly by integer arithmetic (and a single multiplication with an exactly
+# representable scale) for both, scalars and arrays
 
-def _circular_distance(distance):
-    distance = np.deg2rad(distance)
-    return np.rad2deg(np.atan2(np.sin(distance), np.cos(distance))).item()
 
+def _circular_distance(start_az, end_az):
+    d = (end_az - start_az) % 2**16
+    d -= 2**16 * ((d > 2**15) | ((d == 2**15) & (end_az < start_az)))
+    return d * (360 / 2**16)
 
-def _circular_mean(a, b):
-    a = np.deg2rad(a)
-    b = np.deg2rad(b)
-    mean = np.arctan2(np.sin(a) + np.sin(b), np.cos(a) + np.cos(b))
-    return np.rad2deg(mean if mean >= 0 else mean + 2 * np.pi).item()
 
+def _circular_mean(start_az, end_az):
+    d = (end_az - start_az) % 2**16
+    d -= 2**16 * (d > 2**15)
+    return (2 * start_az + d) % 2**17 * (360 / 2**17)
 
-def _map_blocks(data, func):
-    blocks = []
+
+def _message_offsets(data):
+    offsets = [0]
 
     i = 0
-    done = False
-    while i + 3 < len(data) and not done:
+    while i + 3 < len(data):
         if data[i] != 240:  # pragma: no cover
             raise ValueError("Invalid Asterix CAT240 message.")
 
         length = int.from_bytes(data[i + 1 : i + 3], byteorder="big")
-        if not (done := i + length > len(data)):
-            blocks.append(func(data[i : i + length]))
-            i += length
+        if i + length > len(data):
+            break
+
+        i += length
+        offsets.append(i)
+
+    return offsets
+
+
+def _is_chain(data, i, n_chain):
+    for k in range(n_chain):
+        if i == len(data):
+            return k > 0
+
+        if i + 8 > len(data) or data[i] != 240:
+            return False
+
+        # mandatory items I240/010 and I240/000 and a known message type
+        uap1 = data[i + 3]
+        if uap1 & 0xC0 != 0xC0 or data[i + (7 if uap1 & 0x01 else 6)] not in (1, 2):
+            return False
+
+        if (length := int.from_bytes(data[i + 1 : i + 3], byteorder="big")) < 8:
+            return False
+
+        i += length
+
+    return True
+
+
+def _resync(data, *, n_chain=8):
+    i = data.find(b"\xf0")
+    while i >= 0 and not _is_chain(data, i, n_chain):
+        i = data.find(b"\xf0", i + 1)
 
+    return None if i < 0 else i
+
+
+def _map_blocks(data, func):
+    offsets = _message_offsets(data)
+    blocks = [func(data[i:j]) for i, j in zip(offsets[:-1], offsets[1:])]
+
+    i = offsets[-1]
     return blocks, data[i:] if i < len(data) else b""
 
 
-def _map_file(file_name, func, *, size, buffer_size):
+def _deflate(
+    data, *, level=-1, strategy=zlib.Z_DEFAULT_STRATEGY, wbits=15, mem_level=8
+):
+    # compressed amplitudes in zlib format; the defaults yield the same output as
+    # `zlib.compress`
+    c = zlib.compressobj(level, zlib.DEFLATED, wbits, mem_level, strategy)
+    return c.compress(data) + c.flush()
+
+
+def _check_deflate_options(*, level, strategy, wbits, mem_level):
+    # the decoder relies on the zlib header (window size detection with `wbits=0`),
+    # hence raw deflate and gzip streams are not supported
+    if not 9 <= wbits <= 15:
+        raise ValueError("`wbits` has to be in the range [9, 15].")
+
+    # let zlib validate the remaining options
+    zlib.compressobj(level, zlib.DEFLATED, wbits, mem_level, strategy)
+
+
+def _thread_pool(workers):
+    if workers > 1:
+        return ThreadPoolExecutor(workers)
+
+    return contextlib.nullcontext()
+
+
+def _ordered_map(func, items, *, executor, max_in_flight=256):
+    pending = collections.deque()
+    for item in items:
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+
+        pending.append(executor.submit(func, item))
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _map_file(file_name, func, *, size, buffer_size, offset=0):
     if buffer_size <= 0:
         buffer_size = -1
 
     if size > 0 > buffer_size:
         buffer_size = size
 
-    n = 0
-    data = b""
+    if size == 0:
+        return
+
     with open(file_name, "rb") as f:
-        while (size < 0 or n < size) and (
-            chunk := f.read(buffer_size if size < 0 else min(buffer_size, size - n))
-        ) != b"":
-            n += len(chunk)
-            blocks, data = func(data + chunk)
+        f.seek(offset)
+        if buffer_size < 0:
+            blocks, _ = func(f.read())
+            yield from blocks
+            return
+
+        if (file_size := os.fstat(f.fileno()).st_size) > 0:
+            buffer_size = min(buffer_size, file_size)
+
+        # a CAT240 message is at most 64 KiB large, hence the trailing bytes never
+        # exceed this size and have to be moved to the front only once in a while
+        buffer = bytearray(buffer_size + 2**20)
+        view = memoryview(buffer)
+
+        n = i = j = 0
+        need = 4
+        while size < 0 or n < size:
+            # read at least the remainder of the next message in one go
+            k = max(buffer_size, need - (j - i))
+            if size >= 0:
+                k = min(k, size - n)
+
+            if len(buffer) - j < k:
+                view[: j - i] = view[i:j]
+                i, j = 0, j - i
+
+            if (k := f.readinto(view[j : j + k])) == 0:
+                break
+
+            n += k
+            j += k
+            if j - i < need:
+                continue
+
+            blocks, tail = func(view[i:j])
+            i = j - len(tail)
+            need = 4 if len(tail) < 3 else max(4, int.from_bytes(tail[1:3], "big"))
+            del tail
+
             yield from blocks
+            del blocks
+
+
+_MMAP_WINDOW = 2**24
+
+
+def _map_mmap(file_name, func, *, size, buffer_size, offset=0):
+    with open(file_name, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        # the mapping is closed as soon as no view into it is alive anymore
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    view = view[offset:]
+    if 0 <= size < len(view):
+        view = view[:size]
+
+    if buffer_size <= 0:
+        # the mapping does not occupy RAM, i.e., bounded windows let decoding start
+        # right away, however large the file is
+        buffer_size = _MMAP_WINDOW
+
+    i = 0
+    need = 4
+    while (j := min(i + max(buffer_size, need), len(view))) - i >= need:
+        blocks, tail = func(view[i:j])
+        i = j - len(tail)
+        need = 4 if len(tail) < 3 else max(4, int.from_bytes(tail[1:3], "big"))
+        del tail
+
+        yield from blocks
@@ -2,7 +2,9 @@
 
 Use :func:`compress` to compress encoded Asterix CAT240 messages or
 :func:`compress_file` to compress an entire file. These operations do not change type
-`001` messages or already compressed messages of type `002`.
+`001` messages or already compressed messages of type `002`. Their counterparts
+:func:`decompress` and :func:`decompress_file` restore uncompressed messages, which are
+cheaper to decode if the same data is read many times.
 
 Examples:
     .. code-block:: python
@@ -27,16 +29,43 @@ Examples:
                 desc="Compressing data",
             ):
                 f.write(msg)
+
+    .. code-block:: python
+
+        # ... or let multiple threads compress it straight into a file
+        pycatzao.compress_file(
+            "uncompressed.cat240",
+            buffer_size=2**24,
+            workers=4,
+            out_file="compressed.cat240",
+        )
+
+    .. code-block:: python
+
+        # trade compression ratio for latency (live streaming) ...
+        compressed, _ = pycatzao.compress(blocks, level=1)
+
+        # ... or for a small footprint (archival)
+        compressed, _ = pycatzao.compress(blocks, level=9, strategy=zlib.Z_RLE)
+
+        # ... or let the first 100 messages decide
+        compressed, _ = pycatzao.compress(blocks, adaptive=100)
 """
 
+import contextlib
+import functools
+import itertools
+import threading
+import time
 import zlib
 
 from pycatzao import _utils as utils
+from pycatzao import decoder
 
 
-def _compress_block(data):
-    data = bytearray(data)
-
+def _video_block(data, *, compressed=False):
+    # location of the video block of a type `002` message whose compression bit equals
+    # `compressed` or `None` if the message is passed through unchanged
     uap1 = data[3]
     mFX = uap1 & 0x01 == 0x01
 
@@ -44,21 +73,19 @@ def _compress_block(data):
     m050 = uap2 & 0x40 == 0x40
     m051 = uap2 & 0x20 == 0x20
     m052 = uap2 & 0x10 == 0x10
-    m140 = uap2 & 0x08 == 0x08
 
     if data[i + 2] == 1:  # message type 1
-        return bytes(data)
+        return None
 
     i += 2  # I240/010
     i += 1  # I240/000
     i += 4  # I240/020
     i += 12  # I240/040 or I240/041
 
-    # I240/04
-    if data[i] == 0x80:  # already compressed
-        return bytes(data)
+    # I240/048
+    if (data[i] & 0x80 == 0x80) != compressed:
+        return None
 
-    data[i] = 0x80  # set compression bit
     i += 2
 
     # I240/049
@@ -75,35 +102,180 @@ def _compress_block(data):
         raise ValueError("Invalid Asterix CAT240 message.")
 
     m = n * data[i + 5]
-    amp = zlib.compress(data[i + 6 : i + m + 6][:nb_vb])
-    tod = data[i + m + 6 : i + m + 9]
+    return i, n, data[i + 6 : i + m + 6][:nb_vb]
 
-    # set NB_VB to the number of bytes after compression
-    data[i : i + 2] = len(amp).to_bytes(2, byteorder="big")
+
+def _pack_block(data, i, n, amp, *, compressed=True):
+    # replace the video block of the message by the (de)compressed amplitudes `amp`,
+    # where `i` is the position of I240/049 and `n` the block size of I240/05x, or
+    # return `None` if the amplitudes do not fit into a single message
+    m = n * data[i + 5]
+    tod = data[i + m + 6 :]  # I240/140 (if present)
+
+    msg = bytearray(data[: i + 6])
+    msg[i - 2] = 0x80 if compressed else 0x00  # set compression bit
+
+    # switch to larger blocks if REP would overflow
+    if len(amp) > 255 * n:
+        n = 64 if len(amp) <= 255 * 64 else 256
+        if len(amp) > 255 * n:
+            return None
+
+        msg[4] = msg[4] & ~0x70 | {64: 0x20, 256: 0x10}[n]
+
+    # set NB_VB to the number of bytes of the video block (w/o padding)
+    msg[i : i + 2] = len(amp).to_bytes(2, byteorder="big")
 
     # pad to a multiple of `n`
-    amp += b"\x00" * ((1 + (len(amp) - 1) // n) * n - len(amp))
-    m = len(amp)
-    assert m % n == 0
+    pad = -len(amp) % n
+
+    # update REP and LEN
+    msg[i + 5] = (len(amp) + pad) // n
+    length = len(msg) + len(amp) + pad + len(tod)
+    if length > 0xFFFF:
+        return None
+
+    msg[1:3] = length.to_bytes(2, byteorder="big")
 
-    # update REP and VIDEO BLOCK
-    data[i + 5] = m // n
-    data[i + 6 : i + m + 6] = amp
+    # the amplitudes are copied only once
+    return b"".join([msg, amp, bytes(pad), tod])
 
-    i += 5  # I240/049
-    i += m + 1  # I240/05x
 
-    # I240/140
-    if m140:
-        data[i : i + 3] = tod
-        i += 3
+class _AdaptiveDeflate:
+    # compresses the first `n_sample` video blocks with all candidate settings and
+    # sticks to the one that saves the most bytes per CPU millisecond afterwards;
+    # returns `None` if compression does not shrink a video block
+    candidates = list(
+        itertools.product([1, 6, 9], [zlib.Z_DEFAULT_STRATEGY, zlib.Z_RLE])
+    )
+
+    def __init__(self, n_sample, *, wbits, mem_level):
+        self.n_sample = n_sample
+        self.wbits = wbits
+        self.mem_level = mem_level
+
+        self.choice = None
+        self._saved = [0] * len(self.candidates)
+        self._cpu_time = [0] * len(self.candidates)
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def _deflate(self, data, level, strategy):
+        return utils._deflate(
+            data,
+            level=level,
+            strategy=strategy,
+            wbits=self.wbits,
+            mem_level=self.mem_level,
+        )
+
+    def _sample(self, data):
+        best = None
+        for k, (level, strategy) in enumerate(self.candidates):
+            t0 = time.thread_time_ns()
+            deflated = self._deflate(data, level, strategy)
+            self._cpu_time[k] += time.thread_time_ns() - t0
+            self._saved[k] += len(data) - len(deflated)
+
+            if best is None or len(deflated) < len(best):
+                best = deflated
+
+        self._n += 1
+        if self._n >= self.n_sample:
+            k = max(
+                range(len(self.candidates)),
+                key=lambda k: self._saved[k] / max(self._cpu_time[k], 1),
+            )
+            self.choice = self.candidates[k]
+
+        return best
+
+    def __call__(self, data):
+        deflated = None
+        if self.choice is None:
+            with self._lock:
+                if self.choice is None:
+                    deflated = self._sample(data)
+
+        if deflated is None:
+            deflated = self._deflate(data, *self.choice)
+
+        return deflated if len(deflated) < len(data) else None
+
+
+def _deflater(*, level, strategy, wbits, mem_level, adaptive):
+    utils._check_deflate_options(
+        level=level, strategy=strategy, wbits=wbits, mem_level=mem_level
+    )
+
+    if adaptive > 0:
+        return _AdaptiveDeflate(adaptive, wbits=wbits, mem_level=mem_level)
+
+    return functools.partial(
+        utils._deflate,
+        level=level,
+        strategy=strategy,
+        wbits=wbits,
+        mem_level=mem_level,
+    )
+
+
+def _rewrite(data, *, executor, func, compressed, copy):
+    # replace the video blocks of all type `002` messages that are not `compressed`
+    # yet (or anymore) by `func(video)` (if not `None`)
+    messages, tail = utils._map_blocks(
+        memoryview(data),
+        func=lambda msg: (msg, _video_block(msg, compressed=not compressed)),
+    )
 
-    data[1:3] = i.to_bytes(2, byteorder="big")
+    videos = (video[2] for _, video in messages if video is not None)
+    if executor is None:
+        amps = map(func, videos)
+    else:
+        # zlib releases the GIL, i.e., video blocks are (de)compressed in parallel
+        # while everything else is done in the calling thread
+        amps = utils._ordered_map(func, videos, executor=executor)
 
-    return bytes(data[:i])
+    blocks = []
+    for msg, video in messages:
+        block = None
+        if video is not None and (amp := next(amps)) is not None:
+            block = _pack_block(msg, *video[:2], amp, compressed=compressed)
+
+        if block is None:
+            # untouched messages are passed through as views if they are consumed
+            # right away (e.g., by writing them to a file)
+            block = bytes(msg) if copy else msg
+
+        blocks.append(block)
+
+    return blocks, bytes(tail)
+
+
+def _compress(data, *, executor, deflate=zlib.compress, copy=True):
+    return _rewrite(data, executor=executor, func=deflate, compressed=True, copy=copy)
+
+
+def _decompress(data, *, executor, copy=True):
+    return _rewrite(
+        data,
+        executor=executor,
+        func=decoder._decompress,
+        compressed=False,
+        copy=copy,
+    )
 
 
-def compress(data):
+def compress(
+    data,
+    *,
+    workers=0,
+    level=-1,
+    strategy=zlib.Z_DEFAULT_STRATEGY,
+    wbits=15,
+    mem_level=8,
+    adaptive=0,
+):
     """Compress Asterix CAT240 data.
 
     Compresses non-compressed Asterix CAT240 type `002` messages. Other messages are
@@ -114,20 +286,171 @@ def compress(data):
     Args:
         data (bytes):
             Encoded Asterix CAT240 messages.
+        workers (int):
+            Number of threads for compressing video blocks in parallel. If not larger
+            than one, all messages are compressed in the calling thread.
+        level (int):
+            Compression level from `0` (none) over `1` (fastest) to `9` (smallest
+            output) or `-1` for zlib's default (see
+            :func:`pycatzao.encoder.make_video_message`).
+        strategy (int):
+            Compression strategy, e.g., `zlib.Z_DEFAULT_STRATEGY` or `zlib.Z_RLE`.
+        wbits (int):
+            Base-two logarithm of the window size in the range `[9, 15]`.
+        mem_level (int):
+            Memory usage of the compression from `1` to `9` (`memLevel` in zlib).
+        adaptive (int):
+            If positive, the first `adaptive` video blocks are compressed with several
+            combinations of `level` and `strategy` (which are ignored in this case)
+            and the combination that saves the most bytes per CPU millisecond is used
+            for all remaining blocks. Moreover, messages are left uncompressed if
+            compression does not shrink their video block.
 
     Returns:
         tuple[bytes, bytes]:
             Compressed messages and state (see :func:`pycatzao.decoder.decode` for
             details on how to use the latter.)
 
+    Raises:
+        ValueError: If the compression options are invalid.
     """
-    return utils._map_blocks(data, func=_compress_block)
-
-
-def compress_file(file_name, *, buffer_size=-1):
+    deflate = _deflater(
+        level=level,
+        strategy=strategy,
+        wbits=wbits,
+        mem_level=mem_level,
+        adaptive=adaptive,
+    )
+    with utils._thread_pool(workers) as executor:
+        return _compress(data, executor=executor, deflate=deflate)
+
+
+def _rewrite_file(file_name, func, *, buffer_size, workers, copy):
+    with utils._thread_pool(workers) as executor:
+        yield from utils._map_file(
+            file_name,
+            func=functools.partial(func, executor=executor, copy=copy),
+            size=-1,
+            buffer_size=buffer_size,
+        )
+
+
+def _write_file(file_name, func, *, out_file, **kwargs):
+    if out_file is None:
+        return _rewrite_file(file_name, func, copy=True, **kwargs)
+
+    with (
+        contextlib.nullcontext(out_file)
+        if hasattr(out_file, "write")
+        else open(out_file, "wb")
+    ) as f:
+        return sum(
+            f.write(msg) for msg in _rewrite_file(file_name, func, copy=False, **kwargs)
+        )
+
+
+def compress_file(
+    file_name,
+    *,
+    buffer_size=-1,
+    workers=0,
+    out_file=None,
+    level=-1,
+    strategy=zlib.Z_DEFAULT_STRATEGY,
+    wbits=15,
+    mem_level=8,
+    adaptive=0,
+):
     """Compress an Asterix CAT240 file.
 
     This is a helper function that compresses a file with (binary) Asterix CAT240 data.
+    The video blocks can be compressed by multiple threads; the order of the messages
+    is retained and the number of messages in flight is bounded.
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        buffer_size (int):
+            Process file in chunks of this size. If negative, the entire file will be
+            loaded to RAM at once.
+        workers (int):
+            Number of threads for compressing video blocks in parallel (see
+            :func:`compress`). The threads are shared by all chunks of the file.
+        out_file (str | pathlib.Path | typing.BinaryIO | None):
+            Name or (binary) file handle of the output file. If set, the compressed
+            messages are written straight to this file and messages that are not
+            changed (type `001` or already compressed messages) are written directly
+            from the read buffer. If `None`, the compressed messages are returned.
+        level (int):
+            See :func:`compress`.
+        strategy (int):
+            See :func:`compress`.
+        wbits (int):
+            See :func:`compress`.
+        mem_level (int):
+            See :func:`compress`.
+        adaptive (int):
+            See :func:`compress`. The settings are sampled once per file.
+
+    Returns:
+        typing.Generator[bytes, None, None] | int:
+            Compressed messages or, if `out_file` is set, the number of written bytes.
+
+    Raises:
+        ValueError: If the compression options are invalid.
+    """
+    deflate = _deflater(
+        level=level,
+        strategy=strategy,
+        wbits=wbits,
+        mem_level=mem_level,
+        adaptive=adaptive,
+    )
+    return _write_file(
+        file_name,
+        functools.partial(_compress, deflate=deflate),
+        buffer_size=buffer_size,
+        workers=workers,
+        out_file=out_file,
+    )
+
+
+def decompress(data, *, workers=0):
+    """Decompress Asterix CAT240 data.
+
+    Counterpart of :func:`compress`: Rewrites compressed Asterix CAT240 type `002`
+    messages into their uncompressed form; other messages are returned unchanged. This
+    trades disk space for cheaper decoding, e.g., for recordings that are read over
+    and over again. The requirements on `data` and the return type are identical to
+    :func:`compress`.
+
+    Compressed messages whose video block would not fit into a single uncompressed
+    message (i.e., more than 64 KiB) are returned unchanged as well.
+
+    Args:
+        data (bytes):
+            Encoded Asterix CAT240 messages.
+        workers (int):
+            Number of threads for decompressing video blocks in parallel. If not larger
+            than one, all messages are decompressed in the calling thread.
+
+    Returns:
+        tuple[bytes, bytes]:
+            Decompressed messages and state (see :func:`pycatzao.decoder.decode` for
+            details on how to use the latter.)
+
+    Raises:
+        ValueError: If a video block is not compressed with zlib.
+    """
+    with utils._thread_pool(workers) as executor:
+        return _decompress(data, executor=executor)
+
+
+def decompress_file(file_name, *, buffer_size=-1, workers=0, out_file=None):
+    """Decompress an Asterix CAT240 file.
+
+    This is a helper function that decompresses a file with (binary) Asterix CAT240
+    data (see :func:`decompress`) and is otherwise identical to :func:`compress_file`.
 
     Args:
         file_name (str | pathlib.Path):
@@ -135,11 +458,23 @@ def compress_file(file_name, *, buffer_size=-1):
         buffer_size (int):
             Process file in chunks of this size. If negative, the entire file will be
             loaded to RAM at once.
+        workers (int):
+            Number of threads for decompressing video blocks in parallel. The threads
+            are shared by all chunks of the file.
+        out_file (str | pathlib.Path | typing.BinaryIO | None):
+            Name or (binary) file handle of the output file. If set, the decompressed
+            messages are written straight to this file. If `None`, the decompressed
+            messages are returned.
 
     Returns:
-        typing.Generator[bytes, None, None]:
-            Compressed messages.
+        typing.Generator[bytes, None, None] | int:
+            Decompressed messages or, if `out_file` is set, the number of written
+            bytes.
     """
-    yield from utils._map_file(
-        file_name, func=compress, size=-1, buffer_size=buffer_size
+    return _write_file(
+        file_name,
+        _decompress,
+        buffer_size=buffer_size,
+        workers=workers,
+        out_file=out_file,
     )
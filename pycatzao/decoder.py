@@ -39,16 +39,45 @@ for message type `002` (Video message), as well as
  - `tod` (if present): Time of Day in seconds (We literally just decode the encoded value. It is beyond the scope of this library to interpret this value, e.g., as an absolute UTC time stamping.)
 
 in both messages.
+
+If only a part of the data is needed, pass filters to :func:`decode` or
+:func:`decode_file`: Messages can be selected by their source (`sources`), azimuth
+sector (`az_range`) or ToD (`tod_range`) and the range can be gated (`r_max`). These
+filters are evaluated on the headers of the messages, i.e., before any video block is
+decompressed.
+
+By default, only cells with non-zero amplitudes are returned. Use `min_amp` for
+dropping weak cells (e.g., clutter) as well or `keep_zeros` for getting all cells
+without gathering them, e.g., for dense downstream processing.
+
+For random access into (large) recordings, :func:`build_index` stores the offsets of all
+messages next to the file. This index is used by :func:`seek_message` and by
+:func:`decode_file` for decoding only a given time window.
+
+If the decoded data are consumed as a table anyway, use :func:`decode_columns` or
+:func:`decode_file_columns` instead. These functions skip the `dict` per message and
+decode type `002` messages straight into columns (see also
+:func:`pycatzao.utils.join_blocks`). Large files can be decoded into columns using
+multiple processes with :func:`decode_file_parallel`.
+
+For getting an overview of a recording without decoding any video data at all, use
+:func:`scan_file` that only decodes the headers of the messages.
 """  # noqa: E501
 
+import contextlib
+import functools
+import os
+import pathlib
+import tempfile
 import zlib
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
 from pycatzao import _utils
 
 
-def _decode_block(data):
+def _decode_header(data):
     uap1 = data[3]
     m040 = uap1 & 0x08 == 0x08
     mFX = uap1 & 0x01 == 0x01
@@ -64,13 +93,14 @@ def _decode_block(data):
         "sic": data[i + 1],  # I240/010
         "type": data[i + 2],  # I240/000
     }
+    video = None
     i += 3
 
     match msg["type"]:
         case 1:
             # I240/030
             n = data[i]
-            msg["summary"] = data[i + 1 : i + 1 + n].decode("ascii")
+            msg["summary"] = str(data[i + 1 : i + 1 + n], "ascii")
             i += 1 + n
 
         case 2:
@@ -79,17 +109,19 @@ def _decode_block(data):
             i += 4
 
             # I240/040 or I240/041
-            az_scale = 360 / 2**16
             t_scale = 1e-9 if m040 else 1e-15
 
-            start_az = int.from_bytes(data[i : i + 2], byteorder="big") * az_scale
-            end_az = int.from_bytes(data[i + 2 : i + 4], byteorder="big") * az_scale
+            start_az = int.from_bytes(data[i : i + 2], byteorder="big")
+            end_az = int.from_bytes(data[i + 2 : i + 4], byteorder="big")
             start_rg = int.from_bytes(data[i + 4 : i + 8], byteorder="big")
             cell_dur = int.from_bytes(data[i + 8 : i + 12], byteorder="big") * t_scale
             i += 12
 
             msg["az"] = _utils._circular_mean(start_az, end_az)
-            msg["az_cell_size"] = _utils._circular_distance(end_az - start_az)
+            msg["az_cell_size"] = _utils._circular_distance(start_az, end_az)
+
+            c = 299_792_458
+            msg["r_cell_size"] = cell_dur * c / 2
 
             # I240/048
             compression = data[i] & 0x80 == 0x80
@@ -112,36 +144,16 @@ def _decode_block(data):
                 raise ValueError("Invalid Asterix CAT240 message.")
 
             n *= data[i]
-            amp = data[i + 1 : i + n + 1][:nb_vb]
+            video = (
+                data[i + 1 : i + n + 1][:nb_vb],
+                compression,
+                res,
+                nb_cells,
+                start_rg,
+                cell_dur,
+            )
             i += n + 1
 
-            if compression:
-                try:
-                    amp = zlib.decompress(amp, wbits=0)
-                except zlib.error as e:  # pragma: no cover
-                    raise ValueError("Video blocks not compressed with zlib.") from e
-
-            if res == 8:
-                dtype = np.uint8
-            elif res == 16:
-                dtype = np.uint16
-            elif res == 32:
-                dtype = np.uint32
-            else:  # pragma: no cover
-                raise NotImplementedError(
-                    f"{res} bit resolution is not yet implemented."
-                )
-
-            msg["amp"] = np.frombuffer(amp, dtype=dtype)[:nb_cells]
-
-            c = 299_792_458
-            msg["r"] = cell_dur * (start_rg + np.arange(nb_cells)) * c / 2
-            msg["r_cell_size"] = cell_dur * c / 2
-
-            mask = msg["amp"] > 0
-            msg["amp"] = msg["amp"][mask]
-            msg["r"] = msg["r"][mask].astype(np.float32)
-
     # I240/140
     if m140:
         msg["tod"] = int.from_bytes(data[i : i + 3], byteorder="big") / 128
@@ -150,17 +162,182 @@ def _decode_block(data):
     if i != len(data):  # pragma: no cover
         raise ValueError("Invalid Asterix CAT240 message.")
 
+    return msg, video
+
+
+def _amp_dtype(res):
+    if res == 8:
+        return np.uint8
+    elif res == 16:
+        return np.uint16
+    elif res == 32:
+        return np.uint32
+    else:  # pragma: no cover
+        raise NotImplementedError(f"{res} bit resolution is not yet implemented.")
+
+
+def _decompress(amp, max_length=-1):
+    try:
+        if max_length < 0:
+            return zlib.decompress(amp, wbits=0)
+
+        if max_length == 0:
+            return b""
+
+        # range gating: only the leading `max_length` bytes are inflated
+        return zlib.decompressobj(wbits=0).decompress(amp, max_length)
+    except zlib.error as e:  # pragma: no cover
+        raise ValueError("Video blocks not compressed with zlib.") from e
+
+
+@functools.lru_cache(maxsize=1024)
+def _range_axis(start_rg, cell_dur, nb_cells):
+    # the range geometry rarely changes within a stream, i.e., the (read-only) range
+    # of all cells is cached and merely indexed by the non-zero cells of each message
+    c = 299_792_458
+    r = (cell_dur * (start_rg + np.arange(nb_cells)) * c / 2).astype(np.float32)
+    r.flags.writeable = False
+    return r
+
+
+def _max_length(res, nb_cells, start_rg, cell_dur, r_max):
+    # number of bytes of the video block that are needed for cells up to `r_max`
+    if r_max is None:
+        return -1
+
+    r = _range_axis(start_rg, cell_dur, nb_cells)
+    n = np.searchsorted(r, r_max, side="right").item()
+    return -1 if n == nb_cells else n * np.dtype(_amp_dtype(res)).itemsize
+
+
+def _decode_video(
+    amp,
+    compression,
+    res,
+    nb_cells,
+    start_rg,
+    cell_dur,
+    *,
+    r_max=None,
+    min_amp=1,
+    keep_zeros=False,
+):
+    max_length = _max_length(res, nb_cells, start_rg, cell_dur, r_max)
+    if compression:
+        amp = _decompress(amp, max_length)
+    elif max_length >= 0:
+        amp = amp[:max_length]
+
+    if keep_zeros:
+        # views into a (reused) file buffer would be overwritten by the next chunk
+        if isinstance(amp, memoryview) and not amp.readonly:
+            amp = bytes(amp)
+
+        amp = np.frombuffer(amp, dtype=_amp_dtype(res))[:nb_cells]
+        return amp, _range_axis(start_rg, cell_dur, nb_cells)[: amp.size]
+
+    amp = np.frombuffer(amp, dtype=_amp_dtype(res))[:nb_cells]
+
+    (cells,) = np.nonzero(amp if min_amp == 1 else amp >= min_amp)
+    return amp[cells], _range_axis(start_rg, cell_dur, nb_cells)[cells]
+
+
+def _message_filter(*, sources=None, az_range=None, tod_range=None):
+    # predicates on the decoded header of a message, i.e., they are evaluated before
+    # any video block is decompressed
+    predicates = []
+    if sources is not None:
+        sources = {tuple(source) for source in sources}
+        predicates.append(lambda msg: (msg["sac"], msg["sic"]) in sources)
+
+    if az_range is not None:
+        az0, az1 = az_range
+        width = az1 - az0
+        if not 0 <= width <= 360:
+            width %= 360
+
+        predicates.append(
+            lambda msg: msg["type"] != 2 or (msg["az"] - az0) % 360 < width
+        )
+
+    if tod_range is not None:
+        predicates.append(lambda msg: _tod_window(msg.get("tod", np.nan), *tod_range))
+
+    if len(predicates) == 0:
+        return None
+
+    return lambda msg: all(predicate(msg) for predicate in predicates)
+
+
+def _check_mask_policy(min_amp, keep_zeros):
+    if keep_zeros and min_amp != 1:
+        raise ValueError("Cannot keep zeros while thresholding amplitudes.")
+
+
+def _decode_block(data, *, accept=None, **kwargs):
+    msg, video = _decode_header(data)
+    if accept is not None and not accept(msg):
+        return None
+
+    if video is not None:
+        msg["amp"], msg["r"] = _decode_video(*video, **kwargs)
+
     return msg
 
 
-def decode(data):
+def _decode(data, *, executor, accept=None, r_max=None, **kwargs):
+    if executor is None:
+        blocks, tail = _utils._map_blocks(
+            data,
+            func=functools.partial(_decode_block, accept=accept, r_max=r_max, **kwargs),
+        )
+        if accept is not None:
+            blocks = [block for block in blocks if block is not None]
+
+        return blocks, tail
+
+    # zlib releases the GIL, i.e., video blocks are decompressed in parallel while
+    # everything else is decoded in the calling thread
+    blocks, tail = _utils._map_blocks(data, func=_decode_header)
+    if accept is not None:
+        blocks = [(msg, video) for msg, video in blocks if accept(msg)]
+
+    inflated = _utils._ordered_map(
+        lambda video: _decompress(video[0], _max_length(*video[2:], r_max)),
+        (video for _, video in blocks if video is not None and video[1]),
+        executor=executor,
+    )
+
+    for msg, video in blocks:
+        if video is not None:
+            if video[1]:
+                video = (next(inflated), False, *video[2:])
+
+            msg["amp"], msg["r"] = _decode_video(*video, r_max=r_max, **kwargs)
+
+    return [msg for msg, _ in blocks], tail
+
+
+def decode(
+    data,
+    *,
+    workers=0,
+    sources=None,
+    az_range=None,
+    tod_range=None,
+    r_max=None,
+    min_amp=1,
+    keep_zeros=False,
+):
     r"""Decode CAT240 data.
 
     This functions decodes a given binary blob of encoded Asterix CAT240 messages (type
     `001` or `002`). The data have to start with a new CAT240 message but can end in
     the middle of one. The bytes of the incomplete message at the end of the input data
     are returned such that a chunking a long byte sequence by subsequent calls to
-    :func:`decode` becomes trivial.
+    :func:`decode` becomes trivial. Messages can be filtered by their source, azimuth
+    and ToD. These filters are evaluated on the headers of the messages, i.e., before
+    any video block is decompressed.
 
     Example:
         >>> data = b'\\xf0\\x00\\x13\\xd1...'
@@ -176,17 +353,73 @@ def decode(data):
     Args:
         data (bytes):
             Encoded CAT240 messages as a binary blob that start with a new message.
+        workers (int):
+            Number of threads for decompressing video blocks in parallel. If not
+            larger than one, all messages are decoded in the calling thread.
+        sources (Iterable[tuple[int, int]] | None):
+            Only decode messages of these sources given as `(sac, sic)` pairs.
+        az_range (tuple[float, float] | None):
+            Only decode type `002` messages with an azimuth `az` in the (clockwise)
+            sector from the first to the second value (in degrees), e.g., `(350, 10)`
+            for a sector of 20 degrees around north.
+        tod_range (tuple[float | None, float | None] | None):
+            Only decode messages with a ToD in this half-open interval (in seconds).
+            Messages without a ToD are skipped. `None` leaves the respective end of the
+            interval open.
+        r_max (float | None):
+            Only decode cells with a range not larger than this value (in meters).
+            Compressed video blocks are only inflated up to the last of these cells.
+        min_amp (int):
+            Only keep cells with an amplitude not smaller than this value. By default,
+            all non-zero cells are kept.
+        keep_zeros (bool):
+            Keep all cells (including zeros) instead of gathering the cells with
+            non-zero amplitudes. The amplitudes are (read-only) views of the decoded
+            video block and the ranges are views of a cached range axis, i.e., no
+            arrays are allocated per message. Cannot be combined with `min_amp`.
 
     Returns:
         tuple[dict, bytes]:
             Decoded message and trailing bytes. The latter carries the state of the
             decoder and should be prepended to the input data for the subsequent call
             to :func:`decode`.
-    """  # noqa: E501
-    return _utils._map_blocks(data, func=_decode_block)
-
 
-def decode_file(file_name, *, size=-1, buffer_size=-1):
+    Raises:
+        ValueError:
+            Both `min_amp` and `keep_zeros` are set.
+    """  # noqa: E501
+    _check_mask_policy(min_amp, keep_zeros)
+    accept = _message_filter(
+        sources=sources,
+        az_range=az_range,
+        tod_range=tod_range,
+    )
+    with _utils._thread_pool(workers) as executor:
+        return _decode(
+            data,
+            executor=executor,
+            accept=accept,
+            r_max=r_max,
+            min_amp=min_amp,
+            keep_zeros=keep_zeros,
+        )
+
+
+def decode_file(
+    file_name,
+    *,
+    size=-1,
+    buffer_size=-1,
+    mmap=False,
+    workers=0,
+    sources=None,
+    az_range=None,
+    tod_range=None,
+    index_file=None,
+    r_max=None,
+    min_amp=1,
+    keep_zeros=False,
+):
     """Decode a CAT240 file.
 
     This is a helper function that reads and decodes a file with (binary) Asterix
@@ -200,13 +433,576 @@ def decode_file(file_name, *, size=-1, buffer_size=-1):
             will be read.
         buffer_size (int):
             Process file in chunks of this size. If negative, the entire file will be
-            loaded to RAM at once.
+            loaded to RAM at once (or, if `mmap` is set, decoded in windows of
+            16 MiB).
+        mmap (bool):
+            Map the file into memory instead of reading it. The chunks are views into
+            the mapping such that the page cache is the only buffer and video blocks
+            of uncompressed messages are read without copying them first.
+        workers (int):
+            Number of threads for decompressing video blocks in parallel (see
+            :func:`decode`). The threads are shared by all chunks of the file.
+        sources (Iterable[tuple[int, int]] | None):
+            Only decode messages of these sources given as `(sac, sic)` pairs.
+        az_range (tuple[float, float] | None):
+            Only decode type `002` messages with an azimuth `az` in the (clockwise)
+            sector from the first to the second value (in degrees), e.g., `(350, 10)`
+            for a sector of 20 degrees around north.
+        tod_range (tuple[float | None, float | None] | None):
+            Only decode messages with a ToD in this half-open interval (in seconds).
+            Messages without a ToD are skipped. `None` leaves the respective end of the
+            interval open. The index of the file (see :func:`build_index`) is used for
+            jumping straight to the first message in the interval and for stopping
+            after the last one.
+        index_file (str | pathlib.Path | None):
+            Name of the index file (see :func:`seek_message`). Only used if
+            `tod_range` is set.
+        r_max (float | None):
+            Only decode cells with a range not larger than this value (in meters).
+            Compressed video blocks are only inflated up to the last of these cells.
+        min_amp (int):
+            Only keep cells with an amplitude not smaller than this value. By default,
+            all non-zero cells are kept.
+        keep_zeros (bool):
+            Keep all cells (including zeros) instead of gathering the cells with
+            non-zero amplitudes. The amplitudes are (read-only) views of the decoded
+            video block and the ranges are views of a cached range axis, i.e., no
+            arrays are allocated per message. Cannot be combined with `min_amp`.
 
     Returns:
         typing.Generator[dict, None, None]:
             Decoded messages (type of generated items is the same as the first return
             type of :func:`decode`.)
+
+    Raises:
+        ValueError:
+            Both `min_amp` and `keep_zeros` are set.
+    """
+    _check_mask_policy(min_amp, keep_zeros)
+    offset = 0
+    if tod_range is not None:
+        index = _load_index(file_name, index_file)
+        sel = _tod_window(index["tod"], *tod_range)
+        if size >= 0:
+            sel &= index["offset"] + index["length"] <= size
+
+        if not np.any(sel):
+            return
+
+        (k,) = np.nonzero(sel)
+        offset = index["offset"][k[0]].item()
+        size = index["offset"][k[-1]].item() + index["length"][k[-1]].item() - offset
+
+    # the index only narrows down the byte range, i.e., messages within that range
+    # are still filtered (the ToD is not necessarily monotonic)
+    accept = _message_filter(
+        sources=sources,
+        az_range=az_range,
+        tod_range=tod_range,
+    )
+
+    map_file = _utils._map_mmap if mmap else _utils._map_file
+    with _utils._thread_pool(workers) as executor:
+        yield from map_file(
+            file_name,
+            func=functools.partial(
+                _decode,
+                executor=executor,
+                accept=accept,
+                r_max=r_max,
+                min_amp=min_amp,
+                keep_zeros=keep_zeros,
+            ),
+            size=size,
+            buffer_size=buffer_size,
+            offset=offset,
+        )
+
+
+# fixed layout of a type `002` message from I240/010 up to (and including) REP
+_VIDEO_HEADER = np.dtype(
+    [
+        ("sac", "u1"),  # I240/010
+        ("sic", "u1"),  # I240/010
+        ("type", "u1"),  # I240/000
+        ("idx", ">u4"),  # I240/020
+        ("start_az", ">u2"),  # I240/040 or I240/041
+        ("end_az", ">u2"),
+        ("start_rg", ">u4"),
+        ("cell_dur", ">u4"),
+        ("compression", "u1"),  # I240/048
+        ("res", "u1"),
+        ("nb_vb", ">u2"),  # I240/049
+        ("nb_cells_hi", "u1"),
+        ("nb_cells_lo", ">u2"),
+        ("rep", "u1"),  # I240/050 or I240/051 or I240/052
+    ]
+)
+
+
+def _decode_headers(data, offsets):
+    buf = np.frombuffer(data, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    start, stop = offsets[:-1], offsets[1:]
+
+    uap1 = buf[start + 3]
+    mFX = uap1 & 0x01 == 0x01
+    uap2 = np.where(mFX, buf[np.minimum(start + 4, buf.size - 1)], 0)
+    i = start + np.where(mFX, 5, 4)
+
+    # gather all fixed-layout headers at once and decode them as structured array
+    # (all fields but I240/010 and I240/000 are zero for type `001` messages)
+    hdr = buf[np.minimum(i[:, None] + np.arange(_VIDEO_HEADER.itemsize), buf.size - 1)]
+    video = hdr[:, 2] == 2
+    hdr[~video, 3:] = 0
+    hdr = hdr.view(_VIDEO_HEADER)[:, 0]
+
+    t_scale = np.where(uap1 & 0x08 == 0x08, 1e-9, 1e-15)
+    start_az = hdr["start_az"].astype(np.int64)
+    end_az = hdr["end_az"].astype(np.int64)
+    cell_dur = hdr["cell_dur"] * t_scale
+
+    n = np.select(
+        [uap2 & 0x40 == 0x40, uap2 & 0x20 == 0x20, uap2 & 0x10 == 0x10],
+        [4, 64, 256],
+        0,
+    )
+    if np.any(video & (n == 0)):  # pragma: no cover
+        raise ValueError("Invalid Asterix CAT240 message.")
+
+    # I240/140
+    m140 = uap2 & 0x08 == 0x08
+    tod = np.full(i.size, np.nan)
+    t = stop[m140, None] - np.arange(3, 0, -1)
+    tod[m140] = (buf[t].astype(np.int64) @ [1 << 16, 1 << 8, 1]) / 128
+
+    i += _VIDEO_HEADER.itemsize
+    n *= hdr["rep"]
+    if np.any(video & (i + n + np.where(m140, 3, 0) != stop)):  # pragma: no cover
+        raise ValueError("Invalid Asterix CAT240 message.")
+
+    return {
+        "sac": hdr["sac"],
+        "sic": hdr["sic"],
+        "type": hdr["type"],
+        "idx": hdr["idx"],
+        "az": np.where(video, _utils._circular_mean(start_az, end_az), np.nan),
+        "az_cell_size": np.where(
+            video, _utils._circular_distance(start_az, end_az), np.nan
+        ),
+        "start_rg": hdr["start_rg"].astype(np.int64),
+        "cell_dur": cell_dur,
+        "compression": hdr["compression"] & 0x80 == 0x80,
+        "res": (1 << hdr["res"].astype(np.int64)) >> 1,
+        "nb_cells": (hdr["nb_cells_hi"].astype(np.int64) << 16) | hdr["nb_cells_lo"],
+        "video_start": i,
+        "video_stop": i + np.minimum(hdr["nb_vb"], n),
+        "tod": tod,
+    }
+
+
+def _decode_columns(data):
+    columns, offsets, tail = decode_columns(data)
+    return ([(columns, offsets)] if offsets.size > 1 else []), tail
+
+
+def decode_columns(data):
+    r"""Decode CAT240 data into columns.
+
+    This function is the columnar counterpart of :func:`decode`: Instead of returning
+    one `dict` per message, the type `002` messages are decoded straight into
+    preallocated columns that can directly be fed to, e.g., :class:`pandas.DataFrame`.
+    The result is identical to joining the output of :func:`decode` by
+    :func:`pycatzao.utils.join_blocks` but carries the message sequence identifier
+    (`idx`) and the origin of each row (`sac` and `sic`) as additional columns.
+    Messages of type `001` are skipped. The (fixed-layout) headers of all messages
+    are decoded at once by vectorized operations such that only the variable-length
+    video blocks are processed message by message.
+
+    Example:
+        >>> data = b'\\xf0\\x00\\x13\\xd1...'
+        >>> columns, offsets, state = pycatzao.decode_columns(data)
+        >>> columns
+        { 'tod': array([100.0, 100.0, 100.1, 100.1, 100.1, 100.2, ...], dtype=float32),
+           'az': array([  5.9,   5.9,   6.4,   6.4,   6.4,   6.9, ...], dtype=float32),
+            'r': array([ 94.2,  94.2,  89.2,  89.2,  89.2,  94.2, ...], dtype=float32),
+          'amp': array([248,   250,   127,   125,   130,   255,   ...], dtype=uint8),
+          'idx': array([4711,  4711,  4712,  4712,  4712,  4713,  ...], dtype=uint32),
+          'sac': array([  7,     7,     7,     7,     7,     7,   ...], dtype=uint8),
+          'sic': array([ 42,    42,    42,    42,    42,    42,   ...], dtype=uint8)}
+        >>> offsets
+        array([0, 2, 5, ...])
+
+    Args:
+        data (bytes):
+            Encoded CAT240 messages as a binary blob that start with a new message.
+
+    Returns:
+        tuple[dict, numpy.ndarray, bytes]:
+            Decoded columns, offsets and trailing bytes. The rows of the `k`-th type
+            `002` message are given by `offsets[k]:offsets[k + 1]`. The trailing bytes
+            carry the state of the decoder (see :func:`decode` for details).
+    """  # noqa: E501
+    offsets = _utils._message_offsets(data)
+    tail = data[offsets[-1] :] if offsets[-1] < len(data) else b""
+
+    hdr = _decode_headers(data, offsets)
+    hdr = {k: v[hdr["type"] == 2] for k, v in hdr.items()}
+    n_msg = hdr["idx"].size
+
+    # only the variable-length video blocks are left to per-message work; the
+    # non-zero cells (and their absolute cell index) are collected first such that all
+    # columns are allocated at their exact size (sparse video has far fewer non-zero
+    # cells than cells)
+    amp = [np.empty(0, dtype=_amp_dtype(hdr["res"].max(initial=8)))]
+    cells = [np.empty(0, dtype=np.int64)]
+    for k in range(n_msg):
+        a = data[hdr["video_start"][k] : hdr["video_stop"][k]]
+        if hdr["compression"][k]:
+            try:
+                a = zlib.decompress(a, wbits=0)
+            except zlib.error as e:  # pragma: no cover
+                raise ValueError("Video blocks not compressed with zlib.") from e
+
+        a = np.frombuffer(a, dtype=_amp_dtype(hdr["res"][k]))[: hdr["nb_cells"][k]]
+        (nz,) = np.nonzero(a)
+        amp.append(a[nz])
+        cells.append(nz + hdr["start_rg"][k])
+
+    counts = np.fromiter(map(len, cells[1:]), dtype=np.int64, count=n_msg)
+    offsets = np.zeros(n_msg + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    amp = np.concatenate(amp, dtype=amp[0].dtype)
+    cells = np.concatenate(cells)
+
+    def repeat(key, dtype):
+        return np.repeat(hdr[key].astype(dtype), counts)
+
+    # same arithmetic as `_range_axis` but in place to avoid further temporaries
+    r = repeat("cell_dur", np.float64)
+    r *= cells
+    r *= 299_792_458
+    r /= 2
+
+    return (
+        {
+            "tod": repeat("tod", np.float32),
+            "az": repeat("az", np.float32),
+            "r": r.astype(np.float32),
+            "amp": amp,
+            "idx": repeat("idx", np.uint32),
+            "sac": repeat("sac", np.uint8),
+            "sic": repeat("sic", np.uint8),
+        },
+        offsets,
+        tail,
+    )
+
+
+def decode_file_columns(file_name, *, size=-1, buffer_size=-1, mmap=False):
+    """Decode a CAT240 file into columns.
+
+    This is the columnar counterpart of :func:`decode_file` that decodes each chunk of
+    the file with :func:`decode_columns`.
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        size (int):
+            Maximum number of bytes to read from the file. If negative, the entire file
+            will be read.
+        buffer_size (int):
+            Process file in chunks of this size. If negative, the entire file will be
+            loaded to RAM at once (or, if `mmap` is set, decoded in windows of
+            16 MiB).
+        mmap (bool):
+            Map the file into memory instead of reading it. The chunks are views into
+            the mapping such that the page cache is the only buffer and video blocks
+            of uncompressed messages are read without copying them first.
+
+    Returns:
+        typing.Generator[tuple[dict, numpy.ndarray], None, None]:
+            Decoded columns and offsets of each chunk (see :func:`decode_columns` for
+            details). Chunks without type `002` messages are skipped.
     """
-    yield from _utils._map_file(
-        file_name, func=decode, size=size, buffer_size=buffer_size
+    map_file = _utils._map_mmap if mmap else _utils._map_file
+    yield from map_file(
+        file_name, func=_decode_columns, size=size, buffer_size=buffer_size
     )
+
+
+def _decode_shard(shard):
+    file_name, start, stop, last = shard
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+
+    columns, offsets, tail = decode_columns(data)
+    if len(tail) > 0 and not last:  # pragma: no cover
+        raise ValueError("Invalid Asterix CAT240 message.")
+
+    return columns, offsets
+
+
+def decode_file_parallel(file_name, *, processes=None, shard_size=2**26):
+    """Decode a CAT240 file into columns using multiple processes.
+
+    The file is cut into shards of roughly `shard_size` bytes that are decoded by
+    :func:`decode_columns` in a process pool. As a shard usually does not start at the
+    beginning of a message, its start is moved forward to the first byte that starts a
+    chain of valid CAT240 messages, i.e., a sequence of `0xF0` bytes where each one is
+    followed by the length of the message. The decoded shards are returned in file
+    order and carry whole columns rather than one `dict` per message such that the
+    results are cheap to pass between processes.
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        processes (int | None):
+            Number of processes. If `None`, the number of CPUs is used.
+        shard_size (int):
+            Approximate number of bytes decoded at once by a single process.
+
+    Returns:
+        typing.Generator[tuple[dict, numpy.ndarray], None, None]:
+            Decoded columns and offsets of each shard (see :func:`decode_columns` for
+            details). Shards without type `002` messages are skipped.
+    """
+    size = os.path.getsize(file_name)
+
+    boundaries = [0]
+    with open(file_name, "rb") as f:
+        for start in range(shard_size, size, shard_size):
+            f.seek(start)
+            i = _utils._resync(f.read(2**20))
+            if i is not None and start + i > boundaries[-1]:
+                boundaries.append(start + i)
+
+    boundaries.append(size)
+    shards = [
+        (file_name, start, stop, stop == size)
+        for start, stop in zip(boundaries[:-1], boundaries[1:])
+    ]
+
+    processes = processes or os.cpu_count()
+    with ProcessPoolExecutor(processes) as executor:
+        for columns, offsets in _utils._ordered_map(
+            _decode_shard, shards, executor=executor, max_in_flight=2 * processes
+        ):
+            if offsets.size > 1:
+                yield columns, offsets
+
+
+_INDEX = np.dtype(
+    [
+        ("offset", "<u8"),
+        ("length", "<u2"),
+        ("type", "u1"),
+        ("idx", "<u4"),
+        ("tod", "<f4"),
+        ("az", "<f4"),
+    ]
+)
+
+
+def _tod_window(tod, start_tod, end_tod):
+    start_tod = -np.inf if start_tod is None else start_tod
+    end_tod = np.inf if end_tod is None else end_tod
+    return (tod >= start_tod) & (tod < end_tod)
+
+
+def _index_file(file_name):
+    return pathlib.Path(f"{file_name}.idx.npy")
+
+
+def _scan(file_name, *, size, buffer_size, mmap):
+    n = 0
+
+    def scan_chunk(data):
+        nonlocal n
+
+        offsets = _utils._message_offsets(data)
+        hdr = _decode_headers(data, offsets)
+
+        video = hdr["type"] == 2
+        r_cell_size = np.where(video, hdr["cell_dur"] * 299_792_458 / 2, np.nan)
+        scan = {
+            "offset": n + np.asarray(offsets[:-1], dtype=np.int64),
+            "length": np.diff(offsets),
+            "type": hdr["type"],
+            "sac": hdr["sac"],
+            "sic": hdr["sic"],
+            "idx": hdr["idx"],
+            "az": hdr["az"],
+            "az_cell_size": hdr["az_cell_size"],
+            "r0": hdr["start_rg"] * r_cell_size,
+            "r_cell_size": r_cell_size,
+            "nb_cells": hdr["nb_cells"],
+            "compression": hdr["compression"],
+            "tod": hdr["tod"],
+        }
+
+        n += offsets[-1]
+        return [scan], data[offsets[-1] :]
+
+    map_file = _utils._map_mmap if mmap else _utils._map_file
+    chunks = list(
+        map_file(file_name, func=scan_chunk, size=size, buffer_size=buffer_size)
+    )
+    if len(chunks) == 0:
+        return scan_chunk(b"")[0][0]
+
+    return {k: np.concatenate([chunk[k] for chunk in chunks]) for k in chunks[0]}
+
+
+def scan_file(file_name, *, size=-1, buffer_size=2**24, mmap=False):
+    """Scan the headers of all messages of a CAT240 file.
+
+    Only the fixed-layout headers of the messages are decoded (in a vectorized way)
+    whereas the video blocks are skipped, i.e., nothing is decompressed. This is
+    useful for inventories, quality checks or time-range lookups of large recordings.
+    Fields that are not present in a message are set to `nan` (`tod`, `az`,
+    `az_cell_size`, `r0` and `r_cell_size`) or zero (all others) except for `offset`,
+    `length`, `type`, `sac` and `sic`.
+
+    Example:
+        >>> scan = pycatzao.scan_file("my-cat240-data.bin")
+        >>> scan["tod"][[0, -1]]
+        array([100.0, 3700.0])
+        >>> np.unique(scan["az_cell_size"][scan["type"] == 2])
+        array([0.08789062])
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        size (int):
+            Maximum number of bytes to read from the file. If negative, the entire file
+            will be read.
+        buffer_size (int):
+            Process file in chunks of this size. If negative, the entire file will be
+            loaded to RAM at once (or, if `mmap` is set, scanned in windows of
+            16 MiB).
+        mmap (bool):
+            Map the file into memory instead of reading it.
+
+    Returns:
+        dict:
+            One array per field with one entry per message: byte `offset` and `length`
+            of the message, `type`, `sac`, `sic`, `idx`, `az`, `az_cell_size`, range of
+            the first cell `r0` (in meters), `r_cell_size`, number of cells `nb_cells`,
+            `compression` flag and `tod` (see :func:`decode` for details).
+    """
+    return _scan(file_name, size=size, buffer_size=buffer_size, mmap=mmap)
+
+
+def _build_index(file_name, *, buffer_size):
+    scan = _scan(file_name, size=-1, buffer_size=buffer_size, mmap=False)
+
+    index = np.empty(scan["offset"].size, dtype=_INDEX)
+    for k in _INDEX.names:
+        index[k] = scan[k]
+
+    return index
+
+
+def _save_index(index_file, index):
+    # write to a temporary file in the same directory and move it into place such
+    # that readers never see a partially written index (we write to a file handle
+    # as `np.save` would append `.npy` to other file names)
+    index_file = pathlib.Path(index_file)
+    fd, tmp_file = tempfile.mkstemp(
+        dir=index_file.parent, prefix=f".{index_file.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, index)
+        os.replace(tmp_file, index_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+
+def _load_index(file_name, index_file=None):
+    # the index is built (and stored) only once, i.e., if it is missing or outdated
+    index_file = pathlib.Path(
+        _index_file(file_name) if index_file is None else index_file
+    )
+    if (
+        index_file.is_file()
+        and index_file.stat().st_mtime >= pathlib.Path(file_name).stat().st_mtime
+    ):
+        return np.load(index_file, mmap_mode="r")
+
+    index = _build_index(file_name, buffer_size=2**24)
+    # storing the index is only a cache, i.e., just use it if we cannot write it
+    with contextlib.suppress(OSError):
+        _save_index(index_file, index)
+    return index
+
+
+def build_index(file_name, *, index_file=None, buffer_size=2**24):
+    """Build an index of a CAT240 file.
+
+    Walks once through the file and stores the byte offset, length, type, message
+    sequence identifier (`idx`), ToD (`tod`) and azimuth (`az`) of every message as a
+    structured NumPy array in a sidecar file. This index enables random access into
+    (large) recordings via :func:`seek_message` and :func:`decode_file`. (If there is
+    no up-to-date index, these functions build and store it on their first call.)
+    Fields that are not present in a message are set to `nan` (`tod` and `az`) or zero
+    (`idx`).
+
+    Example:
+        >>> index = pycatzao.build_index("my-cat240-data.bin")
+        >>> index[:2]
+        array([(0, 19, 1, 0, 100.0, nan), (19, 135, 2, 4711, 100.0, 5.9)],
+              dtype=[('offset', '<u8'), ('length', '<u2'), ('type', 'u1'), ...])
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        index_file (str | pathlib.Path | None):
+            Name of the index file. If `None`, the index is stored next to the data
+            as `<file_name>.idx.npy`, which is where it is looked up by
+            :func:`seek_message` and :func:`decode_file` by default.
+        buffer_size (int):
+            Process file in chunks of this size.
+
+    Returns:
+        numpy.ndarray:
+            The index.
+    """
+    index = _build_index(file_name, buffer_size=buffer_size)
+    _save_index(_index_file(file_name) if index_file is None else index_file, index)
+    return index
+
+
+def seek_message(file_name, n, *, index_file=None):
+    """Decode a single message of a CAT240 file.
+
+    Uses the index of the file (see :func:`build_index`) to jump straight to the `n`-th
+    message and decodes it. If the index is missing or older than the file, it is
+    built and stored first.
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        n (int):
+            Position of the message in the file (starting at zero). Negative values
+            count from the end of the file.
+        index_file (str | pathlib.Path | None):
+            Name of the index file (see :func:`build_index`). If `None`, the index is
+            expected next to the data as `<file_name>.idx.npy`.
+
+    Returns:
+        dict:
+            Decoded message (see :func:`decode` for details).
+
+    Raises:
+        IndexError:
+            The file has not more than `n` messages.
+    """
+    index = _load_index(file_name, index_file)[n]
+    with open(file_name, "rb") as f:
+        f.seek(index["offset"].item())
+        return _decode_block(f.read(index["length"].item()))
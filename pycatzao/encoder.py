@@ -27,10 +27,16 @@ Example:
         print(b"".join(blocks).hex())  # outputs: f00012d108072a01...
 """  # noqa: E501
 
+import functools
+import struct
 import zlib
 
 import numpy as np
 
+from pycatzao import _utils
+
+_PADDING = memoryview(bytes(255))
+
 
 def make_summary(summary):
     """Create Video Summary.
@@ -92,8 +98,8 @@ def make_video_header(*, start_az, end_az, cell_offset, cell_width):
     end_az %= 360
 
     az_scale = 2**16 / 360
-    start_az = round(start_az * az_scale).to_bytes(2, byteorder="big")
-    end_az = round(end_az * az_scale).to_bytes(2, byteorder="big")
+    start_az = (round(start_az * az_scale) % 2**16).to_bytes(2, byteorder="big")
+    end_az = (round(end_az * az_scale) % 2**16).to_bytes(2, byteorder="big")
 
     item, t_scale = ("I240/040", 1e-9) if cell_width > 500 else ("I240/041", 1e-15)
     cell_dur = round(2 * cell_width / (299_792_458 * t_scale)).to_bytes(
@@ -107,7 +113,51 @@ def make_video_header(*, start_az, end_az, cell_offset, cell_width):
     }
 
 
-def make_video_message(amp, *, msg_index, header, compress=True):
+def _check_amp(amp):
+    if not isinstance(amp, np.ndarray):  # pragma: no cover
+        raise ValueError("Amplitude array has to be of type `np.ndarray`.")
+
+    if amp.dtype not in [np.uint8, np.uint16, np.uint32]:  # pragma: no cover
+        raise ValueError(
+            "Data type of amplitude array is not supported. Data type has to be either"
+            " 'np.uint8', 'np.uint16', or 'np.uint32'."
+        )
+
+
+def _video_item(nb_vb):
+    # block size and UAP bits of the item (I240/050, I240/051, or I240/052) that
+    # needs the least bytes for a video block of `nb_vb` bytes
+    items = {4: 0x02C0, 64: 0x02A0, 256: 0x0290}
+    n = min(items, key=lambda n: (1 + (nb_vb - 1) // n) * (n + 1))
+    return n, items[n]
+
+
+def _encode_tod(tod):
+    # I240/140 or `b""` if the ToD is not included
+    if tod <= 0:
+        return b""
+
+    tod = round(tod * 128)
+    if tod > 0xFFFFFF:  # pragma: no cover
+        raise ValueError(
+            "Time of Day (given in seconds) is too large. See specification of"
+            " I240/140 for details."
+        )
+
+    return tod.to_bytes(3, byteorder="big")
+
+
+def make_video_message(
+    amp,
+    *,
+    msg_index,
+    header,
+    compress=True,
+    level=-1,
+    strategy=zlib.Z_DEFAULT_STRATEGY,
+    wbits=15,
+    mem_level=8,
+):
     """Create Video Message.
 
     Creates a video message (I240/050, I240/051 or I240/052) for :func:`encode` from a
@@ -129,17 +179,28 @@ def make_video_message(amp, *, msg_index, header, compress=True):
             typically cheap yet very effective and should be enabled unless you know
             better.
 
+        level (int):
+            Compression level from `0` (none) over `1` (fastest) to `9` (smallest
+            output) or `-1` for zlib's default (currently `6`).
+
+        strategy (int):
+            Compression strategy, e.g., `zlib.Z_DEFAULT_STRATEGY` or `zlib.Z_RLE`. The
+            latter is typically a good choice for sparse radar video.
+
+        wbits (int):
+            Base-two logarithm of the window size in the range `[9, 15]`.
+
+        mem_level (int):
+            Memory usage of the compression from `1` to `9` (`memLevel` in zlib).
+
     Returns:
         typing.Any:
             Payload for :func:`encode`.
     """
-    if not isinstance(amp, np.ndarray):  # pragma: no cover
-        raise ValueError("Amplitude array has to be of type `np.ndarray`.")
-
-    if amp.dtype not in [np.uint8, np.uint16, np.uint32]:  # pragma: no cover
-        raise ValueError(
-            "Data type of amplitude array is not supported. Data type has to be either"
-            " 'np.uint8', 'np.uint16', or 'np.uint32'."
+    _check_amp(amp)
+    if compress:
+        _utils._check_deflate_options(
+            level=level, strategy=strategy, wbits=wbits, mem_level=mem_level
         )
 
     nb_cells = len(amp)
@@ -148,15 +209,12 @@ def make_video_message(amp, *, msg_index, header, compress=True):
     res = ((len(amp) * 8) // nb_cells).bit_length().to_bytes(1, byteorder="big")
 
     if compress:
-        amp = zlib.compress(amp)
+        amp = _utils._deflate(
+            amp, level=level, strategy=strategy, wbits=wbits, mem_level=mem_level
+        )
 
     nb_vb = len(amp)
-
-    items = {4: "I240/050", 64: "I240/051", 256: "I240/052"}
-    keys = list(items.keys())
-    i = np.argmin([(1 + (nb_vb - 1) // n) * (n + 1) for n in keys])
-    n = keys[i]
-    item = items[n]
+    n, uap = _video_item(nb_vb)
 
     amp += b"\x00" * ((1 + (nb_vb - 1) // n) * n - nb_vb)
     assert len(amp) % n == 0
@@ -165,7 +223,6 @@ def make_video_message(amp, *, msg_index, header, compress=True):
     nb_vb = nb_vb.to_bytes(2, byteorder="big")
     nb_cells = nb_cells.to_bytes(3, byteorder="big")
 
-    uap = {"I240/050": 0x02C0, "I240/051": 0x02A0, "I240/052": 0x0290}[item]
     uap = uap | header["uap"]
 
     data = msg_index.to_bytes(4, byteorder="big")
@@ -202,17 +259,7 @@ def encode(payload, *, sac, sic, tod=-1):
     sic = sic.to_bytes(1, byteorder="big")
     msg_type = b"\x01" if payload["uap"] & 0x1000 else b"\x02"
 
-    if tod <= 0:
-        tod = b""
-    else:
-        tod = round(tod * 128)
-        if tod > 0xFFFFFF:  # pragma: no cover
-            raise ValueError(
-                "Time of Day (given in seconds) is too large. See specification of"
-                " I240/140 for details."
-            )
-
-        tod = tod.to_bytes(3, byteorder="big")
+    tod = _encode_tod(tod)
 
     uap = 0xC100 if tod == b"" else 0xC108
     uap |= payload["uap"]
@@ -221,3 +268,377 @@ def encode(payload, *, sac, sic, tod=-1):
     data = uap + sac + sic + msg_type + payload["data"] + tod
 
     return b"\xf0" + (len(data) + 3).to_bytes(2, byteorder="big") + data
+
+
+def _message_view(buf, offset, length):
+    # writable byte view of the `length` bytes of `buf` starting at `offset`; all
+    # checks are done before anything is written to `buf`
+    if length > 0xFFFF:
+        raise ValueError(
+            f"Message too long: {length} bytes exceed the maximum length of an"
+            " Asterix CAT240 message (65535 bytes)."
+        )
+
+    buf = memoryview(buf).cast("B")
+    if buf.readonly:
+        raise ValueError("Buffer is read-only.")
+
+    if offset < 0 or offset + length > len(buf):
+        raise ValueError(
+            f"Buffer too small: {length} bytes are needed at offset {offset} but the"
+            f" buffer has only {len(buf)} bytes."
+        )
+
+    return buf[offset : offset + length]
+
+
+def encode_into(buf, offset, payload, *, sac, sic, tod=-1):
+    """Compiles data into a CAT240 message in a given buffer.
+
+    Same as :func:`encode` but writes the message into `buf` at position `offset`
+    instead of allocating new memory. This allows, e.g., for reusing the same buffer
+    for all datagrams that are sent.
+
+    Args:
+        buf (bytearray | memoryview):
+            Writable buffer for the message.
+        offset (int):
+            Position of the message in `buf`.
+        payload: The payload to encode (see :func:`encode`).
+        sac (int):
+            System Area Code (SAC)
+        sic (int):
+            System Identification Code (SIC)
+        tod (float):
+            Time of Day (ToD) in seconds. If negative, no ToD is included into the
+            compiled message.
+
+    Returns:
+        int:
+            Position in `buf` right after the message (i.e., `offset` plus the length of
+            the message).
+
+    Raises:
+        ValueError:
+            If the message does not fit into `buf` or exceeds the maximum length of a
+            CAT240 message.
+    """
+    tod = _encode_tod(tod)
+    data = payload["data"]
+    length = 8 + len(data) + len(tod)
+
+    msg = _message_view(buf, offset, length)
+    struct.pack_into(
+        ">BHHBBB",
+        msg,
+        0,
+        0xF0,
+        length,
+        (0xC100 if tod == b"" else 0xC108) | payload["uap"],
+        sac,
+        sic,
+        1 if payload["uap"] & 0x1000 else 2,
+    )
+    msg[8 : 8 + len(data)] = data
+    msg[length - len(tod) :] = tod
+
+    return offset + length
+
+
+def encode_video_into(
+    buf,
+    offset,
+    amp,
+    *,
+    msg_index,
+    header,
+    sac,
+    sic,
+    tod=-1,
+    compress=True,
+    level=-1,
+    strategy=zlib.Z_DEFAULT_STRATEGY,
+    wbits=15,
+    mem_level=8,
+):
+    """Compiles a video message in a given buffer.
+
+    Combines :func:`make_video_message` and :func:`encode_into`, i.e., writes the
+    header, the video block and its padding straight into `buf` without building an
+    intermediate payload. If `compress` is not set, the amplitudes are copied from the
+    array into the buffer without any intermediate copies.
+
+    Args:
+        buf (bytearray | memoryview):
+            Writable buffer for the message.
+        offset (int):
+            Position of the message in `buf`.
+        amp (np.ndarray):
+            Amplitude array (see :func:`make_video_message`).
+        msg_index (int):
+            Message Sequence Identifier (video record cyclic counter).
+        header:
+            Header generated by :func:`make_video_header`.
+        sac (int):
+            System Area Code (SAC)
+        sic (int):
+            System Identification Code (SIC)
+        tod (float):
+            Time of Day (ToD) in seconds. If negative, no ToD is included into the
+            compiled message.
+        compress (bool):
+            See :func:`make_video_message`.
+        level (int):
+            See :func:`make_video_message`.
+        strategy (int):
+            See :func:`make_video_message`.
+        wbits (int):
+            See :func:`make_video_message`.
+        mem_level (int):
+            See :func:`make_video_message`.
+
+    Returns:
+        int:
+            Position in `buf` right after the message (i.e., `offset` plus the length of
+            the message).
+
+    Raises:
+        ValueError:
+            If the message does not fit into `buf` or exceeds the maximum length of a
+            CAT240 message.
+    """
+    _check_amp(amp)
+    if amp.size > 0xFFFFFF:
+        raise ValueError(
+            "Too many cells. Not more than 2**24 - 1 cells are allowed. See"
+            " specification of I240/049 for details."
+        )
+
+    if compress:
+        _utils._check_deflate_options(
+            level=level, strategy=strategy, wbits=wbits, mem_level=mem_level
+        )
+        video = _utils._deflate(
+            np.ascontiguousarray(amp),
+            level=level,
+            strategy=strategy,
+            wbits=wbits,
+            mem_level=mem_level,
+        )
+    else:
+        video = memoryview(np.ascontiguousarray(amp)).cast("B")
+
+    nb_cells = amp.size
+    nb_vb = len(video)
+    n, uap = _video_item(nb_vb)
+    m = -(-nb_vb // n) * n
+
+    tod = _encode_tod(tod)
+    length = 32 + m + len(tod)
+
+    msg = _message_view(buf, offset, length)
+    struct.pack_into(
+        ">BHHBBBI12sBBHBHB",
+        msg,
+        0,
+        0xF0,
+        length,
+        (0xC100 if tod == b"" else 0xC108) | uap | header["uap"],
+        sac,
+        sic,
+        2,
+        msg_index,
+        header["data"],
+        0x80 if compress else 0x00,
+        (amp.itemsize * 8).bit_length(),
+        nb_vb,
+        nb_cells >> 16,
+        nb_cells & 0xFFFF,
+        m // n,
+    )
+    msg[32 : 32 + nb_vb] = video
+    msg[32 + nb_vb : 32 + m] = _PADDING[: m - nb_vb]
+    msg[32 + m :] = tod
+
+    return offset + length
+
+
+def _to_bytes(values, n):
+    # big-endian representation of non-negative integers as an array of shape (..., n)
+    shifts = 8 * np.arange(n - 1, -1, -1)
+    return (np.asarray(values, dtype=np.int64)[..., None] >> shifts) & 0xFF
+
+
+def encode_sweep(
+    amp,
+    *,
+    start_az,
+    end_az,
+    cell_offset,
+    cell_width,
+    sac,
+    sic,
+    tod=-1,
+    msg_index0=0,
+    compress=True,
+    workers=0,
+    level=-1,
+    strategy=zlib.Z_DEFAULT_STRATEGY,
+    wbits=15,
+    mem_level=8,
+):
+    """Compiles a sweep into CAT240 messages.
+
+    Encodes each row (i.e., azimuth) of a 2D amplitude array as a type `002` message.
+    The output is identical to encoding the rows one by one with
+    :func:`make_video_header`, :func:`make_video_message`, and :func:`encode`, but the
+    headers of all messages are compiled at once and the messages are written to a
+    single buffer.
+
+    Args:
+        amp (np.ndarray):
+            Amplitude array of shape `(n_az, n_cells)` with `dtype` set to either
+            `np.uint8`, `np.uint16`, or `np.uint32`.
+        start_az (float | np.ndarray):
+            Start azimuth in degrees, either for all rows or for each row.
+        end_az (float | np.ndarray):
+            End azimuth in degrees, either for all rows or for each row.
+        cell_offset (float):
+            Offset of first cell in meters (see :func:`make_video_header`).
+        cell_width (float):
+            Cell width in meters (see :func:`make_video_header`).
+        sac (int):
+            System Area Code (SAC)
+        sic (int):
+            System Identification Code (SIC)
+        tod (float | np.ndarray):
+            Time of Day (ToD) in seconds, either for all rows or for each row. Messages
+            with a negative ToD do not include a ToD (see :func:`encode`).
+        msg_index0 (int):
+            Message Sequence Identifier of the first row. It is incremented by one for
+            each following row (and wraps around).
+        compress (bool):
+            Compress the amplitudes (see :func:`make_video_message`).
+        workers (int):
+            Number of threads for compressing rows in parallel. If not larger than
+            one, all rows are compressed in the calling thread.
+        level (int):
+            See :func:`make_video_message`.
+        strategy (int):
+            See :func:`make_video_message`.
+        wbits (int):
+            See :func:`make_video_message`.
+        mem_level (int):
+            See :func:`make_video_message`.
+
+    Returns:
+        bytearray:
+            Concatenated Asterix CAT240 messages, e.g., to be written to a file.
+
+    Raises:
+        ValueError:
+            If the amplitude array is not supported, a row does not fit into a single
+            message, or the ToD is too large.
+    """
+    if not isinstance(amp, np.ndarray) or amp.ndim != 2:  # pragma: no cover
+        raise ValueError("Amplitude array has to be a 2D `np.ndarray`.")
+
+    if amp.dtype not in [np.uint8, np.uint16, np.uint32]:  # pragma: no cover
+        raise ValueError(
+            "Data type of amplitude array is not supported. Data type has to be either"
+            " 'np.uint8', 'np.uint16', or 'np.uint32'."
+        )
+
+    n_az, nb_cells = amp.shape
+    if nb_cells > 0xFFFFFF:
+        raise ValueError(
+            "Too many cells. Not more than 2**24 - 1 cells are allowed. See"
+            " specification of I240/049 for details."
+        )
+
+    amp = np.ascontiguousarray(amp)
+    res = (amp.itemsize * 8).bit_length()
+
+    if compress:
+        _utils._check_deflate_options(
+            level=level, strategy=strategy, wbits=wbits, mem_level=mem_level
+        )
+        deflate = functools.partial(
+            _utils._deflate,
+            level=level,
+            strategy=strategy,
+            wbits=wbits,
+            mem_level=mem_level,
+        )
+        with _utils._thread_pool(workers) as executor:
+            videos = list((map if executor is None else executor.map)(deflate, amp))
+
+        nb_vb = np.fromiter(map(len, videos), dtype=np.int64, count=n_az)
+    else:
+        nb_vb = np.full(n_az, amp[0].nbytes if n_az else 0, dtype=np.int64)
+
+    # block size of I240/050, I240/051, or I240/052 (as chosen by `make_video_message`)
+    keys = np.array([4, 64, 256])
+    n = keys[np.argmin((1 + (nb_vb[:, None] - 1) // keys) * (keys + 1), axis=1)]
+    rep = -(-nb_vb // n)
+
+    tod = np.broadcast_to(np.asarray(tod, dtype=np.float64), (n_az,))
+    has_tod = tod > 0
+    tod = np.where(has_tod, np.rint(tod * 128), 0).astype(np.int64)
+    if np.any(tod > 0xFFFFFF):  # pragma: no cover
+        raise ValueError(
+            "Time of Day (given in seconds) is too large. See specification of"
+            " I240/140 for details."
+        )
+
+    length = 32 + rep * n + 3 * has_tod
+    if np.any(length > 0xFFFF):
+        raise ValueError("Rows do not fit into a single Asterix CAT240 message.")
+
+    offsets = np.zeros(n_az + 1, dtype=np.int64)
+    np.cumsum(length, out=offsets[1:])
+
+    # range geometry is shared by all rows
+    header = make_video_header(
+        start_az=0, end_az=0, cell_offset=cell_offset, cell_width=cell_width
+    )
+
+    az_scale = 2**16 / 360
+    start_az = np.broadcast_to(np.asarray(start_az, dtype=np.float64) % 360, (n_az,))
+    end_az = np.broadcast_to(np.asarray(end_az, dtype=np.float64) % 360, (n_az,))
+
+    uap = 0xC100 | 0x0008 * has_tod | header["uap"]
+    uap |= np.where(n == 4, 0x02C0, np.where(n == 64, 0x02A0, 0x0290))
+
+    hdr = np.empty((n_az, 32), dtype=np.uint8)
+    hdr[:, 0] = 0xF0
+    hdr[:, 1:3] = _to_bytes(length, 2)
+    hdr[:, 3:5] = _to_bytes(uap, 2)
+    hdr[:, 5] = sac
+    hdr[:, 6] = sic
+    hdr[:, 7] = 2
+    hdr[:, 8:12] = _to_bytes((msg_index0 + np.arange(n_az)) % 2**32, 4)
+    hdr[:, 12:14] = _to_bytes(np.rint(start_az * az_scale) % 2**16, 2)
+    hdr[:, 14:16] = _to_bytes(np.rint(end_az * az_scale) % 2**16, 2)
+    hdr[:, 16:24] = np.frombuffer(header["data"][4:], dtype=np.uint8)
+    hdr[:, 24] = 0x80 if compress else 0x00
+    hdr[:, 25] = res
+    hdr[:, 26:28] = _to_bytes(nb_vb, 2)
+    hdr[:, 28:31] = _to_bytes(nb_cells, 3)
+    hdr[:, 31] = rep
+
+    # padding is implicit as the buffer is zero-initialized
+    buf = bytearray(offsets[-1].item())
+    out = np.frombuffer(buf, dtype=np.uint8)
+    out[offsets[:-1, None] + np.arange(32)] = hdr
+
+    if not compress:
+        videos = amp.view(np.uint8).reshape(n_az, nb_cells * amp.itemsize)
+
+    for i, video, m in zip(offsets[:-1].tolist(), videos, nb_vb.tolist(), strict=True):
+        out[i + 32 : i + 32 + m] = np.frombuffer(video, dtype=np.uint8)
+
+    out[offsets[1:][has_tod, None] - 3 + np.arange(3)] = _to_bytes(tod[has_tod], 3)
+
+    del out  # release the export of `buf`
+    return buf
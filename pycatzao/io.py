@@ -0,0 +1,400 @@
+"""Writers for storing decoded Asterix CAT240 data in common file formats.
+
+The writers in this module consume decoded blocks (e.g., as yielded by
+:func:`pycatzao.decode_file`) as they arrive and write them in chunks. Hence, memory
+usage is bounded by the chunk size rather than by the length of the recording.
+
+All writers rely on optional dependencies that are not installed by default. Install
+them via the corresponding extra, i.e., ``pip install pycatzao[hdf5]`` for
+:class:`HDF5Writer` and ``pip install pycatzao[arrow]`` for :func:`to_arrow_batches`
+and :func:`to_parquet`.
+"""
+
+import numpy as np
+
+from pycatzao import decoder, utils
+
+
+class HDF5Writer:
+    r"""Streaming writer for HDF5 files.
+
+    The decoded blocks are joined (see :func:`pycatzao.join_blocks`), binned according
+    to the given binning scheme (see :func:`pycatzao.infer_bin_edges`) and appended to
+    resizable, chunked and compressed datasets. The layout of the HDF5 file is:
+
+    ============  =======================================================
+    Dataset       Description
+    ============  =======================================================
+    `tod`         Time of Day (UTC) in seconds
+    `az`          Index of azimuth bins
+    `r`           Index of range bins
+    `amp`         Amplitude
+    `cycle`       Number of full rotations of the radar antenna
+    `az_edges`    Bin edges of clockwise azimuth in degrees
+    `r_edges`     Bin edges of range in meters (written by :meth:`close`)
+    ============  =======================================================
+
+    A new cycle starts whenever the azimuth decreases from one row to the next.
+
+    Example:
+        >>> with open("my-data.cat240", "rb") as f:
+        ...     bins, _ = pycatzao.infer_bin_edges(f.read(100_000_000))
+        >>> with pycatzao.io.HDF5Writer("my-data.h5", bins) as writer:
+        ...     for blocks in itertools.batched(pycatzao.decode_file(...), 100_000):
+        ...         writer.write(blocks)
+
+    Args:
+        hdf5_file (str | pathlib.Path):
+            Filename of the HDF5 file. Existing files are overwritten.
+        bins (dict):
+            Binning scheme as returned by :func:`pycatzao.infer_bin_edges`.
+        chunk_size (int):
+            Number of rows that are buffered before they are written to disk. This is
+            also the chunk size of the HDF5 datasets.
+        compression (str | None):
+            Compression filter of the HDF5 datasets.
+
+    Raises:
+        ImportError:
+            The optional dependency `h5py` is not installed.
+    """
+
+    def __init__(self, hdf5_file, bins, *, chunk_size=2**20, compression="gzip"):  # noqa: D107
+        # optional dependencies are imported on first use to keep `import pycatzao`
+        # lightweight
+        try:
+            import h5py
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "HDF5Writer requires h5py, install it via 'pip install pycatzao[hdf5]'."
+            ) from e
+
+        self.chunk_size = chunk_size
+        self.compression = compression
+
+        self._r_bins = bins["r"]
+        self._az_edges = np.linspace(**bins["az"])
+        self._r_edges = np.arange(**self._r_bins, stop=self._r_bins["start"])
+        self._r_max = -np.inf
+
+        self._last_az = np.nan
+        self._cycle = 0
+
+        self._acc = utils.ColumnAccumulator(chunk_size=chunk_size)
+        self._rows = 0
+
+        self._file = h5py.File(hdf5_file, "w")
+        self._file.create_dataset("az_edges", data=self._az_edges)
+        self._file["az_edges"].attrs["desc"] = "Bin edges of clockwise azimuth"
+        self._file["az_edges"].attrs["unit"] = "degree"
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, *args):  # noqa: D105
+        self.close()
+
+    def __len__(self):
+        """Number of written rows (including buffered rows)."""
+        return self._rows + len(self._acc)
+
+    @property
+    def cycles(self):
+        """Number of (started) cycles."""
+        return self._cycle + (len(self) > 0)
+
+    def _create_datasets(self, dtypes):
+        for k, dtype in dtypes.items():
+            self._file.create_dataset(
+                k,
+                shape=(0,),
+                maxshape=(None,),
+                dtype=dtype,
+                chunks=(self.chunk_size,),
+                compression=self.compression,
+            )
+
+        self._file["tod"].attrs["desc"] = "Time of Day (UTC)"
+        self._file["tod"].attrs["unit"] = "second"
+
+        self._file["az"].attrs["desc"] = "Index of azimuth bins"
+        self._file["r"].attrs["desc"] = "Index of range bins"
+        self._file["amp"].attrs["desc"] = "Amplitude"
+        self._file["cycle"].attrs["desc"] = (
+            "Number of full rotations of the radar antenna"
+        )
+
+    def _flush(self):
+        if len(self._acc) == 0:
+            return
+
+        table = self._acc.finalize()
+        self._acc.close()
+
+        if self._rows == 0:
+            self._create_datasets({k: v.dtype for k, v in table.items()})
+
+        n = self._rows + len(table["tod"])
+        for k, v in table.items():
+            self._file[k].resize((n,))
+            self._file[k][self._rows :] = v
+
+        self._rows = n
+
+    def write_columns(self, columns):
+        """Append columns.
+
+        Args:
+            columns (dict):
+                Columns as returned by :func:`pycatzao.join_blocks`.
+        """
+        az, r = columns["az"], columns["r"]
+        if az.size == 0:
+            return
+
+        cycle = np.empty(az.size, dtype=np.uint32)
+        cycle[0] = self._cycle + (az[0] < self._last_az)
+        cycle[1:] = cycle[0] + np.cumsum(np.diff(az) < 0)
+        self._cycle = cycle[-1].item()
+        self._last_az = az[-1]
+
+        r_max = r.max()
+        if r_max > self._r_max:
+            self._r_max = r_max
+            self._r_edges = np.arange(**self._r_bins, stop=r_max + self._r_bins["step"])
+
+        self._acc.append(
+            {
+                "tod": columns["tod"],
+                "az": np.searchsorted(self._az_edges, az).astype(np.uint16) - 1,
+                "r": np.searchsorted(self._r_edges, r).astype(np.uint16) - 1,
+                "amp": columns["amp"],
+                "cycle": cycle,
+            }
+        )
+
+        if len(self._acc) >= self.chunk_size:
+            self._flush()
+
+    def write(self, blocks):
+        """Append decoded blocks.
+
+        Args:
+            blocks (Iterable[dict]):
+                Decoded blocks as returned by, e.g, :func:`pycatzao.decode_file`.
+        """
+        self.write_columns(utils.join_blocks(blocks))
+
+    def close(self):
+        """Write buffered rows and the range bin edges and close the file."""
+        if not self._file:
+            return
+
+        self._flush()
+        if self._rows == 0:
+            self._create_datasets(
+                {
+                    "tod": np.float32,
+                    "az": np.uint16,
+                    "r": np.uint16,
+                    "amp": np.uint8,
+                    "cycle": np.uint32,
+                }
+            )
+
+        self._file.create_dataset("r_edges", data=self._r_edges)
+        self._file["r_edges"].attrs["desc"] = "Bin edges of range"
+        self._file["r_edges"].attrs["unit"] = "meter"
+
+        self._file.close()
+
+
+def _require_pyarrow():
+    # imported on first use (see `HDF5Writer`)
+    try:
+        import pyarrow
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "Arrow export requires pyarrow, install it via "
+            "'pip install pycatzao[arrow]'."
+        ) from e
+
+    return pyarrow
+
+
+def _arrow_schema(amp_dtype):
+    pa = _require_pyarrow()
+    return pa.schema(
+        [
+            ("tod", pa.float32()),
+            ("az", pa.float32()),
+            ("r", pa.float32()),
+            ("amp", pa.from_numpy_dtype(amp_dtype)),
+            ("idx", pa.uint32()),
+            ("sac", pa.uint8()),
+            ("sic", pa.uint8()),
+        ]
+    )
+
+
+def _rebatch(chunks, batch_rows):
+    pending = []
+    n_pending = 0
+    for columns in chunks:
+        n = len(columns["tod"])
+        i = 0
+
+        if n_pending > 0:
+            i = min(n, batch_rows - n_pending)
+            pending.append({k: v[:i] for k, v in columns.items()})
+            n_pending += i
+            if n_pending < batch_rows:
+                continue
+
+            yield {k: np.concatenate([p[k] for p in pending]) for k in columns}
+            pending = []
+            n_pending = 0
+
+        # full batches are views into the decoded columns
+        while n - i >= batch_rows:
+            yield {k: v[i : i + batch_rows] for k, v in columns.items()}
+            i += batch_rows
+
+        if i < n:
+            pending = [{k: v[i:] for k, v in columns.items()}]
+            n_pending = n - i
+
+    if n_pending > 0:
+        yield {k: np.concatenate([p[k] for p in pending]) for k in pending[0]}
+
+
+def to_arrow_batches(
+    file_name, *, batch_rows=2**20, amp_dtype=None, buffer_size=2**24, mmap=False
+):
+    """Decode a CAT240 file into Arrow record batches.
+
+    The file is decoded by :func:`pycatzao.decode_file_columns` and the columns are
+    regrouped into record batches of `batch_rows` rows. The Arrow arrays share memory
+    with the decoded columns, i.e., only rows of batches that straddle two decoded
+    chunks of the file are copied.
+
+    Example:
+        >>> for batch in pycatzao.io.to_arrow_batches("my-data.cat240"):
+        ...     process(batch.to_pandas())  # do something meaningful with the data
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the file.
+        batch_rows (int):
+            Number of rows per record batch (except for the last one).
+        amp_dtype (numpy.dtype | None):
+            Data type of the amplitude column. If `None`, the data type of the first
+            decoded chunk is used.
+        buffer_size (int):
+            Decode file in chunks of this size (see :func:`pycatzao.decode_file`).
+        mmap (bool):
+            Map the file into memory instead of reading it.
+
+    Returns:
+        typing.Generator[pyarrow.RecordBatch, None, None]:
+            Record batches with the columns `tod`, `az`, `r`, `amp`, `idx`, `sac` and
+            `sic` (see :func:`pycatzao.decode_columns` for details).
+
+    Raises:
+        ImportError:
+            The optional dependency `pyarrow` is not installed.
+        ValueError:
+            The amplitudes of a chunk do not fit into `amp_dtype`.
+    """
+    pa = _require_pyarrow()
+
+    def chunks():
+        nonlocal amp_dtype
+
+        for columns, _ in decoder.decode_file_columns(
+            file_name, buffer_size=buffer_size, mmap=mmap
+        ):
+            if amp_dtype is None:
+                amp_dtype = columns["amp"].dtype
+            elif not np.can_cast(columns["amp"].dtype, amp_dtype):
+                raise ValueError(
+                    f"Amplitudes of type {columns['amp'].dtype} do not fit into "
+                    f"{np.dtype(amp_dtype)}, use a wider amp_dtype."
+                )
+
+            columns["amp"] = columns["amp"].astype(amp_dtype, copy=False)
+            yield columns
+
+    schema = None
+    for columns in _rebatch(chunks(), batch_rows):
+        schema = schema or _arrow_schema(amp_dtype)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(columns[name]) for name in schema.names], schema=schema
+        )
+
+
+def to_parquet(
+    file_name,
+    parquet_file,
+    *,
+    batch_rows=2**20,
+    amp_dtype=None,
+    compression="zstd",
+    buffer_size=2**24,
+    mmap=False,
+):
+    """Convert a CAT240 file into a Parquet file.
+
+    The record batches of :func:`to_arrow_batches` are streamed into the Parquet file
+    with one row group per batch. Hence, memory usage is bounded by `batch_rows` and
+    `buffer_size` rather than by the length of the recording.
+
+    Args:
+        file_name (str | pathlib.Path):
+            Name of the CAT240 file.
+        parquet_file (str | pathlib.Path):
+            Name of the Parquet file. Existing files are overwritten.
+        batch_rows (int):
+            Number of rows per row group (except for the last one).
+        amp_dtype (numpy.dtype | None):
+            Data type of the amplitude column. If `None`, the data type of the first
+            decoded chunk is used (or `uint8` if the file carries no video data).
+        compression (str | None):
+            Compression codec of the Parquet file.
+        buffer_size (int):
+            Decode file in chunks of this size (see :func:`pycatzao.decode_file`).
+        mmap (bool):
+            Map the file into memory instead of reading it.
+
+    Returns:
+        int:
+            Number of written rows.
+
+    Raises:
+        ImportError:
+            The optional dependency `pyarrow` is not installed.
+        ValueError:
+            The amplitudes of a chunk do not fit into `amp_dtype`.
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    batches = to_arrow_batches(
+        file_name,
+        batch_rows=batch_rows,
+        amp_dtype=amp_dtype,
+        buffer_size=buffer_size,
+        mmap=mmap,
+    )
+
+    batch = next(batches, None)
+    schema = _arrow_schema(amp_dtype or np.uint8) if batch is None else batch.schema
+
+    n = 0
+    with pq.ParquetWriter(parquet_file, schema, compression=compression) as writer:
+        while batch is not None:
+            writer.write_batch(batch, row_group_size=batch_rows)
+            n += batch.num_rows
+            batch = next(batches, None)
+
+    return n
@@ -4,40 +4,86 @@ If you need the decoded data more structured as a table, use :func:`join_blocks`
 this! This function will join (type `002`) messages by repeating scalar values and
 return a single `dict` that can be fed directly to, e.g., a :class:`pandas.DataFrame`.
 
+For collecting such columns over a long recording (e.g., batch by batch from
+:func:`pycatzao.decode_file`), use a :class:`ColumnAccumulator` rather than repeatedly
+calling :func:`numpy.append`; the latter is quadratic in the length of the recording.
+
 Typically, the azimuth and range values follow an implicit binning scheme. Sometimes,
 this scheme can be inferred by parsing a handful of messages. We implement a simple
 heuristic that tries to infer this scheme in :func:`infer_bin_edges`. Note that the
 azimuth bins are circular and that due to this periodicity, the bin content of the first
-and last bin might have to be superimposed depending on the context.
+and last bin might have to be superimposed depending on the context. If whole antenna
+rotations are needed as dense images, a :class:`SweepAssembler` bins the decoded
+messages according to such a scheme and :func:`rasterize_ppi` turns the resulting
+images into Cartesian plan position indicator (PPI) images.
 """
 
+import functools
+import pathlib
+import shutil
+import tempfile
+import weakref
+
 import numpy as np
 from tqdm import tqdm
 
-from pycatzao import _utils
+from pycatzao import _utils, decoder
 
 
-def _cell_size(data):
-    uap1 = data[3]
-    m040 = uap1 & 0x08 == 0x08
-    mFX = uap1 & 0x01 == 0x01
+def _median(values, counts):
+    # median of `values` repeated `counts` times (cf. numpy.median)
+    cum = np.cumsum(counts)
+    n = cum[-1]
+    lo, hi = values[np.searchsorted(cum, [(n - 1) // 2, n // 2], side="right")]
+    return (lo + hi) / 2
 
-    i = 7 if mFX else 6
-    if data[i] == 1:  # message type 1
+
+def _bin_edges(az_counts, r0, dr_counts):
+    (az,) = np.nonzero(az_counts)
+    if az.size < 2:
         return None
 
-    az_scale = 360 / 2**16
-    t_scale = 1e-9 if m040 else 1e-15
+    c = az_counts[az]
+    az = az * (360 / 2**17)
 
-    start_az = int.from_bytes(data[i + 5 : i + 7], byteorder="big") * az_scale
-    end_az = int.from_bytes(data[i + 7 : i + 9], byteorder="big") * az_scale
-    start_rg = int.from_bytes(data[i + 9 : i + 13], byteorder="big")
-    cell_dur = int.from_bytes(data[i + 13 : i + 17], byteorder="big") * t_scale
+    az0 = az[np.argmax(c)]
+    daz = np.diff(az)
 
-    c = 299_792_458
-    cell_width = cell_dur * c / 2  # in meters
+    daz_min = 0.01  # magic value... in the end this is just a heuristic:)
+    daz, c = np.unique(daz[np.abs(daz) > daz_min], return_counts=True)
+    if daz.size < 1:
+        return None
 
-    return _utils._circular_mean(start_az, end_az), start_rg * cell_width, cell_width
+    frac = daz / daz[np.argmax(c)]
+    sel = (frac > 0.9) & (frac < 1.1)
+    daz = np.average(daz[sel], weights=c[sel])
+
+    az_num = round(360.0 / daz)
+    daz = 360.0 / az_num
+
+    az_start = (az0 + np.sign(180 - az0) * daz / 2) % daz - daz
+    az_end = az_start + np.ceil((360 - az_start) / daz) * daz
+
+    if az_end - daz > 360:
+        az_end -= daz
+
+    assert az_start <= 0, az_start
+    assert az_end >= 360, az_end
+
+    dr = np.array(sorted(dr_counts))
+    dr = _median(dr, [dr_counts[v] for v in dr]).item()
+
+    return {
+        "az": {
+            "start": az_start.item(),
+            "num": round((az_end - az_start) / daz) + 1,
+            "stop": az_end.item(),
+        },
+        "r": {
+            "start": r0 - dr / 2,
+            "step": dr,
+        },
+    }
 
 
 def infer_bin_edges(data):
@@ -72,60 +118,99 @@ def infer_bin_edges(data):
             return value carries the state of the decoder and should be prepended to the
             input data for the subsequent call to :func:`infer_bin_edges`. Note that the
             inferred binning scheme of previous calls are not taken into account for the
-            current inference.
+            current inference; use a :class:`BinEdgeEstimator` for accumulating
+            statistics across calls.
     """
-    cell_sizes, tail = _utils._map_blocks(data, func=_cell_size)
-    cell_sizes = list(zip(*filter(lambda s: s is not None, cell_sizes)))
-    if len(cell_sizes) == 0:
+    estimator = BinEdgeEstimator()
+    bins = estimator.update(data)
+    if bins is None:
         return None, data
 
-    az, r0, dr = cell_sizes
+    return bins, estimator._tail
 
-    az, c = np.unique(az, return_counts=True)
-    if az.size < 2:
-        return None, data
 
-    az0 = az[np.argmax(c)]
-    daz = np.diff(az)
+class BinEdgeEstimator:
+    r"""Infers binning scheme from CAT240 data incrementally.
 
-    daz_min = 0.01  # magic value... in the end this is just a heuristic:)
-    daz, c = np.unique(daz[np.abs(daz) > daz_min], return_counts=True)
-    if daz.size < 1:
-        return None, data
+    This is the stateful counterpart of :func:`infer_bin_edges`: Instead of inferring
+    the binning scheme from a single binary blob, the statistics of all calls to
+    :meth:`update` are accumulated, i.e., a histogram of the (quantized) azimuths and
+    of the cell widths as well as the smallest start of range. Only the fixed-layout
+    headers of the messages are parsed and no video block is decompressed. The
+    estimate is refreshed by each call to :meth:`update` and is considered converged
+    as soon as it did not change for `patience` consecutive calls.
 
-    frac = daz / daz[np.argmax(c)]
-    sel = (frac > 0.9) & (frac < 1.1)
-    daz = np.average(daz[sel], weights=c[sel])
+    Example:
+        >>> estimator = pycatzao.BinEdgeEstimator()
+        >>> with open("my-data.cat240", "rb") as f:
+        ...     while not estimator.converged and (data := f.read(1_000_000)):
+        ...         estimator.update(data)
+        >>> r_edges = np.arange(**estimator.bins["r"], stop=3_000)
+        >>> az_edges = np.linspace(**estimator.bins["az"])
 
-    az_num = round(360.0 / daz)
-    daz = 360.0 / az_num
+    Args:
+        patience (int):
+            Number of consecutive calls to :meth:`update` without a change of the
+            estimate after which the estimate is considered converged.
+    """
 
-    az_start = (az0 + np.sign(180 - az0) * daz / 2) % daz - daz
-    az_end = az_start + np.ceil((360 - az_start) / daz) * daz
+    def __init__(self, *, patience=3):  # noqa: D107
+        self.patience = patience
 
-    if az_end - daz > 360:
-        az_end -= daz
+        self.bins = None
+        self.n_messages = 0
 
-    assert az_start <= 0, az_start
-    assert az_end >= 360, az_end
+        self._az_counts = np.zeros(2**17, dtype=np.int64)
+        self._r0 = np.inf
+        self._dr_counts = {}
+        self._unchanged = 0
+        self._tail = b""
 
-    r0 = min(r0)
-    dr = np.median(dr).item()
+    @property
+    def converged(self):
+        """Whether the estimate is unchanged for `patience` calls to :meth:`update`."""
+        return self.bins is not None and self._unchanged >= self.patience
 
-    return {
-        "az": {
-            "start": az_start.item(),
-            "num": round((az_end - az_start) / daz) + 1,
-            "stop": az_end.item(),
-        },
-        "r": {
-            "start": r0 - dr / 2,
-            "step": dr,
-        },
-    }, tail
+    def update(self, data):
+        """Add CAT240 messages to the statistics and refresh the estimate.
+
+        Args:
+            data (bytes):
+                Encoded CAT240 messages as a binary blob. Bytes of incomplete messages
+                are kept and prepended to the data of the next call.
+
+        Returns:
+            dict | None:
+                The current estimate of the binning scheme (see :func:`infer_bin_edges`
+                for details) or `None` if too few messages were seen so far.
+        """
+        data = self._tail + bytes(data)
+        offsets = _utils._message_offsets(data)
+        self._tail = data[offsets[-1] :]
+
+        hdr = decoder._decode_headers(data, offsets)
+        video = hdr["type"] == 2
+        self.n_messages += np.count_nonzero(video)
 
+        if np.any(video):
+            az = np.rint(hdr["az"][video] * (2**17 / 360)).astype(np.int64)
+            self._az_counts += np.bincount(az, minlength=self._az_counts.size)
 
-def join_blocks(blocks, *, show_progress=False):
+            cell_width = hdr["cell_dur"][video] * 299_792_458 / 2  # in meters
+            self._r0 = min(self._r0, (hdr["start_rg"][video] * cell_width).min())
+            for dr, c in zip(*np.unique(cell_width, return_counts=True), strict=True):
+                self._dr_counts[dr.item()] = self._dr_counts.get(dr.item(), 0) + c
+
+        if self._r0 == np.inf:
+            return None
+
+        bins = _bin_edges(self._az_counts, float(self._r0), self._dr_counts)
+        self._unchanged = self._unchanged + 1 if bins == self.bins else 0
+        self.bins = bins
+        return bins
+
+
+def join_blocks(blocks, *, show_progress=False, out=None):
     r"""Join decoded CAT240 blocks into columns.
 
     Joins the fields `tod`, `az`, `r`, and `amp` of decoded Asterix CAT240 blocks into a
@@ -150,43 +235,473 @@ def join_blocks(blocks, *, show_progress=False):
         show_progress (bool):
             Show progress bar.
 
+        out (dict | None):
+            Preallocated (one-dimensional) arrays for the keys `tod`, `az`, `r`, and
+            `amp` that are large enough to hold the joined columns. If `None`, new
+            arrays are allocated.
+
     Returns:
         dict:
-            Columns of a (rectangular) table.
+            Columns of a (rectangular) table. If `out` is given, the columns are views
+            of the leading elements of the preallocated arrays.
 
+    Raises:
+        ValueError:
+            The preallocated arrays are too small.
     """
-    blocks = [block for block in blocks if block["type"] == 2]
-    if len(blocks) == 0:
-        return {
-            "tod": np.empty(0, dtype=np.float32),
-            "az": np.empty(0, dtype=np.float32),
-            "r": np.empty(0, dtype=np.float32),
-            "amp": np.empty(0, dtype=np.uint8),
+    blocks = [
+        block
+        for block in tqdm(blocks, disable=not show_progress, desc="Joining blocks")
+        if block["type"] == 2
+    ]
+
+    counts = np.fromiter(
+        (block["amp"].size for block in blocks), dtype=np.int64, count=len(blocks)
+    )
+    n = counts.sum()
+
+    if out is None:
+        out = {
+            "tod": np.empty(n, dtype=np.float32),
+            "az": np.empty(n, dtype=np.float32),
+            "r": np.empty(n, dtype=np.float32),
+            "amp": np.empty(n, dtype=blocks[0]["amp"].dtype if blocks else np.uint8),
         }
+    elif any(out[k].size < n for k in ["tod", "az", "r", "amp"]):
+        raise ValueError(
+            f"Preallocated arrays are too small, at least {n} elements are required."
+        )
+
+    table = {k: out[k][:n] for k in ["tod", "az", "r", "amp"]}
+    if n == 0:
+        return table
+
+    for k in ["tod", "az"]:
+        table[k][:] = np.repeat(
+            np.fromiter(
+                (block.get(k, np.nan) for block in blocks),
+                dtype=np.float32,
+                count=len(blocks),
+            ),
+            counts,
+        )
+
+    for k in ["r", "amp"]:
+        np.concatenate([block[k] for block in blocks], out=table[k], casting="unsafe")
+
+    return table
+
+
+class ColumnAccumulator:
+    r"""Accumulate columns of a table.
+
+    Appending to NumPy arrays (e.g., by :func:`numpy.append`) copies all previous rows
+    and is hence quadratic in the total number of rows. This class collects columns
+    as returned by :func:`join_blocks` or :func:`pycatzao.decode_columns` (or decoded
+    blocks directly) in chunks that grow geometrically up to `chunk_size` rows and
+    joins them only once in :meth:`finalize`. If `max_memory` is set, full chunks that
+    exceed this limit are spilled to disk. Spilled chunks are removed by :meth:`close`
+    or as soon as the accumulator is garbage collected.
 
-    n = np.cumsum([len(block["amp"]) for block in blocks])
-    n = np.insert(n, 0, 0)
-    n_max = n[-1]
+    Example:
+        >>> acc = pycatzao.ColumnAccumulator(max_memory=2**30)
+        >>> for blocks in itertools.batched(pycatzao.decode_file(...), 100_000):
+        ...     acc.extend(blocks)
+        >>> df = pd.DataFrame(acc.finalize())
 
-    tod = np.empty(n_max, dtype=np.float32)
-    az = np.empty(n_max, dtype=np.float32)
-    rg = np.empty(n_max, dtype=np.float32)
-    amp = np.empty(n_max, dtype=blocks[0]["amp"].dtype)
+    Args:
+        chunk_size (int):
+            Maximum number of rows per chunk.
+        max_memory (int | None):
+            Maximum number of bytes of full chunks that are kept in memory. If `None`,
+            chunks are never spilled to disk.
+        spill_dir (str | pathlib.Path | None):
+            Directory for spilled chunks. If `None`, the default directory for
+            temporary files is used.
+    """
 
-    for block, i, j in tqdm(
-        zip(blocks, n[:-1], n[1:]),
-        total=len(blocks),
-        disable=not show_progress,
-        desc="Joining blocks",
-    ):
-        tod[i:j] = block.get("tod", np.nan)
-        az[i:j] = block["az"]
-        rg[i:j] = block["r"]
-        amp[i:j] = block["amp"]
+    def __init__(self, *, chunk_size=2**20, max_memory=None, spill_dir=None):  # noqa: D107
+        self.chunk_size = chunk_size
+        self.max_memory = max_memory
+        self.spill_dir = spill_dir
+
+        self._dtypes = None
+        self._chunks = []  # full chunks, either arrays or names of spilled files
+        self._memory = 0
+        self._rows = 0
+        self._buffer = None
+        self._n = 0
+        self._spill_dir = None
+
+    def __len__(self):
+        """Number of accumulated rows."""
+        return self._rows
+
+    def _reserve(self, n):
+        capacity = 0 if self._buffer is None else len(next(iter(self._buffer.values())))
+        if capacity - self._n >= n or capacity == self.chunk_size:
+            return capacity
+
+        capacity = min(self.chunk_size, max(2 * capacity, self._n + n, 1024))
+        buffer = {k: np.empty(capacity, dtype=v) for k, v in self._dtypes.items()}
+        if self._buffer is not None:
+            for k, v in buffer.items():
+                v[: self._n] = self._buffer[k][: self._n]
+
+        self._buffer = buffer
+        return capacity
+
+    def _seal(self):
+        chunk = {k: v[: self._n] for k, v in self._buffer.items()}
+        nbytes = sum(v.nbytes for v in chunk.values())
+
+        if self.max_memory is None or self._memory + nbytes <= self.max_memory:
+            self._chunks.append(chunk)
+            self._memory += nbytes
+            self._buffer = None
+        else:
+            if self._spill_dir is None:
+                spill_dir = tempfile.mkdtemp(prefix="pycatzao-", dir=self.spill_dir)
+                self._spill_dir = pathlib.Path(spill_dir)
+                self._cleanup = weakref.finalize(self, shutil.rmtree, spill_dir)
+
+            spilled = {}
+            for i, (k, v) in enumerate(chunk.items()):
+                spilled[k] = self._spill_dir / f"{len(self._chunks)}-{i}.npy"
+                np.save(spilled[k], v)
+
+            # the buffer is reused for the next chunk
+            self._chunks.append(spilled)
+
+        self._n = 0
+
+    def append(self, columns):
+        """Append columns.
+
+        Args:
+            columns (dict):
+                One-dimensional arrays of equal length, e.g., as returned by
+                :func:`join_blocks`. The keys of the first call define the columns of
+                the table. Their data types are promoted if later calls contain values
+                that do not fit (e.g., wider amplitudes).
+        """
+        columns = {k: np.asarray(v) for k, v in columns.items()}
+        if self._rows == 0:
+            # empty batches (e.g., of summary blocks) must not fix the data types
+            self._dtypes = {k: v.dtype for k, v in columns.items()}
+
+        for k, dtype in self._dtypes.items():
+            if not np.can_cast(columns[k].dtype, dtype):
+                # already sealed chunks keep their type and are cast in `finalize`
+                self._dtypes[k] = np.promote_types(dtype, columns[k].dtype)
+                if self._buffer is not None:
+                    self._buffer[k] = self._buffer[k].astype(self._dtypes[k])
+
+        n = len(columns[next(iter(self._dtypes))])
+        self._rows += n
+
+        i = 0
+        while i < n:
+            m = min(n - i, self._reserve(n - i) - self._n)
+            for k, v in self._buffer.items():
+                v[self._n : self._n + m] = columns[k][i : i + m]
+
+            self._n += m
+            i += m
+            if self._n == self.chunk_size:
+                self._seal()
+
+    def extend(self, blocks):
+        """Append decoded blocks.
+
+        Args:
+            blocks (Iterable[dict]):
+                Decoded blocks that are joined by :func:`join_blocks` before they are
+                appended.
+        """
+        self.append(join_blocks(blocks))
+
+    def finalize(self, *, out=None):
+        """Join all accumulated columns.
+
+        Args:
+            out (dict | None):
+                Preallocated (one-dimensional) arrays for all columns that are large
+                enough to hold all accumulated rows. This is useful for writing the
+                result, e.g., to a :class:`numpy.memmap` if it does not fit into
+                memory. If `None`, new arrays are allocated.
+
+        Returns:
+            dict:
+                Contiguous columns. If `out` is given, the columns are views of the
+                leading elements of the preallocated arrays.
+
+        Raises:
+            ValueError:
+                The preallocated arrays are too small.
+        """
+        if self._dtypes is None:
+            return {}
+
+        if out is None:
+            out = {k: np.empty(self._rows, dtype=v) for k, v in self._dtypes.items()}
+        elif any(out[k].size < self._rows for k in self._dtypes):
+            raise ValueError(
+                "Preallocated arrays are too small, at least "
+                f"{self._rows} elements are required."
+            )
+
+        table = {k: out[k][: self._rows] for k in self._dtypes}
+
+        chunks = self._chunks
+        if self._n > 0:
+            chunks = [*chunks, {k: v[: self._n] for k, v in self._buffer.items()}]
+
+        i = 0
+        for chunk in chunks:
+            for k, v in chunk.items():
+                if not isinstance(v, np.ndarray):
+                    v = np.load(v, mmap_mode="r")
+
+                table[k][i : i + len(v)] = v
+
+            i += len(v)
+
+        return table
+
+    def close(self):
+        """Remove all accumulated rows (including spilled chunks)."""
+        if self._spill_dir is not None:
+            self._cleanup()
+
+        self.__init__(
+            chunk_size=self.chunk_size,
+            max_memory=self.max_memory,
+            spill_dir=self.spill_dir,
+        )
+
+
+class SweepAssembler:
+    r"""Assemble antenna rotations into dense (azimuth × range) images.
+
+    The type `002` messages are binned according to the given binning scheme (see
+    :func:`infer_bin_edges`) into a preallocated two-dimensional buffer of shape
+    `(n_az, n_r)`. Since the azimuth bins are circular, the first and last bin of the
+    scheme are superimposed. A rotation (aka sweep) is completed as soon as the azimuth
+    decreases from one message to the next. Only the non-zero cells of each message are
+    written and, after a sweep has been yielded, only these cells are cleared again.
+    Hence, the buffer is never reallocated between sweeps and the costs per message do
+    not depend on the size of the image. Cells that are hit more than once in a sweep
+    keep the amplitude of the latest message.
+
+    Note that the yielded sweeps are read-only views of the (reused) buffer that are
+    only valid until the generator is resumed, i.e., copy them if you need to keep
+    them. The first and last sweep of a recording are typically incomplete.
 
-    return {
-        "tod": tod,
-        "az": az,
-        "r": rg,
-        "amp": amp,
-    }
+    Example:
+        >>> with open("my-data.cat240", "rb") as f:
+        ...     bins, _ = pycatzao.infer_bin_edges(f.read(100_000_000))
+        >>> assembler = pycatzao.SweepAssembler(bins, r_stop=3_000)
+        >>> for sweep in assembler.update(pycatzao.decode_file("my-data.cat240")):
+        ...     track(sweep)  # do something meaningful with the data
+        >>> track(assembler.flush())
+
+    Args:
+        bins (dict):
+            Binning scheme as returned by :func:`infer_bin_edges`.
+        r_stop (float):
+            Upper limit of the range bins (see :func:`numpy.arange`). Cells beyond the
+            last range bin are dropped.
+        dtype (numpy.dtype | None):
+            Data type of the images. If `None`, the data type of the amplitudes of the
+            first message is used.
+    """
+
+    def __init__(self, bins, *, r_stop, dtype=None):  # noqa: D107
+        self.az_edges = np.linspace(**bins["az"])
+        self.r_edges = np.arange(**bins["r"], stop=r_stop)
+        self.dtype = dtype
+
+        n_az = round(360 / (self.az_edges[1] - self.az_edges[0]))
+        self.shape = (n_az, max(self.r_edges.size - 1, 0))
+
+        self._sweep = None
+        self._touched = []
+        self._stale = False
+        self._n_msg = 0
+        self._last_az = np.nan
+        self._tail = b""
+
+    def _add(self, block):
+        if self._sweep is None:
+            dtype = block["amp"].dtype if self.dtype is None else self.dtype
+            self._sweep = np.zeros(self.shape, dtype=dtype)
+        elif self._stale:
+            self._clear()
+
+        n_az, n_r = self.shape
+        i_az = (np.searchsorted(self.az_edges, block["az"]) - 1) % n_az
+        i_r = np.searchsorted(self.r_edges, block["r"]) - 1
+
+        sel = (i_r >= 0) & (i_r < n_r)
+        cells = i_az * n_r + i_r[sel]
+        self._sweep.reshape(-1)[cells] = block["amp"][sel]
+
+        self._touched.append(cells)
+        self._n_msg += 1
+
+    def _view(self):
+        view = self._sweep.view()
+        view.flags.writeable = False
+        return view
+
+    def _clear(self):
+        flat = self._sweep.reshape(-1)
+        for cells in self._touched:
+            flat[cells] = 0
+
+        self._touched.clear()
+        self._stale = False
+
+    def update(self, data):
+        """Add messages and yield completed sweeps.
+
+        Args:
+            data (Iterable[dict] | bytes):
+                Decoded blocks (e.g., as returned by :func:`pycatzao.decode_file`) or
+                encoded CAT240 messages as a binary blob. Bytes of incomplete messages
+                are kept and prepended to the data of the next call.
+
+        Returns:
+            typing.Generator[numpy.ndarray, None, None]:
+                Completed sweeps. The arrays are only valid until the generator is
+                resumed.
+        """
+        if isinstance(data, bytes | bytearray | memoryview):
+            data, self._tail = decoder.decode(self._tail + bytes(data))
+
+        for block in data:
+            if block["type"] != 2:
+                continue
+
+            if block["az"] < self._last_az and self._n_msg > 0:
+                yield self._view()
+                self._stale = True
+                self._n_msg = 0
+
+            self._last_az = block["az"]
+            self._add(block)
+
+    def flush(self):
+        """Return the current (incomplete) sweep and start a new one.
+
+        Returns:
+            numpy.ndarray | None:
+                The current sweep, which is only valid until the assembler is used
+                again, or `None` if no message was added since the last sweep.
+        """
+        if self._n_msg == 0:
+            return None
+
+        self._stale = True
+        self._n_msg = 0
+        self._last_az = np.nan
+        return self._view()
+
+
+@functools.lru_cache(maxsize=16)
+def _ppi_lookup(az_bins, r_bins, n_r, size):
+    # maps each pixel to the (flat) index of its polar cell; pixels beyond the last
+    # range bin are listed separately such that they can be filled after the gather
+    az_edges = np.linspace(**dict(az_bins))
+    r_bins = dict(r_bins)
+    stop = r_bins["start"] + (n_r + 0.5) * r_bins["step"]
+    r_edges = np.arange(**r_bins, stop=stop)[: n_r + 1]
+    n_az = round(360 / (az_edges[1] - az_edges[0]))
+
+    r_max = r_edges[-1]
+    c = (np.arange(size) + 0.5) * (2 * r_max / size)
+    x, y = (c - r_max)[np.newaxis, :], (r_max - c)[:, np.newaxis]
+
+    i_az = (np.searchsorted(az_edges, np.rad2deg(np.arctan2(x, y)) % 360) - 1) % n_az
+    i_r = np.searchsorted(r_edges, np.hypot(x, y)) - 1
+
+    # the cache holds up to 16 maps of `size**2` entries, i.e., use narrow indices
+    n = max(n_az * n_r, size * size)
+    dtype = np.int32 if n <= np.iinfo(np.int32).max else np.intp
+
+    outside = (i_r < 0) | (i_r >= n_r)
+    index = np.where(outside, 0, i_az * n_r + i_r).reshape(-1).astype(dtype)
+    outside = np.flatnonzero(outside).astype(dtype)
+
+    index.flags.writeable = False
+    outside.flags.writeable = False
+    return n_az, index, outside
+
+
+def rasterize_ppi(sweep, bins, *, size, fill=0, out=None):
+    r"""Rasterizes a sweep into a Cartesian PPI image.
+
+    The polar image of a sweep (as yielded by :class:`SweepAssembler`) is mapped onto a
+    square image of `size` × `size` pixels centered at the radar with north pointing
+    upwards. Each pixel takes the value of the polar cell that contains the pixel
+    center (nearest neighbour) and the image covers the full range of the sweep. The
+    mapping from pixels to polar cells is computed only once per binning scheme and
+    image size and cached afterwards; each sweep is then rasterized by a single
+    :func:`numpy.take` without any trigonometry.
+
+    Example:
+        >>> assembler = pycatzao.SweepAssembler(bins, r_stop=3_000)
+        >>> for sweep in assembler.update(pycatzao.decode_file("my-data.cat240")):
+        ...     show(pycatzao.rasterize_ppi(sweep, bins, size=1024))
+
+    Args:
+        sweep (numpy.ndarray):
+            Sweep of shape `(n_az, n_r)`.
+        bins (dict):
+            Binning scheme of the sweep as returned by :func:`infer_bin_edges`.
+        size (int):
+            Width and height of the image in pixels.
+        fill (scalar):
+            Value of pixels beyond the last range bin.
+        out (numpy.ndarray | None):
+            Preallocated image of shape `(size, size)` and the same data type as
+            `sweep`. If `None`, a new image is allocated.
+
+    Returns:
+        numpy.ndarray:
+            Image of shape `(size, size)` where the first axis points southwards and
+            the second axis eastwards.
+
+    Raises:
+        ValueError:
+            The shape of the sweep does not match the binning scheme or `out` is not a
+            C-contiguous array of the required shape and data type.
+    """
+    n_az, index, outside = _ppi_lookup(
+        tuple(sorted(bins["az"].items())),
+        tuple(sorted(bins["r"].items())),
+        sweep.shape[1],
+        size,
+    )
+    if sweep.shape[0] != n_az:
+        raise ValueError(
+            f"Sweep has {sweep.shape[0]} azimuth bins but the binning scheme {n_az}."
+        )
+
+    if out is None:
+        out = np.empty((size, size), dtype=sweep.dtype)
+    elif (
+        out.shape != (size, size)
+        or out.dtype != sweep.dtype
+        or not out.flags.c_contiguous
+    ):
+        # otherwise, `out.reshape(-1)` would silently write to a copy
+        raise ValueError(
+            f"Preallocated image must be a C-contiguous array of shape {(size, size)} "
+            f"and type {sweep.dtype}."
+        )
+
+    np.take(np.ascontiguousarray(sweep).reshape(-1), index, out=out.reshape(-1))
+    out.reshape(-1)[outside] = fill
+    return out
@@ -32,11 +32,20 @@ setup(
         "tqdm",
     ],
     extras_require={
+        "arrow": [
+            "pyarrow",
+        ],
         "dev": [
+            "asv",
+            "h5py",
             "pre-commit",
+            "pyarrow",
             "pytest",
             "pytest-cov",
             "sphinx",
         ],
+        "hdf5": [
+            "h5py",
+        ],
     },
 )
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _write_recording(rng, file_name, *, n_msg, dtype=np.uint8):
+    data = b"".join(
+        test_utils.random_type2_message(
+            rng, n_max=50, dtype=dtype, compress=bool(rng.integers(2)), tod=True
+        )[0]
+        for _ in range(n_msg)
+    )
+    with open(file_name, "wb") as f:
+        f.write(data)
+
+    return pycatzao.decode_columns(data)[0]
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("batch_rows", [1, 10, 333, 2**20])
+@pytest.mark.parametrize("buffer_size", [100, 1000, 2**24])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_to_arrow_batches(seed, batch_rows, buffer_size, mmap, tmp_path):
+    rng = np.random.default_rng(seed)
+    file_name = tmp_path / "data.cat240"
+    expected = _write_recording(rng, file_name, n_msg=30)
+
+    batches = list(
+        pycatzao.io.to_arrow_batches(
+            file_name, batch_rows=batch_rows, buffer_size=buffer_size, mmap=mmap
+        )
+    )
+    assert all(batch.num_rows == batch_rows for batch in batches[:-1])
+    assert 0 < batches[-1].num_rows <= batch_rows
+
+    table = pa.Table.from_batches(batches)
+    assert table.column_names == list(expected)
+    for k, v in expected.items():
+        np.testing.assert_array_equal(table.column(k).to_numpy(), v)
+
+
+def test_to_arrow_batches_amp_dtype(tmp_path):
+    rng = np.random.default_rng(0)
+    file_name = tmp_path / "data.cat240"
+    expected = _write_recording(rng, file_name, n_msg=10, dtype=np.uint16)
+
+    batches = list(pycatzao.io.to_arrow_batches(file_name, amp_dtype=np.uint32))
+    assert batches[0].schema.field("amp").type == pa.uint32()
+    np.testing.assert_array_equal(
+        pa.Table.from_batches(batches).column("amp").to_numpy(), expected["amp"]
+    )
+
+    with pytest.raises(ValueError):
+        list(pycatzao.io.to_arrow_batches(file_name, amp_dtype=np.uint8))
+
+
+@pytest.mark.parametrize("seed", list(range(3)))
+@pytest.mark.parametrize("batch_rows", [7, 2**20])
+def test_to_parquet(seed, batch_rows, tmp_path):
+    rng = np.random.default_rng(seed)
+    file_name = tmp_path / "data.cat240"
+    expected = _write_recording(rng, file_name, n_msg=30)
+
+    parquet_file = tmp_path / "data.parquet"
+    n = pycatzao.io.to_parquet(
+        file_name, parquet_file, batch_rows=batch_rows, buffer_size=1000
+    )
+    assert n == expected["tod"].size
+
+    f = pq.ParquetFile(parquet_file)
+    assert f.metadata.num_row_groups == -(-n // batch_rows)
+
+    table = f.read()
+    for k, v in expected.items():
+        np.testing.assert_array_equal(table.column(k).to_numpy(), v)
+
+
+def test_to_parquet_empty(tmp_path):
+    file_name = tmp_path / "data.cat240"
+    file_name.touch()
+
+    parquet_file = tmp_path / "data.parquet"
+    assert pycatzao.io.to_parquet(file_name, parquet_file) == 0
+
+    table = pq.read_table(parquet_file)
+    assert table.num_rows == 0
+    assert table.column_names == ["tod", "az", "r", "amp", "idx", "sac", "sic"]
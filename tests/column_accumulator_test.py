@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000, 2**20])
+@pytest.mark.parametrize("max_memory", [None, 0, 500])
+def test_accumulate_columns(seed, chunk_size, max_memory, tmp_path):
+    rng = np.random.default_rng(seed)
+    batches = [
+        {
+            "a": rng.integers(0, 100, size=n).astype(np.uint8),
+            "b": rng.normal(size=n).astype(np.float32),
+        }
+        for n in rng.integers(0, 300, size=10)
+    ]
+
+    acc = pycatzao.ColumnAccumulator(
+        chunk_size=chunk_size, max_memory=max_memory, spill_dir=tmp_path
+    )
+    for batch in batches:
+        acc.append(batch)
+
+    assert len(acc) == sum(len(batch["a"]) for batch in batches)
+    if max_memory == 0 and len(acc) >= chunk_size:
+        assert any(tmp_path.iterdir())
+
+    table = acc.finalize()
+    assert table.keys() == {"a", "b"}
+    for k in table:
+        assert table[k].dtype == batches[0][k].dtype
+        np.testing.assert_array_equal(
+            table[k], np.concatenate([batch[k] for batch in batches])
+        )
+
+    # finalizing is not destructive
+    out = {k: np.empty(len(acc) + 3, dtype=v.dtype) for k, v in table.items()}
+    table2 = acc.finalize(out=out)
+    for k in table:
+        assert np.shares_memory(table2[k], out[k])
+        np.testing.assert_array_equal(table2[k], table[k])
+
+    if len(acc) > 0:
+        with pytest.raises(ValueError):
+            acc.finalize(out={k: v[: len(acc) - 1] for k, v in out.items()})
+
+    acc.close()
+    assert len(acc) == 0
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+def test_accumulate_blocks(seed):
+    rng = np.random.default_rng(seed)
+    blocks, _ = pycatzao.decode(
+        b"".join(
+            test_utils.random_type2_message(
+                rng, n_max=100, dtype=np.uint16, compress=True, tod=True
+            )[0]
+            for _ in range(100)
+        )
+    )
+
+    acc = pycatzao.ColumnAccumulator(chunk_size=100)
+    for i in range(0, len(blocks), 7):
+        acc.extend(blocks[i : i + 7])
+
+    table = acc.finalize()
+    expected = pycatzao.join_blocks(blocks)
+    assert table.keys() == expected.keys()
+    for k in expected:
+        np.testing.assert_array_equal(table[k], expected[k])
+
+
+def test_accumulate_nothing():
+    assert pycatzao.ColumnAccumulator().finalize() == {}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize("max_memory", [None, 0])
+def test_accumulate_wider_amplitudes(chunk_size, max_memory, tmp_path):
+    summary, _ = pycatzao.decode(
+        pycatzao.encode(pycatzao.make_summary(summary="foobar"), sac=1, sic=2)
+    )
+    acc = pycatzao.ColumnAccumulator(
+        chunk_size=chunk_size, max_memory=max_memory, spill_dir=tmp_path
+    )
+
+    # neither an empty first batch nor narrower amplitudes fix the data type
+    acc.extend(summary)
+    for amp in ([1, 2], [300, 70000], [3]):
+        acc.append(
+            {k: np.arange(len(amp), dtype=np.float64) for k in ("tod", "az", "r")}
+            | {"amp": np.array(amp, np.uint8 if max(amp) < 256 else np.uint32)}
+        )
+
+    table = acc.finalize()
+    assert table["amp"].dtype == np.uint32
+    assert table["r"].dtype == np.float64
+    np.testing.assert_array_equal(table["amp"], [1, 2, 300, 70000, 3])
+    np.testing.assert_array_equal(table["r"], [0, 1, 0, 1, 0])
@@ -1,5 +1,6 @@
 import pathlib
 import tempfile
+import zlib
 
 import numpy as np
 import pytest
@@ -81,3 +82,326 @@ def test_compression_ratio(dtype):
     compressed, tail = pycatzao.compress(block)
     assert tail == b""
     assert len(block) // 3 > len(compressed[0])
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("buffer_size", [-1, 100, 2**20])
+@pytest.mark.parametrize("workers", [0, 1, 3])
+@pytest.mark.parametrize("sink", ["name", "handle"])
+def test_compress_file_out_file(seed, buffer_size, workers, sink, tmp_path):
+    rng = np.random.default_rng(seed)
+    encoded = [
+        pycatzao.encode(pycatzao.make_summary(summary="foobar"), sac=1, sic=2)
+    ] + [
+        test_utils.random_type2_message(
+            rng,
+            n_max=2_000,
+            dtype=np.uint16,
+            compress=bool(rng.integers(2)),
+            tod=bool(rng.integers(2)),
+        )[0]
+        for _ in range(500)
+    ]
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(b"".join(encoded))
+
+    expected = b"".join(pycatzao.compress(b"".join(encoded))[0])
+    assert (
+        b"".join(
+            pycatzao.compress_file(file_name, buffer_size=buffer_size, workers=workers)
+        )
+        == expected
+    )
+
+    out_file = tmp_path / "compressed.cat240"
+    if sink == "name":
+        n = pycatzao.compress_file(
+            file_name, buffer_size=buffer_size, workers=workers, out_file=out_file
+        )
+    else:
+        with open(out_file, "wb") as f:
+            f.write(b"foo")
+            n = pycatzao.compress_file(
+                file_name, buffer_size=buffer_size, workers=workers, out_file=f
+            )
+            assert not f.closed
+
+        expected = b"foo" + expected
+
+    assert n == len(expected) - (3 if sink == "handle" else 0)
+    with open(out_file, "rb") as f:
+        assert f.read() == expected
+
+
+@pytest.mark.parametrize("workers", [0, 4])
+def test_compress_workers(workers):
+    rng = np.random.default_rng(0)
+    encoded = [
+        test_utils.random_type2_message(
+            rng, n_max=500, dtype=np.uint8, compress=False, tod=True
+        )[0]
+        for _ in range(100)
+    ]
+    data = b"".join(encoded)
+
+    compressed, tail = pycatzao.compress(data[:-10], workers=workers)
+    assert len(compressed) == len(encoded) - 1
+    assert tail == encoded[-1][:-10]
+    assert compressed == pycatzao.compress(b"".join(encoded[:-1]))[0]
+
+
+def _sparse_messages(rng, *, n_msg, dtype=np.uint8):
+    encoded = []
+    for i in range(n_msg):
+        amp = np.zeros(rng.integers(100, 2_000), dtype=dtype)
+        cells = rng.choice(amp.size, size=amp.size // 20, replace=False)
+        amp[cells] = rng.integers(1, 100, size=cells.size)
+        encoded.append(
+            pycatzao.encode(
+                pycatzao.make_video_message(
+                    amp,
+                    msg_index=i,
+                    header=pycatzao.make_video_header(
+                        start_az=i, end_az=i + 1, cell_offset=0, cell_width=5
+                    ),
+                    compress=False,
+                ),
+                sac=1,
+                sic=2,
+                tod=float(i),
+            )
+        )
+
+    return encoded
+
+
+@pytest.mark.parametrize("level", [-1, 0, 1, 9])
+@pytest.mark.parametrize("strategy", [zlib.Z_DEFAULT_STRATEGY, zlib.Z_RLE])
+@pytest.mark.parametrize("wbits", [9, 15])
+@pytest.mark.parametrize("mem_level", [1, 9])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_compress_options(level, strategy, wbits, mem_level, workers):
+    rng = np.random.default_rng(0)
+    data = b"".join(_sparse_messages(rng, n_msg=20))
+
+    compressed, _ = pycatzao.compress(
+        data,
+        workers=workers,
+        level=level,
+        strategy=strategy,
+        wbits=wbits,
+        mem_level=mem_level,
+    )
+    for block, expected in zip(
+        pycatzao.decode(b"".join(compressed))[0], pycatzao.decode(data)[0], strict=True
+    ):
+        np.testing.assert_array_equal(block["amp"], expected["amp"])
+        np.testing.assert_array_equal(block["r"], expected["r"])
+
+    if (level, strategy, wbits, mem_level) == (-1, zlib.Z_DEFAULT_STRATEGY, 15, 8):
+        assert compressed == pycatzao.compress(data)[0]
+
+
+def test_compress_level():
+    rng = np.random.default_rng(0)
+    data = b"".join(_sparse_messages(rng, n_msg=50))
+
+    n = [sum(map(len, pycatzao.compress(data, level=level)[0])) for level in [0, 1, 9]]
+    assert n[0] > n[1] >= n[2]
+
+
+def test_compress_invalid_options():
+    for kwargs in [
+        {"wbits": -15},
+        {"wbits": 31},
+        {"level": 10},
+        {"mem_level": 0},
+        {"strategy": 42},
+    ]:
+        with pytest.raises(ValueError):
+            pycatzao.compress(b"", **kwargs)
+
+        with pytest.raises(ValueError):
+            pycatzao.compress_file("does-not-matter", **kwargs)
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("adaptive", [1, 10, 1_000])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_compress_adaptive(seed, adaptive, workers):
+    rng = np.random.default_rng(seed)
+
+    # sparse video compresses well, random video does not
+    encoded = _sparse_messages(rng, n_msg=50)
+    encoded += [
+        test_utils.random_type2_message(
+            rng, n_max=500, dtype=np.uint8, compress=False, tod=True
+        )[0]
+        for _ in range(50)
+    ]
+    data = b"".join(encoded)
+
+    compressed, tail = pycatzao.compress(data, workers=workers, adaptive=adaptive)
+    assert tail == b""
+    assert len(compressed) == len(encoded)
+
+    assert all(
+        block != msg for block, msg in zip(compressed[:50], encoded[:50], strict=True)
+    )
+    assert sum(map(len, compressed[:50])) < sum(map(len, encoded[:50]))
+
+    # incompressible video blocks are left untouched
+    assert compressed[50:] == encoded[50:]
+
+    for block, expected in zip(
+        pycatzao.decode(b"".join(compressed))[0], pycatzao.decode(data)[0], strict=True
+    ):
+        np.testing.assert_array_equal(block["amp"], expected["amp"])
+        np.testing.assert_array_equal(block["r"], expected["r"])
+
+
+def test_compress_file_adaptive(tmp_path):
+    rng = np.random.default_rng(0)
+    data = b"".join(_sparse_messages(rng, n_msg=200))
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(data)
+
+    out_file = tmp_path / "compressed.cat240"
+    n = pycatzao.compress_file(
+        file_name, buffer_size=1_000, adaptive=10, out_file=out_file
+    )
+    assert n < len(data)
+
+    with open(out_file, "rb") as f:
+        compressed = f.read()
+
+    for block, expected in zip(
+        pycatzao.decode(compressed)[0], pycatzao.decode(data)[0], strict=True
+    ):
+        np.testing.assert_array_equal(block["amp"], expected["amp"])
+
+
+@pytest.mark.parametrize("seed", list(range(10)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("tod", [True, False])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_decompress(seed, dtype, tod, workers):
+    rng = np.random.default_rng(seed)
+    encoded = [pycatzao.encode(pycatzao.make_summary(summary="foobar"), sac=1, sic=2)]
+    infos = [None]
+    for i in range(20):
+        msg, info = test_utils.random_type2_message(
+            rng, n_max=500, dtype=dtype, compress=bool(i % 2), tod=tod
+        )
+        encoded.append(msg)
+        infos.append(info)
+
+    data = b"".join(encoded)
+    decompressed, tail = pycatzao.decompress(data[:-1], workers=workers)
+    assert tail == encoded[-1][:-1]
+    assert len(decompressed) == len(encoded) - 1
+
+    decompressed, tail = pycatzao.decompress(data, workers=workers)
+    assert tail == b""
+
+    # type `001` and uncompressed messages are passed through
+    assert decompressed == pycatzao.decompress(b"".join(decompressed))[0]
+    for i, (block, msg) in enumerate(zip(decompressed, encoded, strict=True)):
+        if i % 2 == 1 or i == 0:
+            assert block == msg
+
+    blocks, _ = pycatzao.decode(b"".join(decompressed))
+    for block, expected in zip(blocks, pycatzao.decode(data)[0], strict=True):
+        assert block.keys() == expected.keys()
+        for k in block:
+            np.testing.assert_array_equal(block[k], expected[k])
+
+    # round trip
+    compressed, _ = pycatzao.compress(b"".join(decompressed))
+    assert compressed == pycatzao.compress(data)[0]
+
+
+def test_decompress_block_size():
+    # the compressed video block fits into 4-byte blocks but its uncompressed
+    # counterpart needs larger ones
+    amp = np.zeros(30_000, dtype=np.uint16)
+    amp[::1000] = 1
+    encoded = pycatzao.encode(
+        pycatzao.make_video_message(
+            amp,
+            msg_index=1,
+            header=pycatzao.make_video_header(
+                start_az=0, end_az=1, cell_offset=0, cell_width=1
+            ),
+        ),
+        sac=1,
+        sic=2,
+        tod=42.0,
+    )
+    assert encoded[4] & 0x40 == 0x40  # I240/050
+
+    (block,), _ = pycatzao.decompress(encoded)
+    assert block[4] & 0x70 == 0x10  # I240/052
+    assert len(block) > amp.nbytes
+
+    (decoded,), _ = pycatzao.decode(block)
+    (expected,), _ = pycatzao.decode(encoded)
+    for k in expected:
+        np.testing.assert_array_equal(decoded[k], expected[k])
+
+    # too large to be stored uncompressed
+    amp = np.zeros(40_000, dtype=np.uint16)
+    encoded = pycatzao.encode(
+        pycatzao.make_video_message(
+            amp,
+            msg_index=1,
+            header=pycatzao.make_video_header(
+                start_az=0, end_az=1, cell_offset=0, cell_width=1
+            ),
+        ),
+        sac=1,
+        sic=2,
+    )
+    assert pycatzao.decompress(encoded)[0] == [encoded]
+
+
+@pytest.mark.parametrize("buffer_size", [-1, 100, 2**20])
+@pytest.mark.parametrize("workers", [0, 3])
+@pytest.mark.parametrize("sink", [None, "name", "handle"])
+def test_decompress_file(buffer_size, workers, sink, tmp_path):
+    rng = np.random.default_rng(0)
+    data = b"".join(
+        test_utils.random_type2_message(
+            rng,
+            n_max=2_000,
+            dtype=np.uint16,
+            compress=bool(rng.integers(2)),
+            tod=bool(rng.integers(2)),
+        )[0]
+        for _ in range(300)
+    )
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(data)
+
+    expected = b"".join(pycatzao.decompress(data)[0])
+    kwargs = {"buffer_size": buffer_size, "workers": workers}
+    if sink is None:
+        assert b"".join(pycatzao.decompress_file(file_name, **kwargs)) == expected
+        return
+
+    out_file = tmp_path / "decompressed.cat240"
+    if sink == "name":
+        n = pycatzao.decompress_file(file_name, out_file=out_file, **kwargs)
+    else:
+        with open(out_file, "wb") as f:
+            n = pycatzao.decompress_file(file_name, out_file=f, **kwargs)
+
+    assert n == len(expected)
+    with open(out_file, "rb") as f:
+        assert f.read() == expected
@@ -0,0 +1,157 @@
+import pathlib
+import tempfile
+
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+
+
+@pytest.mark.parametrize("seed", list(range(10)))
+@pytest.mark.parametrize("n_msg", [0, 1, 5, 10])
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("add_summary", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("tod", [True, False])
+def test_decode_columns(seed, n_msg, dtype, add_summary, compress, tod):
+    rng = np.random.default_rng(seed)
+    encoded = [
+        test_utils.random_type2_message(
+            rng, n_max=100, dtype=dtype, compress=compress, tod=tod
+        )[0]
+        for _ in range(n_msg)
+    ]
+
+    if add_summary:
+        summary = pycatzao.encode(
+            pycatzao.make_summary(summary="foobar"), sac=1, sic=2, tod=100.0
+        )
+        i = rng.integers(0, len(encoded) + 1)
+        encoded = encoded[:i] + [summary] + encoded[i:]
+
+    raw = b"".join(encoded)
+    columns, offsets, tail = pycatzao.decode_columns(raw + raw[:5])
+    assert tail == raw[:5]
+
+    blocks = [block for block in pycatzao.decode(raw)[0] if block["type"] == 2]
+    expected = pycatzao.join_blocks(blocks)
+
+    assert (
+        offsets.tolist()
+        == [0] + np.cumsum([len(block["amp"]) for block in blocks]).tolist()
+    )
+
+    for k in expected:
+        assert columns[k].dtype == expected[k].dtype
+        np.testing.assert_array_equal(columns[k], expected[k])
+
+    for k in ["idx", "sac", "sic"]:
+        assert columns[k].tolist() == [
+            block[k] for block in blocks for _ in range(len(block["amp"]))
+        ]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_decode_columns_sparse(compress):
+    rng = np.random.default_rng(0)
+    header = pycatzao.make_video_header(
+        start_az=0, end_az=1, cell_offset=0, cell_width=10
+    )
+
+    amp = np.zeros((100, 4096), dtype=np.uint16)
+    for row in amp:
+        row[rng.choice(row.size, size=5, replace=False)] = rng.integers(1, 100, 5)
+
+    columns, offsets, _ = pycatzao.decode_columns(
+        b"".join(
+            pycatzao.encode(
+                pycatzao.make_video_message(
+                    row, msg_index=i, header=header, compress=compress
+                ),
+                sac=1,
+                sic=2,
+            )
+            for i, row in enumerate(amp)
+        )
+    )
+    assert offsets[-1] == 500
+
+    # columns must not be views into buffers sized for all (dense) cells
+    for v in columns.values():
+        assert v.size == 500
+        assert v.base is None
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("buffer_size", [1, 10, 100, -1])
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_decode_file_columns(seed, buffer_size, compress, mmap):
+    rng = np.random.default_rng(seed)
+    encoded = [
+        test_utils.random_type2_message(
+            rng, n_max=100, dtype=np.uint8, compress=compress, tod=True
+        )[0]
+        for _ in range(10)
+    ]
+    raw = b"".join(encoded)
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(raw)
+        f.flush()
+
+        chunks = list(
+            pycatzao.decode_file_columns(
+                str(f.name) if seed % 2 == 0 else pathlib.Path(f.name),
+                buffer_size=buffer_size,
+                mmap=mmap,
+            )
+        )
+
+    expected, offsets, _ = pycatzao.decode_columns(raw)
+    assert sum(chunk_offsets.size - 1 for _, chunk_offsets in chunks) == len(encoded)
+
+    for k in expected:
+        np.testing.assert_array_equal(
+            np.concatenate([columns[k] for columns, _ in chunks]), expected[k]
+        )
+
+
+@pytest.mark.parametrize("seed", list(range(3)))
+@pytest.mark.parametrize("shard_size", [1, 100, 1_000, 10**9])
+@pytest.mark.parametrize("tail", [False, True])
+def test_decode_file_parallel(seed, shard_size, tail):
+    rng = np.random.default_rng(seed)
+    encoded = [
+        test_utils.random_type2_message(
+            rng, n_max=200, dtype=np.uint8, compress=bool(i % 2), tod=True
+        )[0]
+        for i in range(50)
+    ]
+    encoded.insert(
+        rng.integers(0, len(encoded)),
+        pycatzao.encode(
+            pycatzao.make_summary(summary="foobar"), sac=1, sic=2, tod=100.0
+        ),
+    )
+
+    raw = b"".join(encoded)
+    if tail:
+        raw += b"\xf0\x01\x00" + rng.bytes(10)
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(raw)
+        f.flush()
+
+        chunks = list(
+            pycatzao.decode_file_parallel(f.name, processes=2, shard_size=shard_size)
+        )
+
+    expected, offsets, _ = pycatzao.decode_columns(raw)
+    assert sum(chunk_offsets.size - 1 for _, chunk_offsets in chunks) == 50
+
+    for k in expected:
+        np.testing.assert_array_equal(
+            np.concatenate([columns[k] for columns, _ in chunks]), expected[k]
+        )
@@ -7,6 +7,7 @@ import pytest
 from helpers import test_utils
 
 import pycatzao
+from pycatzao import _utils, decoder
 
 
 @pytest.mark.parametrize("seed", list(range(10)))
@@ -16,7 +17,8 @@ import pycatzao
 @pytest.mark.parametrize("compress", [False, True])
 @pytest.mark.parametrize("tod", [True, False])
 @pytest.mark.parametrize("tail", [False, True])
-def test_decode_file(seed, n_msg, limit_size, buffer_size, compress, tod, tail):
+@pytest.mark.parametrize("mmap", [False, True])
+def test_decode_file(seed, n_msg, limit_size, buffer_size, compress, tod, tail, mmap):
     encoded = [
         pycatzao.encode(
             pycatzao.make_summary(summary="foobar"), sac=1, sic=2, tod=100.0
@@ -53,6 +55,7 @@ def test_decode_file(seed, n_msg, limit_size, buffer_size, compress, tod, tail):
                 str(f.name) if seed % 2 == 0 else pathlib.Path(f.name),
                 size=size,
                 buffer_size=buffer_size,
+                mmap=mmap,
             )
         )
 
@@ -79,3 +82,120 @@ def test_decode_file(seed, n_msg, limit_size, buffer_size, compress, tod, tail):
             assert np.allclose(block1["r"], block2["r"])
             assert np.allclose(block1["r_cell_size"], block2["r_cell_size"])
             assert np.allclose(block1["amp"], block2["amp"])
+
+
+@pytest.mark.parametrize("buffer_size", [1, 1_000, 2**16 + 1])
+@pytest.mark.parametrize("limit_size", [False, True])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_decode_file_large_messages(buffer_size, limit_size, mmap):
+    rng = np.random.default_rng(0)
+    encoded = [
+        pycatzao.encode(
+            pycatzao.make_video_message(
+                rng.integers(0, 256, size=60_000, dtype=np.uint8),
+                msg_index=i,
+                header=pycatzao.make_video_header(
+                    start_az=i, end_az=i + 1, cell_offset=0, cell_width=10
+                ),
+                compress=False,
+            ),
+            sac=1,
+            sic=2,
+        )
+        for i in range(5)
+    ]
+    raw = b"".join(encoded)
+    size = len(raw) - 1 if limit_size else -1
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(raw)
+        f.flush()
+
+        decoded = list(
+            pycatzao.decode_file(f.name, size=size, buffer_size=buffer_size, mmap=mmap)
+        )
+
+    expected, _ = pycatzao.decode(raw[:size] if limit_size else raw)
+    assert len(decoded) == len(expected) == (4 if limit_size else 5)
+    for block1, block2 in zip(decoded, expected, strict=True):
+        assert block1["idx"] == block2["idx"]
+        np.testing.assert_array_equal(block1["amp"], block2["amp"])
+        np.testing.assert_array_equal(block1["r"], block2["r"])
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_decode_empty_file(mmap):
+    with tempfile.NamedTemporaryFile() as f:
+        assert list(pycatzao.decode_file(f.name, mmap=mmap)) == []
+
+
+@pytest.mark.parametrize("seed", list(range(3)))
+@pytest.mark.parametrize("buffer_size", [1, 100, -1])
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("workers", [2, 4])
+def test_decode_file_workers(seed, buffer_size, compress, workers):
+    rng = np.random.default_rng(seed)
+    encoded = [
+        pycatzao.encode(
+            pycatzao.make_summary(summary="foobar"), sac=1, sic=2, tod=100.0
+        )
+    ]
+    encoded += [
+        test_utils.random_type2_message(
+            rng, n_max=1000, dtype=np.uint16, compress=compress, tod=True
+        )[0]
+        for _ in range(300)
+    ]
+    raw = b"".join(encoded)
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(raw)
+        f.flush()
+
+        decoded = list(
+            pycatzao.decode_file(f.name, buffer_size=buffer_size, workers=workers)
+        )
+
+    expected, _ = pycatzao.decode(raw)
+    assert pycatzao.decode(raw, workers=workers)[0][0] == expected[0]
+    assert len(decoded) == len(expected)
+    assert decoded[0] == expected[0]
+    for block1, block2 in zip(decoded[1:], expected[1:], strict=True):
+        assert block1["idx"] == block2["idx"]
+        assert block1["tod"] == block2["tod"]
+        np.testing.assert_array_equal(block1["amp"], block2["amp"])
+        np.testing.assert_array_equal(block1["r"], block2["r"])
+
+
+def test_decode_file_mmap_window(monkeypatch, tmp_path):
+    rng = np.random.default_rng(0)
+    encoded = [
+        test_utils.random_type2_message(
+            rng, n_max=100, dtype=np.uint8, compress=True, tod=True
+        )[0]
+        for _ in range(100)
+    ]
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(b"".join(encoded))
+
+    # the mapping is decoded in bounded windows even if `buffer_size` is negative
+    windows = []
+    decode = decoder._decode
+
+    def _decode(data, **kwargs):
+        windows.append(len(data))
+        return decode(data, **kwargs)
+
+    monkeypatch.setattr(_utils, "_MMAP_WINDOW", 1_000)
+    monkeypatch.setattr(decoder, "_decode", _decode)
+
+    blocks = list(pycatzao.decode_file(file_name, buffer_size=-1, mmap=True))
+    assert len(windows) > 1
+    assert max(windows) <= 1_000
+
+    expected, _ = pycatzao.decode(b"".join(encoded))
+    assert len(blocks) == len(expected)
+    for block, exp in zip(blocks, expected, strict=True):
+        np.testing.assert_array_equal(block["amp"], exp["amp"])
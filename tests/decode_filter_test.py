@@ -0,0 +1,264 @@
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+from pycatzao import decoder
+
+
+def _random_data(rng, *, n_msg, dtype=np.uint8):
+    encoded = []
+    for i in range(n_msg):
+        if i % 10 == 0:
+            encoded.append(
+                pycatzao.encode(
+                    pycatzao.make_summary(summary="foobar"),
+                    sac=rng.integers(0, 3).item(),
+                    sic=rng.integers(0, 3).item(),
+                    tod=rng.uniform(0, 100) if rng.integers(2) else -1,
+                )
+            )
+            continue
+
+        msg, info = test_utils.random_type2_message(
+            rng,
+            n_max=100,
+            dtype=dtype,
+            compress=bool(rng.integers(2)),
+            tod=bool(rng.integers(2)),
+        )
+
+        # reduce the number of sources (SAC/SIC are the first bytes after the FSPEC)
+        msg = bytearray(msg)
+        msg[5:7] = rng.integers(0, 3, size=2).astype(np.uint8).tobytes()
+        encoded.append(bytes(msg))
+
+    return b"".join(encoded)
+
+
+def _expected(blocks, *, sources, az_range, tod_range, r_max):
+    expected = []
+    for block in blocks:
+        if sources is not None and (block["sac"], block["sic"]) not in sources:
+            continue
+
+        if az_range is not None and block["type"] == 2:
+            az0, az1 = az_range
+            width = az1 - az0 if 0 <= az1 - az0 <= 360 else (az1 - az0) % 360
+            if (block["az"] - az0) % 360 >= width:
+                continue
+
+        if tod_range is not None:
+            start_tod, end_tod = tod_range
+            tod = block.get("tod", np.nan)
+            if not (start_tod is None or tod >= start_tod):
+                continue
+
+            if not (end_tod is None or tod < end_tod):
+                continue
+
+        if r_max is not None and block["type"] == 2:
+            sel = block["r"] <= r_max
+            block = block | {"amp": block["amp"][sel], "r": block["r"][sel]}
+
+        expected.append(block)
+
+    return expected
+
+
+def _assert_blocks_equal(blocks, expected):
+    assert len(blocks) == len(expected)
+    for block, exp in zip(blocks, expected, strict=True):
+        assert block.keys() == exp.keys()
+        for k in block:
+            np.testing.assert_array_equal(block[k], exp[k])
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("sources", [None, {(0, 1)}, [(1, 1), (2, 0)]])
+@pytest.mark.parametrize("az_range", [None, (30, 150), (300, 60), (0, 360)])
+@pytest.mark.parametrize("tod_range", [None, (1_000, None), (None, 50_000)])
+@pytest.mark.parametrize("r_max", [None, 0, 5_000, 1e9])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_decode_filter(seed, sources, az_range, tod_range, r_max, workers):
+    rng = np.random.default_rng(seed)
+    data = _random_data(rng, n_msg=50)
+
+    blocks, tail = pycatzao.decode(
+        data,
+        workers=workers,
+        sources=sources,
+        az_range=az_range,
+        tod_range=tod_range,
+        r_max=r_max,
+    )
+    assert tail == b""
+
+    expected = _expected(
+        pycatzao.decode(data)[0],
+        sources=sources,
+        az_range=az_range,
+        tod_range=tod_range,
+        r_max=r_max,
+    )
+    _assert_blocks_equal(blocks, expected)
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("buffer_size", [-1, 1000])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_decode_file_filter(seed, dtype, buffer_size, mmap, tmp_path):
+    rng = np.random.default_rng(seed)
+    data = _random_data(rng, n_msg=50, dtype=dtype)
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(data)
+
+    kwargs = {
+        "sources": {(0, 0), (1, 2)},
+        "az_range": (90, 270),
+        "tod_range": (5_000, None),
+        "r_max": 10_000,
+    }
+    blocks = list(
+        pycatzao.decode_file(file_name, buffer_size=buffer_size, mmap=mmap, **kwargs)
+    )
+    _assert_blocks_equal(blocks, _expected(pycatzao.decode(data)[0], **kwargs))
+
+    # the index is only needed for `tod_range`
+    index_file = tmp_path / "data.cat240.idx.npy"
+    assert index_file.is_file()
+    index_file.unlink()
+
+    kwargs["tod_range"] = None
+    blocks = list(pycatzao.decode_file(file_name, **kwargs))
+    _assert_blocks_equal(blocks, _expected(pycatzao.decode(data)[0], **kwargs))
+    assert not index_file.exists()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_decode_filter_skips_decompression(workers, monkeypatch):
+    rng = np.random.default_rng(0)
+    data = _random_data(rng, n_msg=50)
+
+    calls = []
+    decompress = decoder._decompress
+
+    def _decompress(amp, max_length=-1):
+        calls.append(max_length)
+        return decompress(amp, max_length)
+
+    monkeypatch.setattr(decoder, "_decompress", _decompress)
+
+    blocks, _ = pycatzao.decode(data, workers=workers)
+    n_compressed = len(calls)
+    assert n_compressed > 0
+    assert all(max_length == -1 for max_length in calls)
+
+    calls.clear()
+    blocks, _ = pycatzao.decode(data, workers=workers, sources=[(0, 0)])
+    assert len(calls) < n_compressed
+
+    calls.clear()
+    blocks, _ = pycatzao.decode(data, workers=workers, r_max=-1)
+    assert len(calls) == n_compressed
+    assert all(max_length >= 0 for max_length in calls)
+    assert all(block["amp"].size == 0 for block in blocks if block["type"] == 2)
+
+
+def _random_messages(rng, *, n_msg, dtype):
+    encoded, infos = zip(
+        *(
+            test_utils.random_type2_message(
+                rng, n_max=100, dtype=dtype, compress=bool(i % 2), tod=True
+            )
+            for i in range(n_msg)
+        ),
+        strict=True,
+    )
+    return encoded, infos
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("min_amp", [0, 1, 100, 2**12])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_decode_min_amp(seed, dtype, min_amp, workers):
+    rng = np.random.default_rng(seed)
+    encoded, infos = _random_messages(rng, n_msg=20, dtype=dtype)
+    data = b"".join(encoded)
+
+    blocks, _ = pycatzao.decode(data, workers=workers, min_amp=min_amp)
+    dense, _ = pycatzao.decode(data, keep_zeros=True)
+    for block, info, d in zip(blocks, infos, dense, strict=True):
+        sel = info["amp"] >= min_amp
+        np.testing.assert_array_equal(block["amp"], info["amp"][sel])
+        np.testing.assert_array_equal(block["r"], d["r"][sel])
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("r_max", [None, 5_000])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_decode_keep_zeros(seed, dtype, r_max, workers):
+    rng = np.random.default_rng(seed)
+    encoded, infos = _random_messages(rng, n_msg=20, dtype=dtype)
+    data = b"".join(encoded)
+
+    blocks, _ = pycatzao.decode(data, workers=workers, keep_zeros=True, r_max=r_max)
+    sparse, _ = pycatzao.decode(data, r_max=r_max)
+    for block, info, s in zip(blocks, infos, sparse, strict=True):
+        assert block["amp"].dtype == dtype
+        assert not block["r"].flags.writeable
+
+        n = info["amp"].size if r_max is None else np.sum(block["r"] <= r_max)
+        assert block["amp"].size == block["r"].size == n
+        np.testing.assert_array_equal(block["amp"], info["amp"][:n])
+
+        (cells,) = np.nonzero(block["amp"])
+        np.testing.assert_array_equal(block["amp"][cells], s["amp"])
+        np.testing.assert_array_equal(block["r"][cells], s["r"])
+
+    # the range axis is shared by all messages with the same geometry
+    blocks, _ = pycatzao.decode(b"".join(encoded[:10] * 2), keep_zeros=True)
+    for a, b in zip(blocks[:10], blocks[10:], strict=True):
+        assert np.shares_memory(a["r"], b["r"])
+
+
+@pytest.mark.parametrize("buffer_size", [-1, 1000, 2**16])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_decode_file_keep_zeros(buffer_size, mmap, tmp_path):
+    rng = np.random.default_rng(0)
+    encoded, infos = zip(
+        *(
+            test_utils.random_type2_message(
+                rng, n_max=2_000, dtype=np.uint16, compress=False, tod=True
+            )
+            for _ in range(1_500)
+        ),
+        strict=True,
+    )
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(b"".join(encoded))
+
+    # blocks must not be views into a buffer that is reused for later chunks (the
+    # file is larger than the buffers of `decode_file`)
+    blocks = list(
+        pycatzao.decode_file(
+            file_name, buffer_size=buffer_size, mmap=mmap, keep_zeros=True
+        )
+    )
+    for block, info in zip(blocks, infos, strict=True):
+        np.testing.assert_array_equal(block["amp"], info["amp"])
+
+
+def test_decode_mask_policy():
+    with pytest.raises(ValueError):
+        pycatzao.decode(b"", min_amp=2, keep_zeros=True)
+
+    with pytest.raises(ValueError):
+        next(pycatzao.decode_file("does-not-matter", min_amp=0, keep_zeros=True))
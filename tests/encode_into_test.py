@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+
+
+def _video_kwargs(rng, *, dtype, n_max):
+    amp = rng.integers(0, np.iinfo(dtype).max, size=rng.integers(1, n_max + 1))
+    if rng.integers(2):
+        amp[rng.uniform(size=amp.size) < 0.9] = 0
+
+    return {
+        "amp": amp.astype(dtype),
+        "msg_index": rng.integers(0, 2**32).item(),
+        "header": pycatzao.make_video_header(
+            start_az=rng.uniform(0, 360),
+            end_az=rng.uniform(0, 360),
+            cell_offset=rng.integers(0, 4).item() * 10.0,
+            cell_width=rng.choice([10.0, 600.0]).item(),
+        ),
+        "sac": rng.integers(0, 256).item(),
+        "sic": rng.integers(0, 256).item(),
+        "tod": rng.uniform(0, 24 * 60 * 60) if rng.integers(2) else -1,
+        "compress": bool(rng.integers(2)),
+    }
+
+
+def _encode(amp, *, msg_index, header, sac, sic, tod, compress):
+    return pycatzao.encode(
+        pycatzao.make_video_message(
+            amp, msg_index=msg_index, header=header, compress=compress
+        ),
+        sac=sac,
+        sic=sic,
+        tod=tod,
+    )
+
+
+@pytest.mark.parametrize("seed", list(range(10)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("n_max", [10, 1_000, 10_000])
+@pytest.mark.parametrize("buffer_type", [bytearray, memoryview, np.array])
+def test_encode_video_into(seed, dtype, n_max, buffer_type):
+    rng = np.random.default_rng(seed)
+    messages = [_video_kwargs(rng, dtype=dtype, n_max=n_max) for _ in range(10)]
+    expected = b"".join(_encode(**kwargs) for kwargs in messages)
+
+    # stale data in the buffer must be overwritten (incl. padding)
+    raw = bytearray(b"\xff" * (len(expected) + 7))
+    if buffer_type is memoryview:
+        buf = memoryview(raw)
+    elif buffer_type is np.array:
+        buf = np.frombuffer(raw, dtype=np.uint8)
+    else:
+        buf = raw
+
+    offset = 0
+    for kwargs in messages:
+        offset = pycatzao.encode_video_into(buf, offset, **kwargs)
+
+    assert offset == len(expected)
+    assert raw[:offset] == expected
+    assert raw[offset:] == b"\xff" * 7
+
+
+@pytest.mark.parametrize("seed", list(range(10)))
+@pytest.mark.parametrize("tod", [True, False])
+def test_encode_into(seed, tod):
+    rng = np.random.default_rng(seed)
+    summary = pycatzao.make_summary(summary="foobar")
+    expected = [
+        pycatzao.encode(summary, sac=1, sic=2, tod=42.0 if tod else -1),
+        test_utils.random_type2_message(
+            rng, n_max=100, dtype=np.uint16, compress=bool(seed % 2), tod=tod
+        )[0],
+    ]
+    (block,), _ = pycatzao.decode(expected[1])
+
+    buf = bytearray(100 + sum(map(len, expected)))
+    offset = pycatzao.encode_into(
+        buf, 100, summary, sac=1, sic=2, tod=42.0 if tod else -1
+    )
+    assert offset == 100 + len(expected[0])
+
+    # re-encode the video message (the payload is not preserved by the decoder, hence
+    # take it from the message itself)
+    payload = {
+        "uap": int.from_bytes(expected[1][3:5], byteorder="big") & 0x0EF7,
+        "data": expected[1][8 : len(expected[1]) - (3 if tod else 0)],
+    }
+    offset = pycatzao.encode_into(
+        buf,
+        offset,
+        payload,
+        sac=block["sac"],
+        sic=block["sic"],
+        tod=block["tod"] if tod else -1,
+    )
+    assert offset == len(buf)
+    assert buf[100:] == b"".join(expected)
+
+
+def test_encode_into_buffer_too_small():
+    kwargs = {
+        "amp": np.ones(100, dtype=np.uint8),
+        "msg_index": 1,
+        "header": pycatzao.make_video_header(
+            start_az=0, end_az=1, cell_offset=0, cell_width=1
+        ),
+        "sac": 1,
+        "sic": 2,
+        "tod": -1,
+        "compress": False,
+    }
+    n = len(_encode(**kwargs))
+
+    buf = bytearray(n + 10)
+    assert pycatzao.encode_video_into(buf, 10, **kwargs) == n + 10
+
+    for offset in [11, len(buf), -1]:
+        with pytest.raises(ValueError):
+            pycatzao.encode_video_into(buf, offset, **kwargs)
+
+    with pytest.raises(ValueError):
+        pycatzao.encode_video_into(bytes(n), 0, **kwargs)
+
+    summary = pycatzao.make_summary(summary="foobar")
+    with pytest.raises(ValueError):
+        pycatzao.encode_into(bytearray(10), 0, summary, sac=1, sic=2)
+
+    # buffers are never resized
+    assert len(buf) == n + 10
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_encode_into_message_too_long(compress):
+    header = pycatzao.make_video_header(
+        start_az=0, end_az=1, cell_offset=0, cell_width=1
+    )
+    rng = np.random.default_rng(0)
+
+    # too long for a single message (even if compressed) and too many cells
+    for amp in [
+        rng.integers(0, 2**16, size=40_000).astype(np.uint16),
+        np.zeros(2**24, dtype=np.uint8),
+    ]:
+        buf = bytearray(2**17)
+        with pytest.raises(ValueError):
+            pycatzao.encode_video_into(
+                buf,
+                0,
+                amp,
+                msg_index=1,
+                header=header,
+                sac=1,
+                sic=2,
+                compress=compress,
+            )
+
+        # nothing is written if the message is invalid
+        assert buf == bytes(len(buf))
+
+    buf = bytearray(2**17)
+    payload = {"uap": 0x1000, "data": bytes(2**16)}
+    with pytest.raises(ValueError):
+        pycatzao.encode_into(buf, 0, payload, sac=1, sic=2)
+
+    assert buf == bytes(len(buf))
@@ -0,0 +1,155 @@
+import zlib
+
+import numpy as np
+import pytest
+
+import pycatzao
+
+
+def _encode_rows(amp, *, start_az, end_az, tod, msg_index0, **kwargs):
+    n_az = amp.shape[0]
+    start_az = np.broadcast_to(start_az, n_az)
+    end_az = np.broadcast_to(end_az, n_az)
+    tod = np.broadcast_to(tod, n_az)
+
+    cell_offset = kwargs.pop("cell_offset")
+    cell_width = kwargs.pop("cell_width")
+    sac = kwargs.pop("sac")
+    sic = kwargs.pop("sic")
+    return b"".join(
+        pycatzao.encode(
+            pycatzao.make_video_message(
+                row,
+                msg_index=(msg_index0 + i) % 2**32,
+                header=pycatzao.make_video_header(
+                    start_az=start_az[i].item(),
+                    end_az=end_az[i].item(),
+                    cell_offset=cell_offset,
+                    cell_width=cell_width,
+                ),
+                **kwargs,
+            ),
+            sac=sac,
+            sic=sic,
+            tod=tod[i].item(),
+        )
+        for i, row in enumerate(amp)
+    )
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+@pytest.mark.parametrize("n_cells", [1, 10, 1_000])
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_encode_sweep(seed, dtype, n_cells, sparse, compress, workers):
+    rng = np.random.default_rng(seed)
+    n_az = 100
+
+    amp = rng.integers(0, np.iinfo(dtype).max, size=(n_az, n_cells), dtype=dtype)
+    if sparse:
+        amp[rng.uniform(size=amp.shape) < 0.95] = 0
+
+    kwargs = {
+        "start_az": rng.uniform(0, 360, size=n_az),
+        "end_az": rng.uniform(0, 360, size=n_az),
+        "cell_offset": rng.integers(0, 4).item() * 10.0,
+        "cell_width": rng.choice([10.0, 600.0]).item(),
+        "sac": 7,
+        "sic": 42,
+        "tod": np.where(
+            rng.integers(2, size=n_az), rng.uniform(0, 24 * 60 * 60, size=n_az), -1
+        ),
+        "msg_index0": 2**32 - 50,
+        "compress": compress,
+    }
+
+    encoded = pycatzao.encode_sweep(amp, workers=workers, **kwargs)
+    assert isinstance(encoded, bytearray)
+    assert encoded == _encode_rows(amp, **kwargs)
+
+    blocks, tail = pycatzao.decode(encoded)
+    assert tail == b""
+    assert len(blocks) == n_az
+    for block, row in zip(blocks, amp, strict=True):
+        np.testing.assert_array_equal(block["amp"], row[row > 0])
+
+
+@pytest.mark.parametrize("tod", [-1, 123.4])
+def test_encode_sweep_scalars(tod):
+    amp = np.arange(3 * 20, dtype=np.uint16).reshape(3, 20)
+    kwargs = {
+        "start_az": 359.999,
+        "end_az": 10.0,
+        "cell_offset": 0,
+        "cell_width": 3,
+        "sac": 1,
+        "sic": 2,
+        "tod": tod,
+        "msg_index0": 0,
+    }
+    assert pycatzao.encode_sweep(amp, **kwargs) == _encode_rows(amp, **kwargs)
+
+
+@pytest.mark.parametrize("strategy", [zlib.Z_DEFAULT_STRATEGY, zlib.Z_RLE])
+@pytest.mark.parametrize("level", [1, 9])
+def test_encode_sweep_compression_options(strategy, level):
+    amp = np.zeros((10, 500), dtype=np.uint8)
+    amp[:, ::10] = 1
+    kwargs = {
+        "start_az": np.arange(10.0),
+        "end_az": np.arange(1.0, 11.0),
+        "cell_offset": 0,
+        "cell_width": 3,
+        "sac": 1,
+        "sic": 2,
+        "tod": -1,
+        "msg_index0": 0,
+        "level": level,
+        "strategy": strategy,
+    }
+    assert pycatzao.encode_sweep(amp, **kwargs) == _encode_rows(amp, **kwargs)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+def test_encode_sweep_empty(compress, dtype):
+    encoded = pycatzao.encode_sweep(
+        np.zeros((0, 10), dtype=dtype),
+        start_az=0,
+        end_az=1,
+        cell_offset=0,
+        cell_width=1,
+        sac=1,
+        sic=2,
+        compress=compress,
+    )
+    assert encoded == b""
+
+
+def test_encode_sweep_too_large():
+    with pytest.raises(ValueError):
+        pycatzao.encode_sweep(
+            np.ones((2, 20_000), dtype=np.uint32),
+            start_az=0,
+            end_az=1,
+            cell_offset=0,
+            cell_width=1,
+            sac=1,
+            sic=2,
+            compress=False,
+        )
+
+
+def test_encode_sweep_too_many_cells():
+    with pytest.raises(ValueError):
+        pycatzao.encode_sweep(
+            np.zeros((1, 2**24), dtype=np.uint8),
+            start_az=0,
+            end_az=1,
+            cell_offset=0,
+            cell_width=1,
+            sac=1,
+            sic=2,
+        )
@@ -1,3 +1,6 @@
+import zlib
+from fractions import Fraction
+
 import numpy as np
 import pytest
 from helpers import test_utils
@@ -63,3 +66,117 @@ def test_single_type2_message(seed, n_max, dtype, compress, tod):
 
     if tod:
         assert decoded["tod"] == pytest.approx(msg["tod"], abs=0.01)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_same_range_geometry(compress):
+    header = pycatzao.make_video_header(
+        start_az=0, end_az=1, cell_offset=30, cell_width=3
+    )
+    amps = [
+        np.array([0, 1, 2, 0, 3], dtype=np.uint8),
+        np.array([4, 0, 5, 6, 0], dtype=np.uint8),
+    ]
+    encoded = b"".join(
+        pycatzao.encode(
+            pycatzao.make_video_message(
+                amp, msg_index=i, header=header, compress=compress
+            ),
+            sac=1,
+            sic=2,
+        )
+        for i, amp in enumerate(amps * 2)
+    )
+
+    decoded, _ = pycatzao.decode(encoded)
+    for block, amp in zip(decoded, amps * 2, strict=True):
+        assert block["r"] == pytest.approx(30 + 3 * np.flatnonzero(amp), rel=1e-6)
+
+    # decoded ranges must not share memory with each other
+    decoded[0]["r"][:] = -1
+    assert decoded[2]["r"] == pytest.approx(30 + 3 * np.flatnonzero(amps[0]), rel=1e-6)
+
+
+@pytest.mark.parametrize("seed", list(range(10)))
+def test_exact_azimuth(seed):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, 2**16, size=(50, 2)).tolist()
+    codes += [[0, 0], [2**16 - 1, 1], [1, 2**16 - 1], [0, 2**15], [2**15, 0]]
+
+    encoded = b"".join(
+        pycatzao.encode(
+            pycatzao.make_video_message(
+                np.ones(1, dtype=np.uint8),
+                msg_index=0,
+                header=pycatzao.make_video_header(
+                    start_az=start * 360 / 2**16,
+                    end_az=end * 360 / 2**16,
+                    cell_offset=0,
+                    cell_width=1,
+                ),
+            ),
+            sac=1,
+            sic=2,
+        )
+        for start, end in codes
+    )
+
+    decoded, _ = pycatzao.decode(encoded)
+    columns, _, _ = pycatzao.decode_columns(encoded)
+
+    for (start, end), block, az in zip(codes, decoded, columns["az"], strict=True):
+        d = (end - start) % 2**16
+        if d > 2**15 or (d == 2**15 and end < start):
+            d -= 2**16
+
+        assert block["az_cell_size"] == float(Fraction(d * 360, 2**16))
+        # the mean of opposite azimuths is ambiguous; we take START_AZ + 90 degrees
+        d = abs(d) if abs(d) == 2**15 else d
+        assert block["az"] == float(Fraction((2 * start + d) * 360, 2**17) % 360)
+        assert az == np.float32(block["az"])
+
+
+@pytest.mark.parametrize("level", [-1, 0, 1, 9])
+@pytest.mark.parametrize("strategy", [zlib.Z_DEFAULT_STRATEGY, zlib.Z_RLE])
+@pytest.mark.parametrize("wbits", [9, 12, 15])
+@pytest.mark.parametrize("mem_level", [1, 8, 9])
+def test_compression_options(level, strategy, wbits, mem_level):
+    amp = np.zeros(1_000, dtype=np.uint16)
+    amp[::7] = np.arange(143)
+
+    encoded = pycatzao.encode(
+        pycatzao.make_video_message(
+            amp,
+            msg_index=1,
+            header=pycatzao.make_video_header(
+                start_az=0, end_az=1, cell_offset=0, cell_width=1
+            ),
+            level=level,
+            strategy=strategy,
+            wbits=wbits,
+            mem_level=mem_level,
+        ),
+        sac=1,
+        sic=2,
+    )
+    if level != 0:
+        assert len(encoded) < amp.nbytes
+
+    (block,), _ = pycatzao.decode(encoded)
+    np.testing.assert_array_equal(block["amp"], amp[amp > 0])
+    np.testing.assert_array_equal(block["r"], np.flatnonzero(amp))
+
+
+def test_invalid_compression_options():
+    header = pycatzao.make_video_header(
+        start_az=0, end_az=1, cell_offset=0, cell_width=1
+    )
+    amp = np.ones(10, dtype=np.uint8)
+    for kwargs in [{"wbits": 8}, {"wbits": 16}, {"level": -2}, {"mem_level": 10}]:
+        with pytest.raises(ValueError):
+            pycatzao.make_video_message(amp, msg_index=1, header=header, **kwargs)
+
+    # options are ignored if compression is disabled
+    pycatzao.make_video_message(
+        amp, msg_index=1, header=header, compress=False, wbits=31
+    )
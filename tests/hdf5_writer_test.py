@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+
+h5py = pytest.importorskip("h5py")
+
+BINS = {
+    "az": {"start": -0.5, "num": 362, "stop": 360.5},
+    "r": {"start": -2.5, "step": 5.0},
+}
+
+
+def _to_hdf_in_memory(blocks):
+    df = pycatzao.join_blocks(blocks)
+
+    daz = np.diff(df["az"])
+    df["cycle"] = np.zeros_like(df["az"], dtype=np.uint32)
+    df["cycle"][1:] = np.cumsum(daz < 0)
+
+    df["az_edges"] = np.linspace(**BINS["az"])
+    df["r_edges"] = np.arange(**BINS["r"], stop=df["r"].max() + BINS["r"]["step"])
+
+    df["az"] = np.searchsorted(df["az_edges"], df["az"]).astype(np.uint16) - 1
+    df["r"] = np.searchsorted(df["r_edges"], df["r"]).astype(np.uint16) - 1
+
+    return df
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("chunk_size", [1, 100, 2**20])
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_hdf5_writer(seed, chunk_size, batch_size, tmp_path):
+    rng = np.random.default_rng(seed)
+    blocks, _ = pycatzao.decode(
+        b"".join(
+            test_utils.random_type2_message(
+                rng, n_max=50, dtype=np.uint8, compress=False, tod=True
+            )[0]
+            for _ in range(50)
+        )
+    )
+
+    hdf5_file = tmp_path / "data.h5"
+    with pycatzao.io.HDF5Writer(hdf5_file, BINS, chunk_size=chunk_size) as writer:
+        for i in range(0, len(blocks), batch_size):
+            writer.write(blocks[i : i + batch_size])
+
+    expected = _to_hdf_in_memory(blocks)
+    assert len(writer) == expected["tod"].size
+    assert writer.cycles == expected["cycle"][-1] + 1
+
+    with h5py.File(hdf5_file, "r") as f:
+        assert f.keys() == expected.keys()
+        for k in expected:
+            assert f[k].dtype == expected[k].dtype
+            np.testing.assert_array_equal(f[k][:], expected[k])
+
+        assert f["tod"].attrs["unit"] == "second"
+        assert f["r_edges"].attrs["unit"] == "meter"
+
+
+def test_hdf5_writer_empty(tmp_path):
+    hdf5_file = tmp_path / "data.h5"
+    with pycatzao.io.HDF5Writer(hdf5_file, BINS) as writer:
+        writer.write([])
+
+    assert len(writer) == 0
+    assert writer.cycles == 0
+
+    with h5py.File(hdf5_file, "r") as f:
+        assert {"tod", "az", "r", "amp", "cycle", "az_edges", "r_edges"} == f.keys()
+        assert f["tod"].size == 0
+        assert f["r_edges"].size == 0
@@ -1,2 +1,22 @@
+import subprocess
+import sys
+
+
 def test_import():
     import pycatzao  # noqa: F401
+
+
+def test_import_optional_dependencies_lazily():
+    # optional dependencies of `pycatzao.io` must not be imported by `import pycatzao`
+    modules = ["h5py", "pyarrow"]
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, pycatzao; print([m in sys.modules for m in {modules}])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == str([False] * len(modules))
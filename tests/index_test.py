@@ -0,0 +1,211 @@
+import os
+import pathlib
+import tempfile
+
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+from pycatzao import decoder
+
+
+def _random_file(f, rng, *, n_msg, tod=True):
+    encoded = [
+        pycatzao.encode(
+            pycatzao.make_summary(summary="foobar"), sac=1, sic=2, tod=100.0
+        )
+    ]
+    encoded += [
+        test_utils.random_type2_message(
+            rng, n_max=100, dtype=np.uint8, compress=bool(i % 2), tod=tod
+        )[0]
+        for i in range(n_msg)
+    ]
+
+    f.write(b"".join(encoded))
+    f.flush()
+    return encoded
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("tod", [True, False])
+def test_build_index(seed, tod):
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = pathlib.Path(tmp) / "data.cat240"
+        with open(file_name, "wb") as f:
+            encoded = _random_file(f, rng, n_msg=20, tod=tod)
+
+        index = pycatzao.build_index(file_name, buffer_size=100)
+        assert np.load(f"{file_name}.idx.npy").tobytes() == index.tobytes()
+
+    expected, _ = pycatzao.decode(b"".join(encoded))
+    assert len(index) == len(expected)
+    assert (
+        index["offset"].tolist()
+        == np.cumsum([0] + list(map(len, encoded)))[:-1].tolist()
+    )
+    assert index["length"].tolist() == list(map(len, encoded))
+    assert index["type"].tolist() == [block["type"] for block in expected]
+    assert index["idx"].tolist() == [block.get("idx", 0) for block in expected]
+    np.testing.assert_array_equal(
+        index["tod"],
+        np.array([block.get("tod", np.nan) for block in expected], dtype=np.float32),
+    )
+    np.testing.assert_array_equal(
+        index["az"],
+        np.array([block.get("az", np.nan) for block in expected], dtype=np.float32),
+    )
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("sidecar", [False, True])
+def test_seek_message(seed, sidecar):
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = pathlib.Path(tmp) / "data.cat240"
+        with open(file_name, "wb") as f:
+            encoded = _random_file(f, rng, n_msg=20)
+
+        if sidecar:
+            pycatzao.build_index(file_name)
+
+        for n in [0, 5, -1, *rng.integers(0, len(encoded), size=5).tolist()]:
+            block = pycatzao.seek_message(file_name, n)
+            expected = pycatzao.decode(encoded[n])[0][0]
+            assert block.keys() == expected.keys()
+            assert block["type"] == expected["type"]
+            assert block["tod"] == expected["tod"]
+            if block["type"] == 2:
+                assert block["idx"] == expected["idx"]
+                np.testing.assert_array_equal(block["amp"], expected["amp"])
+
+        with pytest.raises(IndexError):
+            pycatzao.seek_message(file_name, len(encoded))
+
+        # a missing index is built and stored by the first call
+        assert pathlib.Path(f"{file_name}.idx.npy").is_file()
+
+
+def test_seek_message_builds_index_once(monkeypatch):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = pathlib.Path(tmp) / "data.cat240"
+        with open(file_name, "wb") as f:
+            encoded = _random_file(f, rng, n_msg=20)
+
+        scans = []
+        scan = decoder._scan
+
+        def _scan(*args, **kwargs):
+            scans.append(1)
+            return scan(*args, **kwargs)
+
+        monkeypatch.setattr(decoder, "_scan", _scan)
+
+        for n in range(len(encoded)):
+            pycatzao.seek_message(file_name, n)
+
+        list(pycatzao.decode_file(file_name, tod_range=(0, None)))
+        assert len(scans) == 1
+
+        # outdated indices are rebuilt
+        index_file = pathlib.Path(f"{file_name}.idx.npy")
+        os.utime(index_file, (0, 0))
+        pycatzao.seek_message(file_name, 0)
+        assert len(scans) == 2
+        assert index_file.stat().st_mtime > 0
+
+
+@pytest.mark.parametrize("name", ["data.idx", "data.idx.npy"])
+def test_index_file(name):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = pathlib.Path(tmp) / "data.cat240"
+        with open(file_name, "wb") as f:
+            encoded = _random_file(f, rng, n_msg=20)
+
+        index_file = pathlib.Path(tmp) / "index" / name
+        index_file.parent.mkdir()
+        index = pycatzao.build_index(file_name, index_file=index_file)
+        assert index_file.is_file()
+        assert not pathlib.Path(f"{file_name}.idx.npy").exists()
+
+        # the index is not rebuilt as long as it is up to date
+        with open(index_file, "r+b") as f:
+            np.save(f, index[::-1])
+
+        block = pycatzao.seek_message(file_name, 0, index_file=index_file)
+        assert block["idx"] == pycatzao.decode(encoded[-1])[0][0]["idx"]
+
+        with open(index_file, "r+b") as f:
+            np.save(f, index)
+
+        blocks = list(
+            pycatzao.decode_file(
+                file_name, tod_range=(None, 1e9), index_file=index_file
+            )
+        )
+        assert len(blocks) == len(encoded)
+        assert not pathlib.Path(f"{file_name}.idx.npy").exists()
+
+
+def test_index_file_not_writable():
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = pathlib.Path(tmp) / "data.cat240"
+        with open(file_name, "wb") as f:
+            encoded = _random_file(f, rng, n_msg=20)
+
+        # the index is used in memory if it cannot be stored
+        index_file = pathlib.Path(tmp) / "missing" / "data.idx.npy"
+        blocks = list(
+            pycatzao.decode_file(
+                file_name, tod_range=(None, 1e9), index_file=index_file
+            )
+        )
+        assert len(blocks) == len(encoded)
+        assert not index_file.parent.exists()
+
+        block = pycatzao.seek_message(file_name, 1, index_file=index_file)
+        assert block["idx"] == pycatzao.decode(encoded[1])[0][0]["idx"]
+        assert os.listdir(tmp) == ["data.cat240"]
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("sidecar", [False, True])
+@pytest.mark.parametrize("mmap", [False, True])
+@pytest.mark.parametrize(
+    "start_tod, end_tod", [(None, 50_000), (20_000, None), (30_000, 60_000), (1, 2)]
+)
+def test_decode_file_tod_window(seed, sidecar, mmap, start_tod, end_tod):
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = pathlib.Path(tmp) / "data.cat240"
+        with open(file_name, "wb") as f:
+            encoded = _random_file(f, rng, n_msg=50)
+
+        if sidecar:
+            pycatzao.build_index(file_name)
+
+        decoded = list(
+            pycatzao.decode_file(
+                file_name,
+                buffer_size=100,
+                mmap=mmap,
+                tod_range=(start_tod, end_tod),
+            )
+        )
+
+    expected = [
+        block
+        for block in pycatzao.decode(b"".join(encoded))[0]
+        if (start_tod is None or block["tod"] >= start_tod)
+        and (end_tod is None or block["tod"] < end_tod)
+    ]
+
+    assert [block["tod"] for block in decoded] == [block["tod"] for block in expected]
+    assert [block.get("idx") for block in decoded] == [
+        block.get("idx") for block in expected
+    ]
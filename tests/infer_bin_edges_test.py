@@ -113,3 +113,66 @@ def test_binning_inference(az_start, az_end, az_binning_scheme, compress, tod, t
     assert bins["az"]["start"] == pytest.approx(az_start, abs=0.01)
     assert bins["az"]["stop"] == pytest.approx(az_stop, abs=0.1)
     assert bins["az"]["num"] == az_num
+
+
+def _rotation(*, n_az, cell_offset, cell_width, compress):
+    daz = 360 / n_az
+    return [
+        pycatzao.encode(
+            pycatzao.make_video_message(
+                np.zeros(3, dtype=np.uint8),
+                msg_index=i,
+                header=pycatzao.make_video_header(
+                    start_az=i * daz - daz / 2,
+                    end_az=i * daz + daz / 2,
+                    cell_offset=cell_offset,
+                    cell_width=cell_width,
+                ),
+                compress=compress,
+            ),
+            sac=0,
+            sic=0,
+        )
+        for i in range(n_az)
+    ]
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("n_az", [256, 1000, 4096])
+@pytest.mark.parametrize("compress", [False, True])
+def test_bin_edge_estimator(seed, n_az, compress):
+    rng = np.random.default_rng(seed)
+    encoded = _rotation(n_az=n_az, cell_offset=50, cell_width=10, compress=compress)
+    encoded += _rotation(n_az=n_az, cell_offset=30, cell_width=20, compress=compress)
+    encoded += _rotation(n_az=n_az, cell_offset=50, cell_width=10, compress=compress)
+    raw = b"".join(encoded)
+
+    expected, _ = pycatzao.infer_bin_edges(raw)
+    assert expected["az"]["num"] == n_az + 2
+
+    estimator = pycatzao.BinEdgeEstimator(patience=2)
+    splits = np.sort(rng.integers(0, len(raw), size=20))
+    for i, j in zip([0, *splits], [*splits, len(raw)], strict=True):
+        bins = estimator.update(raw[i:j])
+        assert bins is estimator.bins
+
+    assert estimator.n_messages == 3 * n_az
+    assert estimator.bins == expected
+
+
+def test_bin_edge_estimator_convergence():
+    raw = b"".join(_rotation(n_az=1000, cell_offset=50, cell_width=10, compress=True))
+    n = len(raw) // 10
+
+    estimator = pycatzao.BinEdgeEstimator(patience=3)
+    assert estimator.update(b"") is None
+    assert not estimator.converged
+
+    n_updates = 0
+    while not estimator.converged:
+        estimator.update(raw[n_updates * n : (n_updates + 1) * n])
+        n_updates += 1
+
+    assert n_updates < 10
+    assert estimator.bins["az"]["num"] == 1002
+    assert estimator.bins["r"]["step"] == pytest.approx(10)
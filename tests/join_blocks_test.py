@@ -71,3 +71,33 @@ def test_join_zero_blocks(add_summary):
     assert table["az"].tolist() == []
     assert table["r"].tolist() == []
     assert table["amp"].tolist() == []
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.uint32])
+def test_join_blocks_out(seed, dtype):
+    rng = np.random.default_rng(seed)
+    encoded = [
+        test_utils.random_type2_message(
+            rng, n_max=100, dtype=dtype, compress=True, tod=True
+        )[0]
+        for _ in range(10)
+    ]
+    blocks, _ = pycatzao.decode(b"".join(encoded))
+    expected = pycatzao.join_blocks(blocks)
+
+    n = expected["amp"].size
+    out = {
+        "tod": np.empty(n + 5, dtype=np.float32),
+        "az": np.empty(n + 5, dtype=np.float32),
+        "r": np.empty(n + 5, dtype=np.float32),
+        "amp": np.empty(n + 5, dtype=dtype),
+    }
+
+    table = pycatzao.join_blocks(iter(blocks), out=out)
+    for k in expected:
+        assert np.shares_memory(table[k], out[k])
+        np.testing.assert_array_equal(table[k], expected[k])
+
+    with pytest.raises(ValueError):
+        pycatzao.join_blocks(blocks, out={k: v[: n - 1] for k, v in out.items()})
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import pycatzao
+from pycatzao import utils
+
+BINS = {
+    "az": {"start": -0.5, "num": 362, "stop": 360.5},
+    "r": {"start": -5.0, "step": 10.0},
+}
+
+
+@pytest.mark.parametrize("seed", list(range(3)))
+@pytest.mark.parametrize("n_r", [1, 10, 99])
+@pytest.mark.parametrize("size", [1, 16, 101])
+def test_rasterize_ppi(seed, n_r, size):
+    rng = np.random.default_rng(seed)
+    sweep = rng.integers(1, 256, size=(360, n_r)).astype(np.uint8)
+
+    image = pycatzao.rasterize_ppi(sweep, BINS, size=size, fill=0)
+    assert image.shape == (size, size)
+    assert image.dtype == sweep.dtype
+
+    az_edges = np.linspace(**BINS["az"])
+    r_edges = np.arange(**BINS["r"], stop=-5.0 + (n_r + 0.5) * 10.0)
+    r_max = r_edges[-1]
+
+    expected = np.zeros_like(image)
+    for i in range(size):
+        for j in range(size):
+            x = (j + 0.5) * (2 * r_max / size) - r_max
+            y = r_max - (i + 0.5) * (2 * r_max / size)
+            az = np.rad2deg(np.arctan2(x, y)) % 360
+            i_az = (np.searchsorted(az_edges, az) - 1) % 360
+            i_r = np.searchsorted(r_edges, np.hypot(x, y)) - 1
+            if 0 <= i_r < n_r:
+                expected[i, j] = sweep[i_az, i_r]
+
+    np.testing.assert_array_equal(image, expected)
+
+
+def test_rasterize_ppi_orientation():
+    sweep = np.zeros((360, 10), dtype=np.uint8)
+    sweep[90, :] = 1  # east
+    sweep[180, :] = 2  # south
+
+    image = pycatzao.rasterize_ppi(sweep, BINS, size=101, fill=255)
+    assert image[50, 75] == 1
+    assert image[75, 50] == 2
+    assert image[25, 50] == 0
+    assert image[0, 0] == 255
+
+
+def test_rasterize_ppi_cache():
+    sweep = np.zeros((360, 10), dtype=np.uint16)
+    out = np.empty((64, 64), dtype=np.uint16)
+
+    utils._ppi_lookup.cache_clear()
+    for _ in range(5):
+        image = pycatzao.rasterize_ppi(sweep, dict(BINS), size=64, out=out)
+        assert image is out
+
+    info = utils._ppi_lookup.cache_info()
+    assert info.misses == 1
+    assert info.hits == 4
+
+    with pytest.raises(ValueError):
+        pycatzao.rasterize_ppi(np.zeros((180, 10)), BINS, size=64)
+
+    _, index, outside = utils._ppi_lookup(
+        tuple(sorted(BINS["az"].items())), tuple(sorted(BINS["r"].items())), 10, 64
+    )
+    assert index.dtype == outside.dtype == np.int32
+
+
+@pytest.mark.parametrize(
+    "out",
+    [
+        np.empty((64, 64), dtype=np.uint16).T,
+        np.empty((64, 128), dtype=np.uint16)[:, ::2],
+        np.empty((64, 64), dtype=np.uint16, order="F")[::-1],
+        np.empty((64, 64), dtype=np.uint8),
+        np.empty((64, 65), dtype=np.uint16),
+        np.empty(64 * 64, dtype=np.uint16),
+    ],
+)
+def test_rasterize_ppi_invalid_out(out):
+    sweep = np.ones((360, 10), dtype=np.uint16)
+    with pytest.raises(ValueError, match="Preallocated image"):
+        pycatzao.rasterize_ppi(sweep, BINS, size=64, out=out)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from helpers import test_utils
+
+import pycatzao
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("buffer_size", [-1, 100, 2**24])
+@pytest.mark.parametrize("mmap", [False, True])
+@pytest.mark.parametrize("tod", [True, False])
+def test_scan_file(seed, buffer_size, mmap, tod, tmp_path):
+    rng = np.random.default_rng(seed)
+
+    encoded = [pycatzao.encode(pycatzao.make_summary(summary="foo"), sac=1, sic=2)]
+    infos = [None]
+    for i in range(20):
+        msg, info = test_utils.random_type2_message(
+            rng, n_max=100, dtype=np.uint8, compress=bool(i % 2), tod=tod
+        )
+        encoded.append(msg)
+        infos.append(info)
+
+    file_name = tmp_path / "data.cat240"
+    with open(file_name, "wb") as f:
+        f.write(b"".join(encoded))
+
+    scan = pycatzao.scan_file(file_name, buffer_size=buffer_size, mmap=mmap)
+    blocks, _ = pycatzao.decode(b"".join(encoded))
+
+    assert scan["offset"].tolist() == np.cumsum([0, *map(len, encoded[:-1])]).tolist()
+    assert scan["length"].tolist() == list(map(len, encoded))
+    assert scan["compression"].tolist() == [False] + [bool(i % 2) for i in range(20)]
+
+    for k in ["type", "sac", "sic"]:
+        assert scan[k].tolist() == [block[k] for block in blocks]
+
+    for k in ["idx", "nb_cells"]:
+        assert scan[k][0] == 0
+
+    for k in ["tod", "az", "az_cell_size", "r_cell_size"]:
+        np.testing.assert_array_equal(
+            scan[k], [block.get(k, np.nan) for block in blocks]
+        )
+
+    assert np.isnan(scan["r0"][0])
+    for i, info in enumerate(infos[1:], start=1):
+        assert scan["idx"][i] == info["idx"]
+        assert scan["nb_cells"][i] == info["amp"].size
+        assert scan["r0"][i] == pytest.approx(info["r_cell_offset"], rel=1e-3)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_scan_empty_file(mmap, tmp_path):
+    file_name = tmp_path / "data.cat240"
+    file_name.touch()
+
+    scan = pycatzao.scan_file(file_name, mmap=mmap)
+    assert "offset" in scan
+    assert all(v.size == 0 for v in scan.values())
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+import pycatzao
+
+BINS = {
+    "az": {"start": -0.5, "num": 362, "stop": 360.5},
+    "r": {"start": -5.0, "step": 10.0},
+}
+
+
+def _rotations(rng, *, n_rot, start_az=0.0, daz=1.0, n_cells=50, dtype=np.uint8):
+    blocks = []
+    for az in np.arange(start_az, start_az + 360 * n_rot, daz) % 360:
+        cells = np.sort(rng.choice(n_cells, size=rng.integers(0, 10), replace=False))
+        blocks.append(
+            {
+                "type": 2,
+                "az": az.item(),
+                "r": (cells * 10.0).astype(np.float32),
+                "amp": rng.integers(1, np.iinfo(dtype).max, size=cells.size).astype(
+                    dtype
+                ),
+            }
+        )
+
+    return blocks
+
+
+def _expected_sweeps(blocks, r_stop):
+    az_edges = np.linspace(**BINS["az"])
+    r_edges = np.arange(**BINS["r"], stop=r_stop)
+
+    sweeps = []
+    last_az = np.nan
+    for block in blocks:
+        if not sweeps or block["az"] < last_az:
+            sweeps.append(np.zeros((360, r_edges.size - 1), dtype=block["amp"].dtype))
+
+        last_az = block["az"]
+        i_az = (np.searchsorted(az_edges, block["az"]) - 1) % 360
+        for r, a in zip(block["r"], block["amp"], strict=True):
+            i_r = np.searchsorted(r_edges, r) - 1
+            if 0 <= i_r < r_edges.size - 1:
+                sweeps[-1][i_az, i_r] = a
+
+    return sweeps
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+@pytest.mark.parametrize("n_rot", [1, 2.5, 4])
+@pytest.mark.parametrize("start_az", [0.0, 123.0])
+@pytest.mark.parametrize("r_stop", [200, 1000])
+def test_sweep_assembler(seed, n_rot, start_az, r_stop):
+    rng = np.random.default_rng(seed)
+    blocks = _rotations(rng, n_rot=n_rot, start_az=start_az)
+    expected = _expected_sweeps(blocks, r_stop)
+
+    assembler = pycatzao.SweepAssembler(BINS, r_stop=r_stop)
+    assert assembler.shape == expected[0].shape
+
+    sweeps = []
+    for i in range(0, len(blocks), 100):
+        for sweep in assembler.update(blocks[i : i + 100]):
+            assert not sweep.flags.writeable
+            sweeps.append(sweep.copy())
+
+    sweeps.append(assembler.flush().copy())
+    assert assembler.flush() is None
+
+    assert len(sweeps) == len(expected)
+    for sweep, exp in zip(sweeps, expected, strict=True):
+        assert sweep.dtype == exp.dtype
+        np.testing.assert_array_equal(sweep, exp)
+
+
+def test_sweep_assembler_reuses_buffer():
+    rng = np.random.default_rng(0)
+    blocks = _rotations(rng, n_rot=3)
+
+    assembler = pycatzao.SweepAssembler(BINS, r_stop=500, dtype=np.uint16)
+    sweeps = list(assembler.update(blocks))
+    assert len(sweeps) == 2
+    assert sweeps[0].dtype == np.uint16
+    assert np.shares_memory(sweeps[0], sweeps[1])
+
+
+@pytest.mark.parametrize("seed", list(range(5)))
+def test_sweep_assembler_bytes(seed):
+    rng = np.random.default_rng(seed)
+
+    data = b"".join(
+        pycatzao.encode(
+            pycatzao.make_video_message(
+                rng.integers(0, 256, size=20).astype(np.uint8),
+                msg_index=i,
+                header=pycatzao.make_video_header(
+                    start_az=az - 0.5, end_az=az + 0.5, cell_offset=0, cell_width=10
+                ),
+            ),
+            sac=1,
+            sic=2,
+        )
+        for i, az in enumerate(np.arange(0, 3 * 360, 3.0) % 360)
+    )
+
+    blocks, _ = pycatzao.decode(data)
+    expected = []
+    assembler = pycatzao.SweepAssembler(BINS, r_stop=300)
+    for sweep in assembler.update(blocks):
+        expected.append(sweep.copy())
+
+    expected.append(assembler.flush().copy())
+
+    sweeps = []
+    assembler = pycatzao.SweepAssembler(BINS, r_stop=300)
+    for i in range(0, len(data), 1000):
+        for sweep in assembler.update(data[i : i + 1000]):
+            sweeps.append(sweep.copy())
+
+    sweeps.append(assembler.flush().copy())
+
+    assert len(sweeps) == len(expected) == 3
+    for sweep, exp in zip(sweeps, expected, strict=True):
+        np.testing.assert_array_equal(sweep, exp)